@@ -0,0 +1,120 @@
+"""
+Per-action overhead benchmark.
+
+Measures the framework cost of LLMAgent.action (model response wrapping,
+tool execution and result bookkeeping) and of Graph.run steps, using a fake
+provider client that answers instantly.
+
+Usage:
+    python benchmarks/action_overhead.py [--iterations 5000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lwagents import Edge, Graph, GraphRequest, LLMAgent, Node, Tool  # noqa: E402
+from lwagents.models import GPTModel  # noqa: E402
+from lwagents.state import AgentState, reset_global_agent_state  # noqa: E402
+
+
+@Tool
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+_USAGE = SimpleNamespace(
+    input_tokens=10, output_tokens=5, input_tokens_details=SimpleNamespace()
+)
+_TOOL_CALL = SimpleNamespace(
+    type="function_call",
+    id="fc_1",
+    call_id="call_1",
+    name="add",
+    arguments='{"a":1,"b":2}',
+)
+_TOOL_RESPONSE = SimpleNamespace(output=[_TOOL_CALL], output_text="", usage=_USAGE)
+_TEXT_RESPONSE = SimpleNamespace(output=[], output_text="done", usage=_USAGE)
+
+
+class FakeResponses:
+    def __init__(self, response):
+        self.response = response
+
+    def create(self, **request):
+        return self.response
+
+
+def per_call_us(func, iterations: int, repeat: int = 5) -> float:
+    """Best of ``repeat`` rounds, in microseconds per call."""
+    for _ in range(min(100, iterations)):
+        func()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best * 1e6
+
+
+def bench_action(iterations: int, with_tools: bool) -> float:
+    response = _TOOL_RESPONSE if with_tools else _TEXT_RESPONSE
+    model = GPTModel(SimpleNamespace(responses=FakeResponses(response)))
+    agent = LLMAgent(
+        name="bench",
+        llm_model=model,
+        tools=[add] if with_tools else [],
+        state=AgentState([]),
+    )
+    params = {"model": "gpt-4o", "input": [{"role": "user", "content": "1+2?"}]}
+    try:
+        return per_call_us(lambda: agent.action(model_params=params), iterations)
+    finally:
+        reset_global_agent_state()
+
+
+def bench_graph(iterations: int) -> float:
+    remaining = [0]
+
+    def step():
+        remaining[0] -= 1
+        return GraphRequest(traversal="loop" if remaining[0] > 0 else "end")
+
+    with Graph() as graph:
+        start = Node(node_name="start", kind="START")
+        loop = Node(node_name="loop", kind="STATE", command=step)
+        end = Node(node_name="end", kind="TERMINAL")
+        start.connect(to_node=loop, edge=Edge(edge_name="begin"))
+        loop.connect(to_node=loop, edge=Edge(edge_name="again"))
+        loop.connect(to_node=end, edge=Edge(edge_name="finish"))
+
+    def run():
+        remaining[0] = iterations
+        graph._GraphState.history.clear()
+        graph.run(start_node=start, additional_log_entries={})
+
+    return per_call_us(run, 1) / (iterations + 1)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    results = {
+        "action (text)": bench_action(args.iterations, with_tools=False),
+        "action (one tool call)": bench_action(args.iterations, with_tools=True),
+        "graph step (direct traversal)": bench_graph(args.iterations),
+    }
+    for name, value in results.items():
+        print(f"{name:32s} {value:8.1f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
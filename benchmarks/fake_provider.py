@@ -0,0 +1,148 @@
+"""
+Deterministic fake provider for offline benchmarks.
+
+FakeOpenAIClient answers the subset of the OpenAI Responses API used by
+GPTModel (``client.responses.create``) without any network access. Plug it
+in through the "custom" model type:
+
+    model = create_model(
+        "custom",
+        custom_model=GPTModel,
+        custom_implementation=FakeOpenAIClient,
+        instance_params={"latency": 0.01, "tool_rounds": 1},
+    )
+"""
+
+import json
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+# Argument values generated for tool calls, by JSON schema type
+_PLACEHOLDER_VALUES = {
+    "integer": 1,
+    "number": 1.0,
+    "string": "x",
+    "boolean": True,
+    "array": [],
+    "object": {},
+}
+
+
+class FakeItem:
+    """Output item with the attributes and model_dump of an SDK object."""
+
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+    def model_dump(self, exclude_none: bool = False) -> Dict[str, Any]:
+        if exclude_none:
+            return {k: v for k, v in self.__dict__.items() if v is not None}
+        return dict(self.__dict__)
+
+
+class FakeUsage:
+    def __init__(self, input_tokens: int, output_tokens: int):
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.input_tokens_details = None
+
+
+class FakeResponse:
+    def __init__(self, output: List[FakeItem], output_text: str, usage: FakeUsage):
+        self.output = output
+        self.output_text = output_text
+        self.usage = usage
+
+
+def _arguments(tool: Dict[str, Any]) -> str:
+    properties = tool.get("parameters", {}).get("properties", {})
+    return json.dumps(
+        {
+            name: _PLACEHOLDER_VALUES.get(schema.get("type"), None)
+            for name, schema in properties.items()
+        }
+    )
+
+
+class FakeResponses:
+    def __init__(self, client: "FakeOpenAIClient"):
+        self._client = client
+
+    def create(self, **request) -> FakeResponse:
+        return self._client.respond(request)
+
+
+class FakeOpenAIClient:
+    """
+    Args:
+        latency (float): Seconds every request takes.
+        jitter (float): Extra uniformly distributed latency, in seconds.
+        tool_rounds (int): Rounds of tool calls before the final answer, for
+            requests that offer tools.
+        parallel_tool_calls (int): Tool calls requested per round.
+        output_text (str): Text of the final answer.
+        seed (int): Seed of the jitter, so runs are reproducible.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        tool_rounds: int = 1,
+        parallel_tool_calls: int = 1,
+        output_text: str = "done",
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.tool_rounds = tool_rounds
+        self.parallel_tool_calls = parallel_tool_calls
+        self.output_text = output_text
+        self.requests = 0
+        self._random = random.Random(seed)
+        self.responses = FakeResponses(self)
+
+    def _sleep(self) -> None:
+        delay = self.latency
+        if self.jitter:
+            delay += self._random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+
+    def respond(self, request: Dict[str, Any]) -> FakeResponse:
+        self.requests += 1
+        self._sleep()
+        conversation = request.get("input") or []
+        if isinstance(conversation, str):
+            conversation = [conversation]
+        usage = FakeUsage(input_tokens=10 * len(conversation), output_tokens=5)
+
+        tools: Optional[List[Dict]] = request.get("tools")
+        rounds_done = sum(
+            1
+            for item in conversation
+            if isinstance(item, dict) and item.get("type") == "function_call_output"
+        ) // max(1, self.parallel_tool_calls)
+        if tools and rounds_done < self.tool_rounds:
+            calls = []
+            for index in range(self.parallel_tool_calls):
+                tool = tools[index % len(tools)]
+                call_id = f"call_{rounds_done}_{index}"
+                calls.append(
+                    FakeItem(
+                        type="function_call",
+                        id=f"fc_{rounds_done}_{index}",
+                        call_id=call_id,
+                        name=tool["name"],
+                        arguments=_arguments(tool),
+                    )
+                )
+            return FakeResponse(output=calls, output_text="", usage=usage)
+
+        message = FakeItem(
+            type="message",
+            role="assistant",
+            content=[{"type": "output_text", "text": self.output_text}],
+        )
+        return FakeResponse(output=[message], output_text=self.output_text, usage=usage)
@@ -0,0 +1,72 @@
+"""
+Import-time benchmark for the lwagents package.
+
+Runs ``python -X importtime -c "import lwagents"`` in fresh interpreters and
+fails if the cumulative import time exceeds the budget or if a provider SDK
+is imported eagerly. tests/test_import_time.py runs the same check in the
+test suite.
+
+Usage:
+    python benchmarks/import_time.py [--budget-ms 400] [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Modules that must only be imported when a provider is used
+LAZY_MODULES = ("openai", "anthropic", "dotenv", "httpx")
+
+
+def import_profile(module: str) -> dict:
+    """
+    Returns the cumulative import time of every module imported by
+    ``import <module>``, in microseconds.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=root,
+        check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="lwagents")
+    parser.add_argument("--budget-ms", type=float, default=400.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    timings = []
+    for _ in range(args.runs):
+        profile = import_profile(args.module)
+        timings.append(profile[args.module] / 1000)
+
+    eager = sorted(name for name in profile if name.split(".")[0] in LAZY_MODULES)
+    median = statistics.median(timings)
+    print(f"import {args.module}: median {median:.1f} ms over {args.runs} runs")
+
+    failed = False
+    if eager:
+        print(f"FAIL: provider modules imported eagerly: {', '.join(eager)}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"FAIL: over the budget of {args.budget_ms:.0f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+"""
+Offline benchmark suite with regression thresholds.
+
+Runs every benchmark against the deterministic fake provider in
+fake_provider.py, compares the results with the stored baselines and exits
+with status 1 if any benchmark got slower than its threshold allows.
+All results are in microseconds per operation, lower is better.
+
+Usage:
+    python benchmarks/suite.py                    # compare with baselines.json
+    python benchmarks/suite.py --update-baseline  # record new baselines
+    python benchmarks/suite.py --only graph_step tool_dispatch
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_provider import FakeOpenAIClient  # noqa: E402
+
+from lwagents import (  # noqa: E402
+    AgentPool,
+    Edge,
+    Graph,
+    GraphRequest,
+    LLMAgent,
+    MemoryPolicy,
+    Node,
+    Tool,
+    create_model,
+    reset_global_agent_state,
+)
+from lwagents.models import GPTModel  # noqa: E402
+from lwagents.state import AgentState  # noqa: E402
+from lwagents.tools import ToolUtility  # noqa: E402
+
+BASELINE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "baselines.json"
+)
+DEFAULT_THRESHOLD = 1.3
+
+BENCHMARKS = {}
+
+
+def benchmark(description: str):
+    """Registers a benchmark taking a scale factor and returning us per op."""
+
+    def register(func):
+        BENCHMARKS[func.__name__] = (func, description)
+        return func
+
+    return register
+
+
+def per_call_us(func, iterations: int, repeat: int = 5) -> float:
+    """Best of ``repeat`` rounds, in microseconds per call."""
+    for _ in range(min(100, iterations)):
+        func()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best * 1e6
+
+
+def fake_model(**client_params) -> GPTModel:
+    return create_model(
+        "custom",
+        custom_model=GPTModel,
+        custom_implementation=FakeOpenAIClient,
+        instance_params=client_params,
+    )
+
+
+@Tool
+def add(a: int, b: int) -> int:
+    """Adds two numbers."""
+    return a + b
+
+
+def _schema_function(query: str, limit: int = 10, exact: bool = False) -> list:
+    """Searches the catalogue."""
+    return []
+
+
+_PARAMS = {"model": "gpt-4o", "input": [{"role": "user", "content": "1+2?"}]}
+
+
+@benchmark("Graph.run step with direct traversal")
+def graph_step(scale: float) -> float:
+    iterations = int(5000 * scale)
+    remaining = [0]
+
+    def step():
+        remaining[0] -= 1
+        return GraphRequest(traversal="loop" if remaining[0] > 0 else "end")
+
+    with Graph() as graph:
+        start = Node(node_name="start", kind="START")
+        loop = Node(node_name="loop", kind="STATE", command=step)
+        end = Node(node_name="end", kind="TERMINAL")
+        start.connect(to_node=loop, edge=Edge(edge_name="begin"))
+        loop.connect(to_node=loop, edge=Edge(edge_name="again"))
+        loop.connect(to_node=end, edge=Edge(edge_name="finish"))
+
+    def run():
+        remaining[0] = iterations
+        graph._GraphState.history.clear()
+        graph.run(start_node=start, additional_log_entries={})
+
+    return per_call_us(run, 1) / (iterations + 1)
+
+
+@benchmark("Graph.run step inside a subgraph inlined by Graph.compile")
+def subgraph_step(scale: float) -> float:
+    iterations = int(5000 * scale)
+    remaining = [0]
+
+    def step():
+        remaining[0] -= 1
+        return GraphRequest(traversal="loop" if remaining[0] > 0 else "end")
+
+    with Graph() as inner:
+        start = Node(node_name="start", kind="START")
+        loop = Node(node_name="loop", kind="STATE", command=step)
+        end = Node(node_name="end", kind="TERMINAL")
+        start.connect(to_node=loop, edge=Edge(edge_name="begin"))
+        loop.connect(to_node=loop, edge=Edge(edge_name="again"))
+        loop.connect(to_node=end, edge=Edge(edge_name="finish"))
+
+    with Graph() as outer:
+        start = Node(node_name="start", kind="START")
+        sub = Node(node_name="sub", kind="SUBGRAPH", subgraph=inner)
+        end = Node(node_name="end", kind="TERMINAL")
+        start.connect(to_node=sub, edge=Edge(edge_name="enter"))
+        sub.connect(to_node=end, edge=Edge(edge_name="leave"))
+    graph = outer.compile()
+
+    def run():
+        remaining[0] = iterations
+        graph._GraphState.history.clear()
+        graph.run(start_node=start, additional_log_entries={})
+
+    return per_call_us(run, 1) / (iterations + 3)
+
+
+@benchmark("Tool definition plus OpenAI and Anthropic schema generation")
+def tool_schema(scale: float) -> float:
+    def build():
+        tool = Tool(_schema_function)
+        tool.provider_schema("openai")
+        tool.provider_schema("anthropic")
+
+    return per_call_us(build, int(500 * scale))
+
+
+@benchmark("Memoized schema lookup for 20 tools")
+def tool_schema_cached(scale: float) -> float:
+    tools = {f"tool_{i}": Tool(_schema_function) for i in range(20)}
+    return per_call_us(
+        lambda: ToolUtility.get_tools_info_gpt(tools), int(20000 * scale)
+    )
+
+
+@benchmark("Dispatch of a single tool call with JSON arguments")
+def tool_dispatch(scale: float) -> float:
+    tools = {"add": add}
+    calls = [("call_1", "add", '{"a": 1, "b": 2}')]
+    return per_call_us(
+        lambda: ToolUtility.execute_tool_calls(calls, tools), int(5000 * scale)
+    )
+
+
+@benchmark("Dispatch of 4 parallel tool calls")
+def tool_dispatch_parallel(scale: float) -> float:
+    tools = {"add": add}
+    calls = [(f"call_{i}", "add", '{"a": 1, "b": 2}') for i in range(4)]
+    return per_call_us(
+        lambda: ToolUtility.execute_tool_calls(calls, tools), int(2000 * scale)
+    )
+
+
+@benchmark("AgentState append, unbounded history")
+def state_append(scale: float) -> float:
+    state = AgentState()
+    entry = {"response": "done", "node": "loop"}
+    return per_call_us(lambda: state.update_state(**entry), int(20000 * scale))
+
+
+@benchmark("AgentState append with a MemoryPolicy window")
+def state_append_bounded(scale: float) -> float:
+    state = AgentState(
+        memory_policy=MemoryPolicy(max_entries=500, max_bytes=64_000, keep_first=1)
+    )
+    entry = {"response": "done", "node": "loop"}
+    return per_call_us(lambda: state.update_state(**entry), int(20000 * scale))
+
+
+@benchmark("LLMAgent.action with a text answer")
+def action_text(scale: float) -> float:
+    agent = LLMAgent(name="bench", llm_model=fake_model())
+    try:
+        return per_call_us(
+            lambda: agent.action(model_params=_PARAMS), int(5000 * scale)
+        )
+    finally:
+        reset_global_agent_state()
+
+
+@benchmark("run_until_done with one tool round, end to end")
+def tool_loop(scale: float) -> float:
+    agent = LLMAgent(name="bench", llm_model=fake_model(tool_rounds=1), tools=[add])
+    try:
+        return per_call_us(
+            lambda: agent.run_until_done(model_params=_PARAMS), int(2000 * scale)
+        )
+    finally:
+        reset_global_agent_state()
+
+
+@benchmark("AgentPool throughput, 8 agents, 2 ms provider latency")
+def pool_throughput(scale: float) -> float:
+    agents = [
+        LLMAgent(name=f"agent_{i}", llm_model=fake_model(latency=0.002))
+        for i in range(8)
+    ]
+    rounds = max(1, int(10 * scale))
+    requests = [(agent, {"model_params": _PARAMS}) for agent in agents] * rounds
+    try:
+        with AgentPool(max_concurrency=8) as pool:
+            return per_call_us(lambda: pool.run(requests), 1, repeat=3) / len(requests)
+    finally:
+        reset_global_agent_state()
+
+
+def load_baselines(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as file:
+        return json.load(file)
+
+
+def save_baselines(path: str, results: dict, previous: dict) -> None:
+    baselines = {
+        "environment": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+        },
+        "thresholds": previous.get("thresholds", {"default": DEFAULT_THRESHOLD}),
+        "results": {**previous.get("results", {}), **results},
+    }
+    with open(path, "w") as file:
+        json.dump(baselines, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS))
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        help="Allowed slowdown ratio, overriding the thresholds in the baseline file",
+    )
+    parser.add_argument("--scale", type=float, default=1.0, help="Iteration multiplier")
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=2,
+        help="Reruns of a benchmark over its threshold, to rule out noise",
+    )
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    previous = load_baselines(args.baseline)
+    baseline_results = previous.get("results", {})
+    thresholds = previous.get("thresholds", {})
+
+    results = {}
+    regressions = []
+    for name in args.only or BENCHMARKS:
+        func, description = BENCHMARKS[name]
+        value = func(args.scale)
+        baseline = baseline_results.get(name)
+        if baseline and not args.update_baseline:
+            threshold = args.threshold or thresholds.get(
+                name, thresholds.get("default", DEFAULT_THRESHOLD)
+            )
+            for _ in range(args.retries):
+                if value / baseline <= threshold:
+                    break
+                value = min(value, func(args.scale))
+        results[name] = round(value, 3)
+        line = f"{name:24s} {value:10.2f} us"
+        if baseline:
+            ratio = value / baseline
+            line += f"  baseline {baseline:10.2f} us  x{ratio:.2f}"
+            if not args.update_baseline and ratio > threshold:
+                line += f"  REGRESSION (> x{threshold:.2f})"
+                regressions.append(name)
+        print(f"{line}  {description}")
+
+    if args.update_baseline:
+        save_baselines(args.baseline, results, previous)
+        print(f"Baselines written to {args.baseline}")
+        return 0
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
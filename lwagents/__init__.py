@@ -1,25 +1,53 @@
+import importlib
+
 # Import modules for better organization
-from . import agent, graph, models, state, tools
+from . import agent, graph, logs, models, ratelimit, state, tools
 from .agent import LLMAgent
 
 # Keep decorators and special functions at top level
 # Export commonly used classes directly at package level
 from .graph import Edge, Graph, GraphRequest, Node
+from .logs import configure_logging
 from .models import create_model
+from .ratelimit import Priority, configure_rate_limit, request_priority
 from .state import (
     AgentState,
     GraphState,
+    MemoryPolicy,
     get_global_agent_state,
     reset_global_agent_state,
 )
 from .tools import Tool
 
+# Loaded on first access, so "import lwagents" does not pay for them
+_LAZY_MODULES = ("pool", "registry", "serialization")
+_LAZY_ATTRIBUTES = {
+    "AgentPool": "pool",
+    "load_graph": "serialization",
+    "save_graph": "serialization",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_MODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     # Modules (for advanced users who want lwagents.state.something)
     "graph",
     "state",
     "agent",
     "tools",
+    "ratelimit",
+    "registry",
+    "pool",
+    "logs",
+    "serialization",
     "create_model",
     # Core classes (for basic usage)
     "Graph",
@@ -27,11 +55,19 @@ __all__ = [
     "Edge",
     "AgentState",
     "GraphState",
+    "MemoryPolicy",
     "LLMAgent",
+    "AgentPool",
     "Tool",
     "models",
     # Functions and utilities
     "GraphRequest",
     "get_global_agent_state",
     "reset_global_agent_state",
+    "configure_rate_limit",
+    "request_priority",
+    "Priority",
+    "configure_logging",
+    "save_graph",
+    "load_graph",
 ]
@@ -1,13 +1,15 @@
+import asyncio
 import json
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from pydantic import BaseModel
 from typing_extensions import Self, override
 
+from .conversation import ConversationBuffer
 from .messages import LLMAgentResponse, LLMToolResponse
 from .state import AgentState, State, get_global_agent_state
-from .tools import Tool, ToolUtility, ToolsExecutionResults
+from .tools import Tool, ToolOutputLimit, ToolUtility, ToolsExecutionResults
 
 
 class InvalidAgent(Exception):
@@ -15,12 +17,15 @@ class InvalidAgent(Exception):
 
 
 class Agent(ABC):
-    def __init__(self, name: str, tools: list[Tool], state: AgentState):
+    def __init__(self, name: str, tools: list[Tool], state: Optional[AgentState]):
         self.tools = None
-        self.state = state
+        # Each agent gets its own state unless one is passed in
+        self.state = state if state is not None else AgentState()
         self.name = name
         if tools:
-            self.tools = {type(tool).__name__: tool for tool in tools}
+            self.tools = {
+                getattr(tool, "name", type(tool).__name__): tool for tool in tools
+            }
 
     @abstractmethod
     def action(self, current_node: str):
@@ -49,10 +54,19 @@ class LLMAgent(Agent):
         name: str,
         llm_model,
         tools: list[Tool] = [],
-        state: Optional[AgentState] = AgentState(),
+        state: Optional[AgentState] = None,
+        max_parallel_tools: Optional[int] = None,
+        tool_timeout: Optional[float] = None,
+        tool_output_limit: Optional[ToolOutputLimit] = None,
     ):
         super().__init__(name=name, tools=tools, state=state)
         self.llm_model = llm_model
+        self.max_parallel_tools = max_parallel_tools
+        self.tool_timeout = tool_timeout
+        self.tool_output_limit = tool_output_limit
+        # Untruncated outputs of the latest truncated tool calls, by tool
+        # call id, oldest first (see ToolOutputLimit.max_kept)
+        self.tool_outputs: Dict[str, Any] = {}
 
     @override
     def action(
@@ -60,37 +74,167 @@ class LLMAgent(Agent):
         state_entry: Optional[dict] = {},
         model_params: Dict[str, Any] = {},
     ):
+        return self.commit_action(
+            *self.compute_action(model_params=model_params), state_entry
+        )
+
+    async def aaction(
+        self,
+        state_entry: Optional[dict] = {},
+        model_params: Dict[str, Any] = {},
+    ):
+        """
+        Async counterpart of action. The model call runs in a worker thread,
+        async tools are awaited on the running loop and sync tools run in
+        worker threads.
+        """
+        return self.commit_action(
+            *await self.acompute_action(model_params=model_params), state_entry
+        )
+
+    def compute_action(
+        self, model_params: Dict[str, Any] = {}
+    ) -> Tuple[Any, Optional[ToolsExecutionResults]]:
+        """
+        Calls the model and executes the requested tools without updating any
+        state. Pass the result to commit_action to record it.
+
+        Returns:
+            Tuple: The model response and the tool execution results, if any.
+        """
         response = self.llm_model.generate(
             tools=self.tools,
             model_params=model_params,
         )
-        result = None
+        tool_execution_results = None
         if type(response) == LLMToolResponse:
             tool_execution_results = ToolUtility.execute_from_response(
-                tool_response=response, tools=self.tools
+                tool_response=response,
+                tools=self.tools,
+                max_parallelism=self.max_parallel_tools,
+                timeout=self.tool_timeout,
+                output_limit=self.tool_output_limit,
+            )
+        return response, tool_execution_results
+
+    async def acompute_action(
+        self, model_params: Dict[str, Any] = {}
+    ) -> Tuple[Any, Optional[ToolsExecutionResults]]:
+        """
+        Async counterpart of compute_action.
+        """
+        response = await asyncio.to_thread(
+            self.llm_model.generate,
+            tools=self.tools,
+            model_params=model_params,
+        )
+        tool_execution_results = None
+        if type(response) == LLMToolResponse:
+            tool_execution_results = await ToolUtility.aexecute_from_response(
+                tool_response=response,
+                tools=self.tools,
+                max_parallelism=self.max_parallel_tools,
+                timeout=self.tool_timeout,
+                output_limit=self.tool_output_limit,
+            )
+        return response, tool_execution_results
+
+    @staticmethod
+    def _conversation_key(model_params: Dict[str, Any]) -> str:
+        return "messages" if "messages" in model_params else "input"
+
+    def run_until_done(
+        self,
+        state_entry: Optional[dict] = {},
+        model_params: Dict[str, Any] = {},
+        max_rounds: int = 10,
+        conversation: Optional[ConversationBuffer] = None,
+    ) -> LLMAgentResponse:
+        """
+        Calls the model and executes the requested tools, feeding their
+        results back, until the model answers without calling a tool.
+
+        Every round is recorded in the agent state like a call to action.
+
+        Args:
+            state_entry (dict, optional): Extra fields stored with every round.
+            model_params (dict): Request parameters. The conversation is taken
+                from ``input`` (OpenAI) or ``messages`` (Anthropic).
+            max_rounds (int): Maximum number of model calls.
+            conversation (ConversationBuffer, optional): Conversation to continue.
+                It is extended in place, so it can be reused for the next turn.
+
+        Returns:
+            LLMAgentResponse: The final answer, or the last tool round's result
+                if max_rounds is reached first.
+        """
+        key = self._conversation_key(model_params)
+        if conversation is None:
+            conversation = ConversationBuffer(model_params.get(key) or ())
+        result = None
+        for _ in range(max_rounds):
+            request = {**model_params, key: conversation.messages()}
+            response, tool_execution_results = self.compute_action(request)
+            conversation.append_response(response)
+            result = self.commit_action(response, tool_execution_results, state_entry)
+            if not tool_execution_results:
+                return result
+            conversation.append_tool_results(response, tool_execution_results)
+        return result
+
+    async def arun_until_done(
+        self,
+        state_entry: Optional[dict] = {},
+        model_params: Dict[str, Any] = {},
+        max_rounds: int = 10,
+        conversation: Optional[ConversationBuffer] = None,
+    ) -> LLMAgentResponse:
+        """
+        Async counterpart of run_until_done.
+        """
+        key = self._conversation_key(model_params)
+        if conversation is None:
+            conversation = ConversationBuffer(model_params.get(key) or ())
+        result = None
+        for _ in range(max_rounds):
+            request = {**model_params, key: conversation.messages()}
+            response, tool_execution_results = await self.acompute_action(request)
+            conversation.append_response(response)
+            result = self.commit_action(response, tool_execution_results, state_entry)
+            if not tool_execution_results:
+                return result
+            conversation.append_tool_results(response, tool_execution_results)
+        return result
+
+    def commit_action(
+        self,
+        response: Any,
+        tool_execution_results: Optional[ToolsExecutionResults],
+        state_entry: Optional[dict] = {},
+    ) -> LLMAgentResponse:
+        """
+        Records a computed action in the agent state and the global agent
+        state, and returns the agent response.
+        """
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            self.state.record_usage(usage)
+
+        if type(response) == LLMToolResponse and tool_execution_results:
+            results = tool_execution_results.results
+            for tool_execution_result in results:
+                if tool_execution_result.full_content is not None:
+                    self._keep_tool_output(
+                        tool_execution_result.id, tool_execution_result.full_content
+                    )
+            result = LLMAgentResponse(
+                role="tool",
+                content=str([r.content for r in results]),
+                tools_used=[r.name for r in results],
             )
-            tool_results = []
-            if tool_execution_results:
-                for tool_execution_result in tool_execution_results.results:
-                    tool_response_content = {
-                        "tool_call_id": tool_execution_result.id,
-                        "name": tool_execution_result.name,
-                        "content": tool_execution_result.content,
-                    }
-                    tool_results.append(tool_response_content)
-
-                result = LLMAgentResponse(
-                    role="tool",
-                    content=str([tr["content"] for tr in tool_results]),
-                    tools_used=[tr["name"] for tr in tool_results],
-                )
-            else:
-                result = LLMAgentResponse(
-                    role="assistant", content=None, tools_used=None
-                )
         else:
             result = LLMAgentResponse(
-                role="assistant", content=response.content, tools_used=None
+                role="assistant", content=response.content or "", tools_used=None
             )
 
         # Update both local and global state
@@ -99,5 +243,12 @@ class LLMAgent(Agent):
 
         return result
 
+    def _keep_tool_output(self, tool_call_id: str, full_content: Any) -> None:
+        max_kept = self.tool_output_limit.max_kept if self.tool_output_limit else 0
+        self.tool_outputs.pop(tool_call_id, None)
+        self.tool_outputs[tool_call_id] = full_content
+        while len(self.tool_outputs) > max_kept:
+            del self.tool_outputs[next(iter(self.tool_outputs))]
+
     def update_state(self, *args, **kwargs):
         self.state.update_state(*args, **kwargs)
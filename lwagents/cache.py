@@ -0,0 +1,193 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+
+class ToolCache(ABC):
+    """
+    Storage backend for memoized tool results.
+
+    ``get`` returns a (hit, value) pair so that None can be cached as a value.
+    """
+
+    def __init__(self):
+        self.evictions = 0
+
+    @abstractmethod
+    def get(self, key: str) -> Tuple[bool, Any]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    @abstractmethod
+    def invalidate(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class LRUCache(ToolCache):
+    """
+    In-process least-recently-used cache.
+
+    Args:
+        max_entries (int, optional): Maximum number of cached results.
+        max_bytes (int, optional): Maximum total pickled size of cached results.
+            Unpicklable results are not cached when this is set.
+        ttl (float, optional): Seconds after which an entry expires.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = 1024,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ):
+        super().__init__()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            value, expires_at, size = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any) -> None:
+        size = 0
+        if self.max_bytes is not None:
+            try:
+                size = len(pickle.dumps(value))
+            except Exception:
+                return
+            if size > self.max_bytes:
+                return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at, size)
+            self.total_bytes += size
+            while (
+                self.max_entries is not None and len(self._entries) > self.max_entries
+            ) or (self.max_bytes is not None and self.total_bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self.total_bytes -= size
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCache(ToolCache):
+    """
+    Cache persisted as one pickle file per entry in a local directory, so
+    results survive across runs and are shared between processes.
+
+    Args:
+        directory (str): Directory for the cache files. Created if missing.
+        ttl (float, optional): Seconds after which an entry expires.
+    """
+
+    suffix = ".pkl"
+
+    def __init__(self, directory: str, ttl: Optional[float] = None):
+        super().__init__()
+        self.directory = directory
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.directory, digest + self.suffix)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        try:
+            with open(self._path(key), "rb") as file:
+                stored_key, expires_at, value = pickle.load(file)
+        except OSError:
+            return False, None
+        except (
+            EOFError,
+            pickle.UnpicklingError,
+            AttributeError,
+            ImportError,
+            IndexError,
+            TypeError,
+            ValueError,
+        ):
+            # Truncated or corrupt, or pickled against a class that was renamed
+            # or removed since: drop it so the result is computed again
+            self.invalidate(key)
+            return False, None
+        if stored_key != key:
+            return False, None
+        if expires_at is not None and expires_at <= time.time():
+            self.invalidate(key)
+            return False, None
+        return True, value
+
+    def set(self, key: str, value: Any) -> None:
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        try:
+            payload = pickle.dumps((key, expires_at, value))
+        except Exception:
+            return
+        # Write to a temporary file first so readers never see partial entries
+        fd, temp_path = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, "wb") as file:
+            file.write(payload)
+        os.replace(temp_path, self._path(key))
+
+    def invalidate(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            if name.endswith(self.suffix):
+                os.remove(os.path.join(self.directory, name))
+
+    def __len__(self) -> int:
+        return sum(
+            1 for name in os.listdir(self.directory) if name.endswith(self.suffix)
+        )
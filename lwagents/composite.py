@@ -0,0 +1,413 @@
+import atexit
+import contextvars
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+from typing_extensions import override
+
+from .models import BaseLLMModel
+from .tokens import estimate_request_tokens
+from .workers import run_in_thread
+
+
+class RoutingError(Exception):
+    pass
+
+
+class LatencyStats:
+    """
+    Rolling window of observed call latencies, in seconds.
+
+    Args:
+        window (int): Number of most recent samples to keep.
+        max_age (float, optional): Seconds after which a sample is dropped,
+            so the statistics follow recovery even without new calls.
+    """
+
+    def __init__(self, window: int = 200, max_age: Optional[float] = None):
+        # (time recorded, latency) pairs
+        self._samples = deque(maxlen=window)
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._samples.append((time.monotonic(), latency))
+            self.calls += 1
+
+    def record_error(self) -> None:
+        with self._lock:
+            self.calls += 1
+            self.errors += 1
+
+    def _latencies(self) -> List[float]:
+        # Called with the lock held
+        if self.max_age is not None:
+            expired = time.monotonic() - self.max_age
+            while self._samples and self._samples[0][0] < expired:
+                self._samples.popleft()
+        return [latency for _, latency in self._samples]
+
+    @property
+    def count(self) -> int:
+        with self._lock:
+            return len(self._latencies())
+
+    def mean(self) -> Optional[float]:
+        with self._lock:
+            latencies = self._latencies()
+        if not latencies:
+            return None
+        return sum(latencies) / len(latencies)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        with self._lock:
+            ordered = sorted(self._latencies())
+            if not ordered:
+                return None
+        index = min(len(ordered) - 1, math.ceil(percentile / 100 * len(ordered)) - 1)
+        return ordered[max(index, 0)]
+
+    def summary(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "mean": self.mean(),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class HedgingPolicy:
+    """
+    Decides when a slow model call gets a duplicate (hedged) request.
+
+    Args:
+        percentile (float): Latency percentile of past calls after which to
+            hedge.
+        initial_delay (float): Hedge delay in seconds until enough samples are
+            collected.
+        min_samples (int): Samples required before the percentile is used.
+        min_delay (float): Lower bound for the hedge delay.
+        max_delay (float, optional): Upper bound for the hedge delay.
+        budget (float): Maximum fraction of calls that may be hedged.
+        burst (float): Hedges that may be issued back to back once the budget
+            has accrued.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        initial_delay: float = 2.0,
+        min_samples: int = 20,
+        min_delay: float = 0.05,
+        max_delay: Optional[float] = None,
+        budget: float = 0.1,
+        burst: float = 2.0,
+    ):
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.burst = burst
+        self._credit = 0.0
+        self._lock = threading.Lock()
+
+    def delay(self, stats: LatencyStats) -> float:
+        delay = self.initial_delay
+        if stats.count >= self.min_samples:
+            delay = stats.percentile(self.percentile)
+        delay = max(delay, self.min_delay)
+        if self.max_delay is not None:
+            delay = min(delay, self.max_delay)
+        return delay
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._credit = min(self.burst, self._credit + self.budget)
+
+    def try_acquire_hedge(self) -> bool:
+        with self._lock:
+            if self._credit >= 1.0:
+                self._credit -= 1.0
+                return True
+            return False
+
+
+_hedge_executor: Optional[ThreadPoolExecutor] = None
+_hedge_executor_lock = threading.Lock()
+
+
+def get_hedge_executor() -> ThreadPoolExecutor:
+    """
+    Returns the thread pool shared by all HedgedModels, starting it on first use.
+    """
+    global _hedge_executor
+    if _hedge_executor is None:
+        with _hedge_executor_lock:
+            if _hedge_executor is None:
+                _hedge_executor = ThreadPoolExecutor(
+                    max_workers=32, thread_name_prefix="lwagents-hedge"
+                )
+    return _hedge_executor
+
+
+def configure_hedge_executor(max_workers: int) -> ThreadPoolExecutor:
+    """
+    Replaces the thread pool shared by all HedgedModels. It bounds the
+    number of model calls (primary and hedged) in flight at once; calls
+    beyond it wait for a free thread.
+    """
+    global _hedge_executor
+    with _hedge_executor_lock:
+        if _hedge_executor is not None:
+            _hedge_executor.shutdown(wait=False)
+        _hedge_executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="lwagents-hedge"
+        )
+    return _hedge_executor
+
+
+@atexit.register
+def shutdown_hedge_executor() -> None:
+    global _hedge_executor
+    with _hedge_executor_lock:
+        if _hedge_executor is not None:
+            _hedge_executor.shutdown(wait=False, cancel_futures=True)
+            _hedge_executor = None
+
+
+def _submit(func, *args, **kwargs) -> Future:
+    # Keep the caller's context variables, e.g. the request priority
+    context = contextvars.copy_context()
+    return get_hedge_executor().submit(context.run, func, *args, **kwargs)
+
+
+class HedgedModel(BaseLLMModel):
+    """
+    Wraps a model and hedges slow generate calls.
+
+    If the primary call has not returned within the policy's delay, a
+    duplicate request is sent to the fallback model (or the primary model
+    again) and whichever finishes first wins. Calls run on a shared, bounded
+    thread pool (see configure_hedge_executor).
+
+    Provider clients are blocking, so a losing call that has already been
+    sent cannot be interrupted: it is abandoned, still runs to completion
+    and still counts against rate limits and token usage; its result is
+    discarded. Only a losing call still waiting for a pool thread is
+    cancelled before it is sent. abandoned_calls counts the former.
+
+    Args:
+        model (BaseLLMModel): The primary model.
+        policy (HedgingPolicy, optional): Hedging configuration.
+        fallback (BaseLLMModel, optional): Model used for the hedged request.
+    """
+
+    def __init__(
+        self,
+        model: BaseLLMModel,
+        policy: Optional[HedgingPolicy] = None,
+        fallback: Optional[BaseLLMModel] = None,
+    ):
+        super().__init__(model)
+        self.provider = model.provider
+        self.policy = policy or HedgingPolicy()
+        self.fallback = fallback
+        self.stats = LatencyStats()
+        self.hedged_calls = 0
+        self.hedge_wins = 0
+        self.abandoned_calls = 0
+        # Counters are updated from concurrent calls
+        self._lock = threading.Lock()
+
+    def _timed_generate(self, *args, **kwargs):
+        start = time.monotonic()
+        try:
+            response = self._model.generate(*args, **kwargs)
+        except Exception:
+            self.stats.record_error()
+            raise
+        self.stats.record(time.monotonic() - start)
+        return response
+
+    @override
+    def generate(self, *args, **kwargs) -> Any:
+        self.policy.record_request()
+        primary = _submit(self._timed_generate, *args, **kwargs)
+        done, _ = wait([primary], timeout=self.policy.delay(self.stats))
+        if done or not self.policy.try_acquire_hedge():
+            return primary.result()
+
+        with self._lock:
+            self.hedged_calls += 1
+        hedge_model = self.fallback or self._model
+        hedge = _submit(hedge_model.generate, *args, **kwargs)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        self._abandon(loser)
+                    if future is hedge:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+        return primary.result()
+
+    def _abandon(self, future: Future) -> None:
+        """
+        Drops a losing call: cancelled if it has not started, otherwise left
+        to finish in the background with its result ignored.
+        """
+        if not future.cancel():
+            with self._lock:
+                self.abandoned_calls += 1
+
+
+class Route:
+    """
+    A candidate model of a RoutedModel together with the requests it accepts.
+
+    Args:
+        name (str): Route name used in statistics.
+        model (BaseLLMModel): The model serving this route.
+        model_params (dict, optional): Overrides merged into the request's model_params,
+            e.g. {"model": "gpt-4o-mini"}.
+        max_prompt_tokens (int, optional): Only requests up to this estimated
+            size are routed here.
+        allow_tools (bool): Whether requests with tools may be routed here.
+        max_latency (float, optional): Skip the route while its observed p95
+            latency exceeds this.
+        timeout (float, optional): Seconds after which the call is abandoned and
+            the next route is tried.
+        min_samples (int): Samples required before max_latency is enforced.
+        sample_max_age (float, optional): Seconds a latency sample counts
+            towards max_latency. A route moved to the end gets few calls, so
+            its samples age out instead and it is tried first again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model: BaseLLMModel,
+        model_params: Optional[Dict[str, Any]] = None,
+        max_prompt_tokens: Optional[int] = None,
+        allow_tools: bool = True,
+        max_latency: Optional[float] = None,
+        timeout: Optional[float] = None,
+        min_samples: int = 20,
+        sample_max_age: Optional[float] = 60.0,
+    ):
+        self.name = name
+        self.model = model
+        self.model_params = model_params or {}
+        self.max_prompt_tokens = max_prompt_tokens
+        self.allow_tools = allow_tools
+        self.max_latency = max_latency
+        self.timeout = timeout
+        self.min_samples = min_samples
+        self.stats = LatencyStats(max_age=sample_max_age)
+
+    def accepts(self, prompt_tokens: int, has_tools: bool) -> bool:
+        if (
+            self.max_prompt_tokens is not None
+            and prompt_tokens > self.max_prompt_tokens
+        ):
+            return False
+        if has_tools and not self.allow_tools:
+            return False
+        return True
+
+    def is_slow(self) -> bool:
+        if self.max_latency is None or self.stats.count < self.min_samples:
+            return False
+        p95 = self.stats.percentile(95)
+        return p95 is not None and p95 > self.max_latency
+
+
+class RoutedModel(BaseLLMModel):
+    """
+    Routes each generate call to one of several models.
+
+    Routes are tried in order, so list the fastest or cheapest model first.
+    Routes that do not accept the request (prompt size, tools) are skipped,
+    routes whose observed latency is above their limit are moved to the end,
+    and on an error or timeout the next accepting route is used.
+
+    Args:
+        routes (List[Route]): Candidate routes in order of preference.
+    """
+
+    def __init__(self, routes: List[Route]):
+        if not routes:
+            raise RoutingError("RoutedModel requires at least one route")
+        super().__init__(routes[0].model)
+        self.routes = routes
+        self.last_route: Optional[str] = None
+
+    def select_routes(
+        self, tools: Optional[Dict] = None, model_params: Dict[str, Any] = {}
+    ) -> List[Route]:
+        """
+        Returns the accepting routes for a request, in the order they will be tried.
+        """
+        prompt_tokens = estimate_request_tokens(model_params)
+        candidates = [
+            route
+            for route in self.routes
+            if route.accepts(prompt_tokens=prompt_tokens, has_tools=bool(tools))
+        ]
+        slow = [route.is_slow() for route in candidates]
+        return [r for r, is_slow in zip(candidates, slow) if not is_slow] + [
+            r for r, is_slow in zip(candidates, slow) if is_slow
+        ]
+
+    def _call_route(self, route: Route, tools, model_params):
+        params = {**model_params, **route.model_params}
+        if route.timeout is None:
+            return route.model.generate(tools=tools, model_params=params)
+        future = run_in_thread(route.model.generate, tools=tools, model_params=params)
+        return future.result(timeout=route.timeout)
+
+    @override
+    def generate(
+        self,
+        tools: Optional[Dict] = None,
+        model_params: Dict[str, Any] = {},
+    ) -> Any:
+        candidates = self.select_routes(tools=tools, model_params=model_params)
+        if not candidates:
+            raise RoutingError("No route accepts this request")
+
+        last_error = None
+        for route in candidates:
+            start = time.monotonic()
+            try:
+                response = self._call_route(route, tools, model_params)
+            except Exception as error:
+                route.stats.record_error()
+                last_error = error
+                continue
+            route.stats.record(time.monotonic() - start)
+            self.last_route = route.name
+            return response
+        raise RoutingError(
+            f"All routes failed: {[route.name for route in candidates]}"
+        ) from last_error
+
+    def route_stats(self) -> Dict[str, dict]:
+        """
+        Returns the latency and error statistics of every route.
+        """
+        return {route.name: route.stats.summary() for route in self.routes}
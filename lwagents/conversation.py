@@ -0,0 +1,118 @@
+import json
+from typing import Any, Iterable, List, Optional
+
+from .messages import AnthropicToolResponse, GPTToolResponse, LLMToolResponse
+from .tokens import CountedMessages, estimate_tokens
+from .tools import ToolsExecutionResults
+
+
+def _as_item(message: Any) -> Any:
+    # Provider SDK objects are converted to plain dicts once, when appended
+    if hasattr(message, "model_dump"):
+        return message.model_dump(exclude_none=True)
+    return message
+
+
+def _tool_output(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    return json.dumps(content, default=str)
+
+
+class ConversationBuffer:
+    """
+    Append-only conversation in provider format.
+
+    Each message is converted to its provider form and its token estimate is
+    computed once, when it is appended. Later rounds of a tool loop therefore
+    only encode the new messages instead of the whole conversation.
+
+    Args:
+        messages (Iterable, optional): Initial messages, e.g. the request's
+            ``input`` (OpenAI) or ``messages`` (Anthropic) list. A string is
+            taken as a single user message.
+    """
+
+    def __init__(self, messages: Iterable[Any] | str = ()):
+        self._items: List[Any] = []
+        self._tokens = 0
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        self.extend(messages)
+
+    def append(self, message: Any) -> None:
+        item = _as_item(message)
+        self._items.append(item)
+        self._tokens += estimate_tokens(item)
+
+    def extend(self, messages: Iterable[Any]) -> None:
+        for message in messages:
+            self.append(message)
+
+    def append_response(self, response: Any) -> None:
+        """
+        Appends the model's turn: output items (OpenAI) or the assistant
+        message (Anthropic), including its tool calls.
+        """
+        results = getattr(response, "results", None)
+        if isinstance(results, GPTToolResponse):
+            self.extend(results.tool_response.output)
+        elif isinstance(results, AnthropicToolResponse):
+            message = results.tool_response
+            self.append(
+                {
+                    "role": "assistant",
+                    "content": [_as_item(block) for block in message.content],
+                }
+            )
+        elif response.content:
+            self.append({"role": "assistant", "content": response.content})
+
+    def append_tool_results(
+        self,
+        response: LLMToolResponse,
+        tool_execution_results: Optional[ToolsExecutionResults],
+    ) -> None:
+        """
+        Appends the outputs of the tool calls requested in response.
+        """
+        if not tool_execution_results:
+            return
+        results = tool_execution_results.results
+        if isinstance(response.results, GPTToolResponse):
+            for result in results:
+                self.append(
+                    {
+                        "type": "function_call_output",
+                        "call_id": result.id,
+                        "output": _tool_output(result.content),
+                    }
+                )
+        else:
+            self.append(
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "tool_result",
+                            "tool_use_id": result.id,
+                            "content": _tool_output(result.content),
+                            **({"is_error": True} if result.is_error else {}),
+                        }
+                        for result in results
+                    ],
+                }
+            )
+
+    def messages(self) -> CountedMessages:
+        """
+        Returns the conversation to send, carrying its token estimate.
+        """
+        return CountedMessages(self._items, self._tokens)
+
+    @property
+    def estimated_tokens(self) -> int:
+        return self._tokens
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -0,0 +1,764 @@
+import itertools
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import pickle
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from .logs import get_logger, log_event
+
+_logger = get_logger("distributed")
+
+# Empty task message: tells a worker to exit
+_STOP = b""
+
+
+class DistributedError(Exception):
+    pass
+
+
+class TaskLostError(DistributedError):
+    """
+    Raised when a task's workers died or stopped sending heartbeats more
+    often than the executor's max_retries allows.
+    """
+
+
+class TaskTimeoutError(DistributedError, TimeoutError):
+    """
+    Raised by DistributedExecutor.execute when a task has not finished
+    within the executor's task_timeout.
+    """
+
+
+# -------------------------------
+# Transport
+# -------------------------------
+
+
+class TaskQueue(ABC):
+    """
+    Transport between the coordinator and its workers.
+
+    Two channels carry opaque, already serialized messages: tasks go from
+    the coordinator to any one worker, events (task claims, heartbeats and
+    results) from the workers to the coordinator. A broker implementation
+    needs only these four operations, e.g. a Redis list per channel with
+    LPUSH and BRPOP. put_event must not return before the event is
+    delivered, or tasks of a worker that dies right after claiming them
+    cannot be retried.
+
+    A hung worker is killed wherever it is, so a worker must not hold
+    anything shared with other workers while it waits for a task or sends
+    an event.
+    """
+
+    @abstractmethod
+    def put_task(self, message: bytes) -> None:
+        pass
+
+    @abstractmethod
+    def get_task(self, timeout: float) -> Optional[bytes]:
+        """Returns the next task, or None after timeout seconds without one."""
+        pass
+
+    @abstractmethod
+    def put_event(self, message: bytes) -> None:
+        pass
+
+    @abstractmethod
+    def get_event(self, timeout: float) -> Optional[bytes]:
+        """Returns the next event, or None after timeout seconds without one."""
+        pass
+
+    def worker_channel(self, worker_id: str) -> "TaskQueue":
+        """
+        Returns the TaskQueue to hand to a new worker process. Transports
+        can give each worker its own event channel here. Defaults to self.
+        """
+        return self
+
+    def detach(self) -> None:
+        """
+        Called in the coordinator on a worker channel once its worker has
+        started, to release the coordinator's copy of worker-side resources.
+        """
+
+    def close(self) -> None:
+        pass
+
+
+def _read_task(reader, lock, timeout: float) -> Optional[bytes]:
+    # Wait without the lock, so a worker killed while waiting cannot leave
+    # it held (multiprocessing.Queue.get holds its lock while waiting); the
+    # lock only makes sure one worker reads a given message
+    if not reader.poll(timeout):
+        return None
+    if not lock.acquire(timeout=timeout):
+        return None
+    try:
+        # Another worker may have taken the message in the meantime
+        if not reader.poll(0):
+            return None
+        return reader.recv_bytes()
+    finally:
+        lock.release()
+
+
+class _WorkerChannel(TaskQueue):
+    """
+    A worker's view of a MultiprocessingTaskQueue: the shared task pipe and
+    an event pipe of its own.
+    """
+
+    def __init__(self, task_reader, task_lock, event_writer):
+        self._task_reader = task_reader
+        self._task_lock = task_lock
+        self._event_writer = event_writer
+        # Only this worker's threads write to the pipe
+        self._event_lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_event_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._event_lock = threading.Lock()
+
+    def put_task(self, message: bytes) -> None:
+        raise DistributedError("Workers cannot queue tasks")
+
+    def get_task(self, timeout: float) -> Optional[bytes]:
+        return _read_task(self._task_reader, self._task_lock, timeout)
+
+    def put_event(self, message: bytes) -> None:
+        with self._event_lock:
+            self._event_writer.send_bytes(message)
+
+    def get_event(self, timeout: float) -> Optional[bytes]:
+        raise DistributedError("Workers cannot read events")
+
+    def detach(self) -> None:
+        self._event_writer.close()
+
+
+class MultiprocessingTaskQueue(TaskQueue):
+    """
+    TaskQueue for workers on the same machine.
+
+    Tasks travel over a pipe that all workers read; the coordinator writes
+    them from a background thread, so put_task never blocks on a full pipe.
+    Each worker started through worker_channel (as DistributedExecutor
+    does) writes its events straight to a pipe of its own, so a task claim
+    has been delivered before the worker starts the task, and a worker
+    killed in the middle of writing an event cannot block or corrupt the
+    events of the others: its pipe is dropped once it is gone. Workers
+    given this object itself share one event pipe and lock instead.
+
+    A worker is killed while holding the task lock only if it stalls in the
+    middle of reading a task; the task pipe then stays blocked.
+
+    Args:
+        start_method (str, optional): multiprocessing start method; must match
+            the one the workers are started with.
+    """
+
+    def __init__(self, start_method: Optional[str] = None):
+        self._start_method = start_method
+        context = multiprocessing.get_context(start_method)
+        self._task_reader, self._task_writer = context.Pipe(duplex=False)
+        self._task_lock = context.Lock()
+        self._event_reader, self._event_writer = context.Pipe(duplex=False)
+        self._event_lock = context.Lock()
+        # Coordinator side only
+        self._readers = [self._event_reader]
+        self._readers_lock = threading.Lock()
+        self._outbox: Optional[queue.SimpleQueue] = None
+        self._feeder: Optional[threading.Thread] = None
+        self._feeder_lock = threading.Lock()
+
+    def __getstate__(self):
+        # Sent to workers, which only read tasks and write events
+        state = self.__dict__.copy()
+        for name in ("_readers", "_readers_lock", "_outbox", "_feeder", "_feeder_lock"):
+            state[name] = None
+        return state
+
+    def worker_channel(self, worker_id: str) -> TaskQueue:
+        context = multiprocessing.get_context(self._start_method)
+        reader, writer = context.Pipe(duplex=False)
+        with self._readers_lock:
+            self._readers.append(reader)
+        return _WorkerChannel(self._task_reader, self._task_lock, writer)
+
+    def put_task(self, message: bytes) -> None:
+        if self._outbox is None:
+            with self._feeder_lock:
+                if self._outbox is None:
+                    self._feeder = threading.Thread(
+                        target=self._feed, name="lwagents-task-feeder", daemon=True
+                    )
+                    self._outbox = queue.SimpleQueue()
+                    self._feeder.start()
+        self._outbox.put(message)
+
+    def _feed(self) -> None:
+        while True:
+            message = self._outbox.get()
+            if message is None:
+                return
+            try:
+                self._task_writer.send_bytes(message)
+            except OSError:
+                return
+
+    def get_task(self, timeout: float) -> Optional[bytes]:
+        return _read_task(self._task_reader, self._task_lock, timeout)
+
+    def put_event(self, message: bytes) -> None:
+        with self._event_lock:
+            self._event_writer.send_bytes(message)
+
+    def get_event(self, timeout: float) -> Optional[bytes]:
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._readers_lock:
+                readers = list(self._readers)
+            remaining = max(0.0, deadline - time.monotonic())
+            for reader in multiprocessing.connection.wait(readers, remaining):
+                try:
+                    message = reader.recv_bytes()
+                except (EOFError, OSError):
+                    # The worker is gone and everything it sent has been read
+                    self._drop_reader(reader)
+                    continue
+                with self._readers_lock:
+                    # Move to the back, so busy workers do not starve others
+                    if reader in self._readers:
+                        self._readers.remove(reader)
+                        self._readers.append(reader)
+                return message
+            if remaining <= 0:
+                return None
+
+    def _drop_reader(self, reader) -> None:
+        with self._readers_lock:
+            if reader in self._readers:
+                self._readers.remove(reader)
+        reader.close()
+
+    def close(self) -> None:
+        if self._feeder is not None:
+            self._outbox.put(None)
+            self._feeder.join(timeout=1)
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+        for connection in (self._task_reader, self._task_writer, self._event_writer):
+            connection.close()
+        for reader in readers:
+            reader.close()
+
+
+# -------------------------------
+# Messages
+# -------------------------------
+
+
+@dataclass
+class _Task:
+    task_id: int
+    command: Any
+    parameters: Dict[str, Any]
+    attempt: int = 0
+
+
+@dataclass
+class _Claimed:
+    task_id: int
+    worker_id: str
+    attempt: int = 0
+
+
+@dataclass
+class _Heartbeat:
+    worker_id: str
+    task_id: Optional[int]
+
+
+@dataclass
+class _Result:
+    task_id: int
+    worker_id: str
+    succeeded: bool
+    payload: Any
+
+
+def _dumps(message: Any) -> bytes:
+    return pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+# -------------------------------
+# Worker
+# -------------------------------
+
+
+def _result_message(task: _Task, worker_id: str) -> bytes:
+    try:
+        reply = _Result(task.task_id, worker_id, True, task.command(**task.parameters))
+    except BaseException as error:
+        reply = _Result(task.task_id, worker_id, False, error)
+    try:
+        return _dumps(reply)
+    except Exception as error:
+        # Unpicklable result or exception
+        failure = DistributedError(
+            f"Result of task {task.task_id} could not be serialized: {error}"
+        )
+        return _dumps(_Result(task.task_id, worker_id, False, failure))
+
+
+def worker_main(
+    task_queue: TaskQueue, worker_id: str, heartbeat_interval: float = 1.0
+) -> None:
+    """
+    Worker loop: takes tasks from the queue, runs them and publishes the
+    results, sending a heartbeat every heartbeat_interval seconds meanwhile.
+    Runs until it receives a stop message. Also usable to start workers on
+    other machines against a shared broker.
+    """
+    current_task: list = [None]
+    stopped = threading.Event()
+
+    def send_heartbeats():
+        while not stopped.wait(heartbeat_interval):
+            task_queue.put_event(_dumps(_Heartbeat(worker_id, current_task[0])))
+
+    threading.Thread(target=send_heartbeats, daemon=True).start()
+    task_queue.put_event(_dumps(_Heartbeat(worker_id, None)))
+    try:
+        while True:
+            message = task_queue.get_task(timeout=heartbeat_interval)
+            if message is None:
+                continue
+            if message == _STOP:
+                return
+            task: _Task = pickle.loads(message)
+            current_task[0] = task.task_id
+            task_queue.put_event(
+                _dumps(_Claimed(task.task_id, worker_id, task.attempt))
+            )
+            task_queue.put_event(_result_message(task, worker_id))
+            current_task[0] = None
+    finally:
+        stopped.set()
+
+
+# -------------------------------
+# Coordinator
+# -------------------------------
+
+
+class _PendingTask:
+    __slots__ = ("task", "future", "worker_id", "queued_at")
+
+    def __init__(self, task: _Task):
+        self.task = task
+        self.future = Future()
+        self.worker_id: Optional[str] = None
+        self.queued_at = time.monotonic()
+
+
+class _WorkerHandle:
+    __slots__ = ("worker_id", "process", "last_seen", "idle_since")
+
+    def __init__(self, worker_id: str, process):
+        self.worker_id = worker_id
+        self.process = process
+        self.last_seen = time.monotonic()
+        # Start of the current run of idle heartbeats, None while busy
+        self.idle_since: Optional[float] = None
+
+
+class DistributedExecutor:
+    """
+    Runs node commands in a pool of worker processes.
+
+    Pass it to Graph.run: the calling process stays the coordinator, walking
+    the graph, evaluating edges and recording the state, while each node's
+    command and parameters are pickled and run by a worker. Commands must
+    therefore be importable module-level functions, and their results
+    (e.g. GraphRequest) picklable.
+
+    Workers send a heartbeat every heartbeat_interval seconds. A worker that
+    dies or misses heartbeats for heartbeat_timeout seconds is replaced, and
+    the task it was running is queued again, up to max_retries times. A task
+    that nobody claimed while some worker sat idle for heartbeat_timeout
+    seconds was taken by a worker that died before claiming it; it is queued
+    again the same way.
+    Exceptions raised by a command are not retried; they are re-raised in
+    the coordinator.
+
+    With task_timeout set, execute raises TaskTimeoutError once a task has
+    taken that long. The task is abandoned, not interrupted: a worker that
+    already runs it finishes it and its result is discarded.
+
+    Args:
+        workers (int, optional): Number of worker processes. Defaults to the CPU count.
+        task_queue (TaskQueue, optional): Transport. Defaults to a
+            MultiprocessingTaskQueue.
+        heartbeat_interval (float): Seconds between worker heartbeats.
+        heartbeat_timeout (float): Seconds without heartbeat after which a
+            worker counts as lost.
+        max_retries (int): Times a lost task is queued again.
+        start_method (str, optional): multiprocessing start method.
+        task_timeout (float, optional): Seconds execute waits for a task,
+            queueing included. Defaults to waiting indefinitely.
+
+    Example:
+        with DistributedExecutor(workers=4) as executor:
+            graph.run(start_node=start, executor=executor)
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        task_queue: Optional[TaskQueue] = None,
+        heartbeat_interval: float = 1.0,
+        heartbeat_timeout: float = 5.0,
+        max_retries: int = 2,
+        start_method: Optional[str] = None,
+        task_timeout: Optional[float] = None,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_retries = max_retries
+        self.task_timeout = task_timeout
+        self._context = multiprocessing.get_context(start_method)
+        self._queue = task_queue or MultiprocessingTaskQueue(start_method)
+        self._task_ids = itertools.count()
+        self._worker_ids = itertools.count()
+        self._pending: Dict[int, _PendingTask] = {}
+        self._workers: Dict[str, _WorkerHandle] = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._failure: Optional[BaseException] = None
+        self.retried = 0
+
+    # -------- lifecycle --------
+
+    def start(self) -> "DistributedExecutor":
+        with self._lock:
+            if self._dispatcher is not None:
+                return self
+            for _ in range(self.workers):
+                self._spawn_worker()
+            self._dispatcher = threading.Thread(
+                target=self._dispatch, name="lwagents-coordinator", daemon=True
+            )
+            self._dispatcher.start()
+        return self
+
+    def _spawn_worker(self) -> None:
+        worker_id = f"worker-{next(self._worker_ids)}"
+        channel = self._queue.worker_channel(worker_id)
+        process = self._context.Process(
+            target=worker_main,
+            args=(channel, worker_id, self.heartbeat_interval),
+            name=f"lwagents-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        channel.detach()
+        self._workers[worker_id] = _WorkerHandle(worker_id, process)
+
+    def shutdown(self) -> None:
+        """
+        Stops the workers. Tasks still pending fail with DistributedError.
+        """
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        with self._lock:
+            workers = list(self._workers.values())
+        for _ in workers:
+            self._queue.put_task(_STOP)
+        for worker in workers:
+            worker.process.join(timeout=max(1.0, self.heartbeat_interval))
+            if worker.process.is_alive():
+                worker.process.kill()
+                worker.process.join()
+        if self._dispatcher is not None:
+            self._dispatcher.join()
+        self._fail_pending(
+            DistributedError("Executor shut down before the task finished")
+        )
+        self._queue.close()
+
+    def __enter__(self) -> "DistributedExecutor":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.shutdown()
+
+    # -------- tasks --------
+
+    def submit(self, command, parameters: Optional[Dict[str, Any]] = None) -> Future:
+        """
+        Queues command(**parameters) for a worker.
+
+        Returns:
+            Future: Resolves to the command's result.
+        """
+        if self._failure is not None:
+            raise DistributedError(
+                f"Executor coordinator failed: {self._failure!r}"
+            ) from self._failure
+        if self._closed.is_set():
+            raise DistributedError("Executor is shut down")
+        self.start()
+        task = _Task(next(self._task_ids), command, parameters or {})
+        try:
+            message = _dumps(task)
+        except Exception as error:
+            raise DistributedError(
+                f"Task for {getattr(command, '__qualname__', command)} could not be "
+                "serialized; commands must be importable module-level functions: "
+                f"{error}"
+            ) from error
+        pending_task = _PendingTask(task)
+        with self._lock:
+            self._pending[task.task_id] = pending_task
+        self._queue.put_task(message)
+        return pending_task.future
+
+    def execute(self, node) -> Any:
+        """
+        Runs the node's command in a worker and returns its result
+        (NodeExecutor interface of Graph.run).
+
+        Raises:
+            TaskTimeoutError: If the task did not finish within task_timeout.
+        """
+        future = self.submit(node.command, node.parameters)
+        try:
+            return future.result(timeout=self.task_timeout)
+        except FutureTimeoutError:
+            pass
+        error = TaskTimeoutError(
+            f"Task for node {node.node_name} did not finish within "
+            f"{self.task_timeout:.3g} seconds"
+        )
+        with self._lock:
+            abandoned = [
+                task_id
+                for task_id, pending_task in self._pending.items()
+                if pending_task.future is future
+            ]
+            # A late result finds no pending task and is ignored
+            for task_id in abandoned:
+                del self._pending[task_id]
+        if abandoned:
+            future.set_exception(error)
+        # Otherwise the result arrived meanwhile and is being set
+        return future.result()
+
+    # -------- coordinator loop --------
+
+    def _dispatch(self) -> None:
+        try:
+            last_check = time.monotonic()
+            while not self._closed.is_set():
+                message = self._queue.get_event(timeout=self.heartbeat_interval / 2)
+                if message is not None:
+                    self._handle_message(message)
+                now = time.monotonic()
+                if now - last_check >= self.heartbeat_interval / 2:
+                    self._check_workers(now)
+                    last_check = now
+        except BaseException as error:
+            # Without the coordinator no task can finish: fail them all
+            # instead of leaving their futures waiting forever
+            self._failure = error
+            log_event(
+                _logger,
+                logging.ERROR,
+                "coordinator.failed",
+                "Coordinator failed, failing all pending tasks: %r",
+                error,
+                error=repr(error),
+            )
+            self._fail_pending(
+                DistributedError(f"Executor coordinator failed: {error!r}")
+            )
+
+    def _handle_message(self, message: bytes) -> None:
+        """
+        Handles one event; a malformed event is logged and skipped.
+        """
+        try:
+            self._handle(pickle.loads(message))
+        except Exception as error:
+            log_event(
+                _logger,
+                logging.WARNING,
+                "event.invalid",
+                "Skipping event that could not be handled: %r",
+                error,
+                error=repr(error),
+            )
+
+    def _fail_pending(self, error: Exception) -> None:
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for pending_task in pending:
+            if not pending_task.future.done():
+                pending_task.future.set_exception(error)
+
+    def _handle(self, event) -> None:
+        resolved = None
+        failed = []
+        now = time.monotonic()
+        with self._lock:
+            worker = self._workers.get(event.worker_id)
+            if worker is not None:
+                worker.last_seen = now
+                if isinstance(event, _Heartbeat) and event.task_id is None:
+                    if worker.idle_since is None:
+                        worker.idle_since = now
+                elif not isinstance(event, _Result):
+                    worker.idle_since = None
+            if isinstance(event, _Claimed):
+                pending_task = self._pending.get(event.task_id)
+                # Claims of an earlier attempt of a retried task are stale
+                if (
+                    pending_task is not None
+                    and pending_task.task.attempt == event.attempt
+                ):
+                    if worker is not None:
+                        pending_task.worker_id = event.worker_id
+                    else:
+                        # The claim arrived after its worker was found lost,
+                        # events of different workers are not ordered
+                        self._retry(pending_task, event.worker_id, now, failed)
+            elif isinstance(event, _Result):
+                pending_task = self._pending.get(event.task_id)
+                # Ignore results of a lost worker whose task was retried
+                if pending_task is not None and pending_task.worker_id in (
+                    None,
+                    event.worker_id,
+                ):
+                    resolved = self._pending.pop(event.task_id)
+        if resolved is not None and not resolved.future.done():
+            if event.succeeded:
+                resolved.future.set_result(event.payload)
+            else:
+                resolved.future.set_exception(event.payload)
+        self._fail_lost(failed)
+
+    def _retry(
+        self,
+        pending_task: _PendingTask,
+        worker_id: Optional[str],
+        now: float,
+        failed: list,
+    ) -> None:
+        """
+        Queues a lost task again, or moves it to failed once it has used up
+        its retries. Called with the lock held.
+        """
+        task = pending_task.task
+        if task.attempt >= self.max_retries:
+            del self._pending[task.task_id]
+            failed.append(pending_task)
+            return
+        task.attempt += 1
+        pending_task.worker_id = None
+        pending_task.queued_at = now
+        self.retried += 1
+        log_event(
+            _logger,
+            logging.WARNING,
+            "task.retry",
+            "Retrying task %d lost on %s (attempt %d of %d)",
+            task.task_id,
+            worker_id or "a worker that died before claiming it",
+            task.attempt,
+            self.max_retries,
+            task=task.task_id,
+            worker=worker_id,
+            attempt=task.attempt,
+        )
+        self._queue.put_task(_dumps(task))
+
+    def _check_workers(self, now: float) -> None:
+        failed = []
+        with self._lock:
+            # Workers stopping during shutdown are not lost
+            if self._closed.is_set():
+                return
+            for worker_id, worker in list(self._workers.items()):
+                alive = worker.process.is_alive()
+                if alive and now - worker.last_seen <= self.heartbeat_timeout:
+                    continue
+                log_event(
+                    _logger,
+                    logging.WARNING,
+                    "worker.lost",
+                    "Worker %s %s, replacing it",
+                    worker_id,
+                    "stopped sending heartbeats" if alive else "died",
+                    worker=worker_id,
+                    alive=alive,
+                )
+                if alive:
+                    worker.process.kill()
+                worker.process.join()
+                del self._workers[worker_id]
+                if not self._closed.is_set():
+                    self._spawn_worker()
+                for pending_task in list(self._pending.values()):
+                    if pending_task.worker_id == worker_id:
+                        self._retry(pending_task, worker_id, now, failed)
+
+            # A task is taken off the queue before its claim is sent, so one
+            # taken by a worker that died in between has no owner. It is gone
+            # once a worker has been idle, waiting on the queue, for
+            # heartbeat_timeout seconds since the task was queued
+            idle_since = [
+                worker.idle_since
+                for worker in self._workers.values()
+                if worker.idle_since is not None
+            ]
+            if idle_since:
+                idle_since = min(idle_since)
+                for pending_task in list(self._pending.values()):
+                    if (
+                        pending_task.worker_id is None
+                        and max(idle_since, pending_task.queued_at)
+                        + self.heartbeat_timeout
+                        <= now
+                    ):
+                        self._retry(pending_task, None, now, failed)
+        self._fail_lost(failed)
+
+    def _fail_lost(self, failed: list) -> None:
+        for pending_task in failed:
+            pending_task.future.set_exception(
+                TaskLostError(
+                    f"Task {pending_task.task.task_id} was lost "
+                    f"{self.max_retries + 1} times"
+                )
+            )
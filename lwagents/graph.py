@@ -1,18 +1,24 @@
+import logging
+from contextlib import nullcontext
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Literal, Optional, Tuple
+from typing import Any, Dict, List, Literal, Optional, Protocol, Tuple
 
-from pydantic import BaseModel, Field, SkipValidation
+from pydantic import BaseModel, Field, SkipValidation, model_validator
 from typing_extensions import Self, override
 
 from .agent import LLMAgent
+from .logs import get_logger, log_event, stream_logs
 from .state import GraphState
 
+_logger = get_logger("graph")
+
 
 class NodeKind(str, Enum):
     START = "START"
     STATE = "STATE"
     TERMINAL = "TERMINAL"
+    SUBGRAPH = "SUBGRAPH"
 
 
 class Node(BaseModel):
@@ -22,6 +28,23 @@ class Node(BaseModel):
     parameters: Optional[Dict[str, Any]] = Field(
         default_factory=dict, description="Parameters for the command"
     )
+    subgraph: Optional[Any] = Field(
+        None, description="The Graph embedded by a SUBGRAPH node"
+    )
+    inline: bool = Field(
+        True,
+        description="Whether Graph.compile inlines the subgraph into the parent graph",
+    )
+
+    @model_validator(mode="after")
+    def _check_subgraph(self) -> Self:
+        # The traversal runs either a node's command or its subgraph
+        if self.kind == NodeKind.SUBGRAPH and self.command is not None:
+            raise ValueError(
+                f"SUBGRAPH node {self.node_name} cannot have a command; "
+                "add a STATE node before or after it instead"
+            )
+        return self
 
     def connect(self, to_node: Self, edge: "Edge"):
         """
@@ -87,8 +110,21 @@ class GraphException(Exception):
     pass
 
 
-class DirectTraversalRequest(BaseModel):
-    traversal: str = Field(..., description="The traversal to the next node")
+class NodeExecutor(Protocol):
+    """
+    Runs node commands for Graph.run, e.g. in other processes.
+    """
+
+    def execute(self, node: "Node") -> Any:
+        """Runs the node's command with its parameters and returns the result."""
+        ...
+
+
+def execute_node(node: "Node") -> Any:
+    """
+    Runs the node's command in the calling thread.
+    """
+    return node.command(**node.parameters)
 
 
 class BaseGraph:
@@ -126,6 +162,11 @@ class Graph(BaseGraph):
     def __init__(self, state=None):
         super().__init__()
         self._GraphState = state or GraphState([])
+        # Set by compile for inlined subgraph nodes: the subgraph each node
+        # came from, and (subgraph, name in the subgraph) -> name in this graph,
+        # so direct traversals by subgraph-local names keep working
+        self._scopes: Dict[str, str] = {}
+        self._aliases: Dict[Tuple[str, str], str] = {}
 
     def connect_edge(self, FROM: Node, TO: Node, WITH: Edge):
         """
@@ -140,6 +181,131 @@ class Graph(BaseGraph):
             self._graphDict[FROM] = []
         self._graphDict[FROM].append((TO, WITH))
 
+    def add_node(self, node: Node) -> None:
+        """
+        Adds a node without edges, e.g. a TERMINAL node before connecting to it.
+        """
+        self._graphDict.setdefault(node, [])
+
+    def nodes(self) -> List[Node]:
+        """
+        Returns the nodes of the graph, sources and targets of edges alike,
+        in the order they were added.
+        """
+        nodes = {}
+        for node, connections in self._graphDict.items():
+            nodes.setdefault(node.node_name, node)
+            for connected_node, _ in connections:
+                nodes.setdefault(connected_node.node_name, connected_node)
+        return list(nodes.values())
+
+    def get_node(self, node_name: str) -> Node:
+        for node in self.nodes():
+            if node.node_name == node_name:
+                return node
+        raise KeyError(f"Node {node_name} not in graph")
+
+    def start_node(self) -> Node:
+        """
+        Returns the START node of the graph.
+        """
+        for node in self.nodes():
+            if node.kind == NodeKind.START:
+                return node
+        raise GraphException("Graph has no START node")
+
+    def compile(self) -> "Graph":
+        """
+        Returns a graph with the SUBGRAPH nodes inlined, sharing this graph's
+        state.
+
+        Each inlined subgraph is flattened into the new graph: its START node
+        takes the SUBGRAPH node's name, its other nodes are prefixed with it
+        (e.g. "research.search") and its TERMINAL nodes become commandless
+        STATE nodes with the SUBGRAPH node's outgoing edges. Steps of the
+        subgraph then run and are logged in this graph's GraphState like any
+        other step. Direct traversals by names local to the subgraph are
+        resolved within the subgraph. SUBGRAPH nodes with inline=False are
+        kept and run as nested graphs.
+
+        Returns:
+            Graph: The compiled graph. Nodes outside of subgraphs are the
+                same objects as in this graph, so its START node can be used
+                to run the compiled graph.
+
+        Raises:
+            GraphException: If a SUBGRAPH node has no subgraph or inlined
+                names collide.
+        """
+        compiled = Graph(state=self._GraphState)
+        compiled._scopes = dict(self._scopes)
+        compiled._aliases = dict(self._aliases)
+        entries = {}
+        exits = {}
+        for node in self.nodes():
+            if node.kind == NodeKind.SUBGRAPH and node.inline:
+                entries[node], exits[node] = compiled._inline_subgraph(node)
+            else:
+                compiled.add_node(node)
+
+        for source, connections in self._graphDict.items():
+            for target, edge in connections:
+                target = entries.get(target, target)
+                for exit_node in exits.get(source, [source]):
+                    compiled.connect_edge(FROM=exit_node, TO=target, WITH=edge)
+
+        names = [node.node_name for node in compiled._graphDict]
+        if len(names) != len(set(names)):
+            duplicates = sorted({name for name in names if names.count(name) > 1})
+            raise GraphException(
+                f"Inlining subgraphs produced duplicate node names: {duplicates}"
+            )
+        return compiled
+
+    def _inline_subgraph(self, node: Node) -> Tuple[Node, List[Node]]:
+        """
+        Adds the nodes and edges of a SUBGRAPH node's subgraph to this graph.
+        Returns the entry node and the exit nodes that replace the former
+        START and TERMINAL nodes.
+        """
+        if node.subgraph is None:
+            raise GraphException(f"SUBGRAPH node {node.node_name} has no subgraph")
+        inner = node.subgraph.compile()
+        prefix = node.node_name
+        start = inner.start_node()
+
+        def rename(name: str) -> str:
+            return prefix if name == start.node_name else f"{prefix}.{name}"
+
+        copies = {}
+        for inner_node in inner.nodes():
+            update = {"node_name": rename(inner_node.node_name)}
+            if inner_node.kind == NodeKind.START:
+                update["kind"] = NodeKind.STATE
+            elif inner_node.kind == NodeKind.TERMINAL:
+                # A nested run stops at its TERMINAL node without running it
+                update.update(kind=NodeKind.STATE, command=None, parameters={})
+            copies[inner_node] = inner_node.model_copy(update=update)
+            self.add_node(copies[inner_node])
+            scope = inner._scopes.get(inner_node.node_name)
+            self._scopes[rename(inner_node.node_name)] = (
+                f"{prefix}.{scope}" if scope else prefix
+            )
+            self._aliases[(prefix, inner_node.node_name)] = rename(inner_node.node_name)
+        for (scope, name), target in inner._aliases.items():
+            self._aliases[(f"{prefix}.{scope}", name)] = rename(target)
+
+        for source, connections in inner._graphDict.items():
+            for target, edge in connections:
+                self.connect_edge(FROM=copies[source], TO=copies[target], WITH=edge)
+
+        exit_nodes = [
+            copies[inner_node]
+            for inner_node in inner.nodes()
+            if inner_node.kind == NodeKind.TERMINAL
+        ]
+        return copies[start], exit_nodes
+
     def get_edges(self, node: Node) -> List[Tuple[Node, Edge]]:
         """
         Retrieves edges connected to the given node.
@@ -216,6 +382,7 @@ class Graph(BaseGraph):
         streaming=False,
         additional_log_entries: Dict = {},
         *args,
+        executor: Optional["NodeExecutor"] = None,
         **kwargs,
     ):
         """
@@ -224,47 +391,81 @@ class Graph(BaseGraph):
         Args:
             start_node (Node): The starting node of the graph.
             streaming (bool): If True, print execution details in real-time.
+                Details are logged to the "lwagents.graph" logger either way;
+                streaming prints that logger's INFO records to stdout.
+            executor (NodeExecutor, optional): Runs the node commands, e.g. a
+                lwagents.distributed.DistributedExecutor. By default commands
+                run in the calling thread.
 
         Raises:
             GraphException: If no valid transition is found or if conditions return non-boolean values.
         """
-        if streaming:
-            print("Executing Graph...")
-
         if start_node.kind != "START":
             raise GraphException(
                 f"Chosen starting Node: {start_node.node_name} is not of type START"
             )
+        with stream_logs() if streaming else nullcontext():
+            self._traverse(start_node, additional_log_entries, executor)
+
+    def _traverse(
+        self,
+        start_node: Node,
+        additional_log_entries: Dict,
+        executor: Optional["NodeExecutor"] = None,
+    ) -> Node:
+        execute = executor.execute if executor is not None else execute_node
+        # Checked once per run, so disabled levels cost nothing per step
+        info = _logger.isEnabledFor(logging.INFO)
+        if info:
+            log_event(
+                _logger,
+                logging.INFO,
+                "graph.start",
+                "Executing Graph from node %s",
+                start_node.node_name,
+                node=start_node.node_name,
+            )
 
         current_node = start_node
         step_number = 1
 
         while current_node.kind != "TERMINAL" and current_node is not None:
-            if streaming:
-                print(
-                    f"Current_Node: {current_node.node_name}, Kind: {current_node.kind}"
+            if info:
+                log_event(
+                    _logger,
+                    logging.INFO,
+                    "node.enter",
+                    "Current_Node: %s, Kind: %s",
+                    current_node.node_name,
+                    NodeKind(current_node.kind).value,
+                    node=current_node.node_name,
+                    kind=NodeKind(current_node.kind).value,
+                    step=step_number,
                 )
 
             execution_result = None
-            direct_traversal_request = None
+            direct_traversal = None
             if current_node.command:
-                execution_result = current_node.command(**current_node.parameters)
-                if isinstance(execution_result, GraphRequest):
-                    if execution_result.commands:
-                        for command in execution_result.commands:
-                            command(**execution_result.parameters)
-                    if execution_result.update_additional_log_entries:
-                        additional_log_entries.update(
-                            execution_result.update_additional_log_entries
-                        )
-                    if execution_result.traversal:
-                        direct_traversal_request = DirectTraversalRequest(
-                            traversal=execution_result.traversal
-                        )
-                if streaming:
-                    print(
-                        f"{current_node.node_name} executed its command. Result: {execution_result}"
+                execution_result = execute(current_node)
+                direct_traversal = self._apply_request(
+                    execution_result, additional_log_entries
+                )
+                if info:
+                    log_event(
+                        _logger,
+                        logging.INFO,
+                        "node.result",
+                        "%s executed its command. Result: %s",
+                        current_node.node_name,
+                        # Formatted later on the async listener: snapshot it
+                        str(execution_result),
+                        node=current_node.node_name,
+                        step=step_number,
                     )
+            elif current_node.kind == NodeKind.SUBGRAPH:
+                execution_result = self._run_subgraph(
+                    current_node, additional_log_entries, executor, info
+                )
 
             log_entry = {
                 "step_number": step_number,
@@ -274,78 +475,162 @@ class Graph(BaseGraph):
                 "transition": None,
                 **additional_log_entries,
             }
-
-            if streaming:
-                print("📚 State Global History", self._GraphState.history)
-
-            next_node = None
-
-            if direct_traversal_request:
-                target_node_name = direct_traversal_request.traversal
-                if streaming:
-                    print(f"➡️ Direct traversal to node: {target_node_name}")
-                next_node = None
-                for connected_node, edge in self._graphDict.get(current_node, []):
-                    if connected_node.node_name == target_node_name:
-                        next_node = connected_node
-                        log_entry["transition"] = (
-                            edge.edge_name,
-                            connected_node.node_name,
-                        )
-                        break
-                if not next_node:
-                    raise GraphException(
-                        f"🔴 Direct traversal failed: Node {target_node_name} not found 🔴"
-                    )
-            else:
-                for connected_node, edge in self._graphDict.get(current_node, []):
-                    if edge.condition:
-                        if streaming:
-                            print(f"Executing edge condition on {edge.edge_name}")
-                        edge_result = (
-                            edge.condition(**edge.parameters)
-                            if edge.parameters
-                            else edge.condition()
-                        )
-
-                        if streaming:
-                            print(
-                                f"Edge {edge.edge_name} condition returned {edge_result}"
-                            )
-
-                        if not isinstance(edge_result, bool):
-                            raise GraphException("Edge condition must return a Bool")
-
-                        if edge_result:
-                            next_node = connected_node
-                            log_entry["transition"] = (
-                                edge.edge_name,
-                                connected_node.node_name,
-                            )
-                            break
-                    else:
-                        next_node = connected_node
-                        log_entry["transition"] = (
-                            edge.edge_name,
-                            connected_node.node_name,
-                        )
-                        break
-
+            next_node, edge = self._select_transition(
+                current_node, direct_traversal, step_number, info
+            )
+            if next_node is not None:
+                log_entry["transition"] = (edge.edge_name, next_node.node_name)
             self._GraphState.update_state(**log_entry)
-            if streaming:
-                if next_node:
-                    print(
-                        f"Traversing to Node: {next_node.node_name} through Edge: {edge.edge_name}"
-                    )
 
-            if not next_node:
+            if next_node is None:
                 raise GraphException(
                     f"No valid transition from node: {current_node.node_name}"
                 )
 
+            if info:
+                log_event(
+                    _logger,
+                    logging.INFO,
+                    "edge.traverse",
+                    "Traversing to Node: %s through Edge: %s",
+                    next_node.node_name,
+                    edge.edge_name,
+                    node=current_node.node_name,
+                    edge=edge.edge_name,
+                    target=next_node.node_name,
+                    step=step_number,
+                )
+
             current_node = next_node
             step_number += 1
 
-        if streaming:
-            print(self._GraphState.history)
-            print("Finished Graph Run")
+        self._log_finished(current_node, step_number - 1)
+        return current_node
+
+    @staticmethod
+    def _run_subgraph(
+        node: Node,
+        additional_log_entries: Dict,
+        executor: Optional["NodeExecutor"],
+        info: bool,
+    ) -> str:
+        """
+        Runs a SUBGRAPH node's subgraph as a nested graph, logging its steps
+        in its own GraphState. Returns the name of the TERMINAL node reached.
+        """
+        if node.subgraph is None:
+            raise GraphException(f"SUBGRAPH node {node.node_name} has no subgraph")
+        if info:
+            log_event(
+                _logger,
+                logging.INFO,
+                "subgraph.enter",
+                "Running subgraph of node %s",
+                node.node_name,
+                node=node.node_name,
+            )
+        subgraph = node.subgraph
+        last_node = subgraph._traverse(
+            subgraph.start_node(), additional_log_entries, executor
+        )
+        return last_node.node_name
+
+    @staticmethod
+    def _apply_request(execution_result: Any, additional_log_entries: Dict):
+        """
+        Runs the callbacks of a GraphRequest result and merges its log
+        entries. Returns the requested direct traversal, if any.
+        """
+        if not isinstance(execution_result, GraphRequest):
+            return None
+        if execution_result.commands:
+            for command in execution_result.commands:
+                command(**execution_result.parameters)
+        if execution_result.update_additional_log_entries:
+            additional_log_entries.update(
+                execution_result.update_additional_log_entries
+            )
+        return execution_result.traversal
+
+    def _select_transition(
+        self,
+        current_node: Node,
+        direct_traversal: Optional[str],
+        step_number: int,
+        info: bool,
+    ) -> Tuple[Optional[Node], Optional[Edge]]:
+        """
+        Picks the outgoing edge to follow: the requested direct traversal, or
+        else the first edge without a condition or whose condition holds.
+        """
+        if direct_traversal:
+            if info:
+                log_event(
+                    _logger,
+                    logging.INFO,
+                    "edge.direct",
+                    "Direct traversal to node: %s",
+                    direct_traversal,
+                    node=current_node.node_name,
+                    target=direct_traversal,
+                    step=step_number,
+                )
+            target_name = direct_traversal
+            if self._scopes:
+                # Nodes inlined by compile use the node names of their subgraph
+                target_name = self._aliases.get(
+                    (self._scopes.get(current_node.node_name), direct_traversal),
+                    direct_traversal,
+                )
+            for connected_node, edge in self._graphDict.get(current_node, []):
+                if connected_node.node_name == target_name:
+                    return connected_node, edge
+            raise GraphException(
+                f"🔴 Direct traversal failed: Node {direct_traversal} not found 🔴"
+            )
+
+        for connected_node, edge in self._graphDict.get(current_node, []):
+            if not edge.condition:
+                return connected_node, edge
+            edge_result = (
+                edge.condition(**edge.parameters)
+                if edge.parameters
+                else edge.condition()
+            )
+            if info:
+                log_event(
+                    _logger,
+                    logging.INFO,
+                    "edge.condition",
+                    "Edge %s condition returned %s",
+                    edge.edge_name,
+                    edge_result,
+                    edge=edge.edge_name,
+                    result=edge_result,
+                    step=step_number,
+                )
+            if not isinstance(edge_result, bool):
+                raise GraphException("Edge condition must return a Bool")
+            if edge_result:
+                return connected_node, edge
+        return None, None
+
+    def _log_finished(self, last_node: Node, steps: int) -> None:
+        if _logger.isEnabledFor(logging.DEBUG):
+            # The history keeps changing after the run: log a snapshot
+            log_event(
+                _logger,
+                logging.DEBUG,
+                "graph.history",
+                "State history: %s",
+                str(self._GraphState.history),
+            )
+        log_event(
+            _logger,
+            logging.INFO,
+            "graph.end",
+            "Finished Graph Run after %d steps",
+            steps,
+            node=last_node.node_name,
+            steps=steps,
+        )
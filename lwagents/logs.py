@@ -1,5 +1,279 @@
-from .messages import *
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Iterable, Iterator, List, Optional
 
+ROOT_LOGGER_NAME = "lwagents"
 
-class AgentLogEntry:
-    content: List[List[LLMAgentRequest, LLMAgentResponse]]
+# Libraries leave output to the application: without configuration, records
+# below WARNING are dropped and nothing is formatted
+logging.getLogger(ROOT_LOGGER_NAME).addHandler(logging.NullHandler())
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Returns a logger below the "lwagents" logger, e.g. get_logger("graph")
+    for "lwagents.graph".
+    """
+    if name == ROOT_LOGGER_NAME or name.startswith(ROOT_LOGGER_NAME + "."):
+        return logging.getLogger(name)
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
+
+
+def log_event(
+    logger: logging.Logger,
+    level: int,
+    event: str,
+    msg: str,
+    *args: Any,
+    **fields: Any,
+) -> None:
+    """
+    Logs a structured record.
+
+    The record carries the event name as ``record.event`` and the keyword
+    fields as ``record.fields``. msg is %-formatted with args only when a
+    handler formats the record, so disabled levels cost a level check. On hot
+    paths, check ``logger.isEnabledFor(level)`` before building the fields.
+
+    Args:
+        logger (logging.Logger): Logger to log to.
+        level (int): Logging level, e.g. logging.INFO.
+        event (str): Event name, e.g. "node.enter".
+        msg (str): Message, with %-style placeholders for args.
+        **fields: Structured fields of the event.
+    """
+    if logger.isEnabledFor(level):
+        logger.log(
+            level,
+            msg,
+            *args,
+            extra={"event": event, "fields": fields},
+            stacklevel=2,
+        )
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line, with the time, level,
+    logger, event, message and the event's fields.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, "event", None),
+            "message": record.getMessage(),
+            **getattr(record, "fields", {}),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=repr)
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """
+    Puts records on the queue without formatting them and without blocking.
+    Records arriving while the queue is full are dropped and counted.
+    """
+
+    def __init__(self, record_queue: queue.Queue):
+        super().__init__(record_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener runs in this process, so the record is formatted there
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _QueueListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Wait for room instead of failing when the queue is full
+        self.queue.put(self._sentinel)
+
+
+class AsyncLogging:
+    """
+    Handle of an active enable_async_logging setup.
+
+    Attributes:
+        handler (QueueHandler): Handler installed on the logger.
+        listener (QueueListener): Thread writing records to the real handlers.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        handler: _NonBlockingQueueHandler,
+        listener: QueueListener,
+        replaced: List[logging.Handler],
+    ):
+        self.logger = logger
+        self.handler = handler
+        self.listener = listener
+        self._replaced = replaced
+
+    @property
+    def dropped(self) -> int:
+        """Number of records dropped because the queue was full."""
+        return self.handler.dropped
+
+    def stop(self) -> None:
+        """
+        Writes the queued records and restores the logger's handlers.
+        """
+        self.listener.stop()
+        self.logger.removeHandler(self.handler)
+        for handler in self._replaced:
+            self.logger.addHandler(handler)
+
+
+_async_logging: Optional[AsyncLogging] = None
+_async_lock = threading.Lock()
+
+
+def enable_async_logging(
+    handlers: Optional[Iterable[logging.Handler]] = None,
+    logger_name: str = ROOT_LOGGER_NAME,
+    max_queue_size: int = 10000,
+) -> AsyncLogging:
+    """
+    Moves log I/O of the logger to a background thread.
+
+    The logger's handlers (or the given handlers) are replaced by a queue
+    handler; a listener thread formats and writes the records. Logging calls
+    then only enqueue the record and never wait for I/O. If the queue is full,
+    records are dropped rather than blocking (see AsyncLogging.dropped).
+
+    Records are formatted on the listener thread, so log immutable values or
+    snapshots rather than objects that change after the call.
+
+    Args:
+        handlers (Iterable[logging.Handler], optional): Handlers to write to.
+            Defaults to the handlers currently attached to the logger.
+        logger_name (str): Logger to make asynchronous.
+        max_queue_size (int): Records buffered before new ones are dropped.
+
+    Returns:
+        AsyncLogging: Handle to stop asynchronous logging, see disable_async_logging.
+    """
+    global _async_logging
+    with _async_lock:
+        if _async_logging is not None:
+            _async_logging.stop()
+        logger = logging.getLogger(logger_name)
+        replaced = [
+            handler
+            for handler in logger.handlers
+            if not isinstance(handler, logging.NullHandler)
+        ]
+        handlers = list(handlers) if handlers is not None else replaced
+        for handler in replaced:
+            logger.removeHandler(handler)
+
+        record_queue = queue.Queue(max_queue_size)
+        queue_handler = _NonBlockingQueueHandler(record_queue)
+        listener = _QueueListener(record_queue, *handlers, respect_handler_level=True)
+        logger.addHandler(queue_handler)
+        listener.start()
+        _async_logging = AsyncLogging(logger, queue_handler, listener, replaced)
+        return _async_logging
+
+
+@atexit.register
+def disable_async_logging() -> None:
+    """
+    Stops asynchronous logging, writing all queued records first.
+    """
+    global _async_logging
+    with _async_lock:
+        if _async_logging is not None:
+            _async_logging.stop()
+            _async_logging = None
+
+
+def configure_logging(
+    level: int | str = logging.INFO,
+    handler: Optional[logging.Handler] = None,
+    structured: bool = False,
+    asynchronous: bool = False,
+) -> Optional[AsyncLogging]:
+    """
+    Sends lwagents records to a handler, like logging.basicConfig for the
+    "lwagents" logger only.
+
+    Args:
+        level (int | str): Minimum level of the records.
+        handler (logging.Handler, optional): Defaults to a stderr stream handler.
+        structured (bool): Format records as JSON lines (StructuredFormatter).
+        asynchronous (bool): Write records from a background thread
+            (see enable_async_logging).
+
+    Returns:
+        AsyncLogging: The asynchronous logging handle, if asynchronous is set.
+    """
+    logger = logging.getLogger(ROOT_LOGGER_NAME)
+    logger.setLevel(level)
+    if handler is None:
+        handler = logging.StreamHandler()
+        if structured:
+            handler.setFormatter(StructuredFormatter())
+        else:
+            handler.setFormatter(
+                logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+            )
+    elif structured:
+        handler.setFormatter(StructuredFormatter())
+    logger.addHandler(handler)
+    if asynchronous:
+        return enable_async_logging()
+    return None
+
+
+_stream_lock = threading.Lock()
+_stream_users = 0
+_stream_handler: Optional[logging.Handler] = None
+_stream_previous_level = logging.NOTSET
+
+
+@contextmanager
+def stream_logs(level: int = logging.INFO) -> Iterator[None]:
+    """
+    Prints lwagents records of at least level to stdout while active, e.g.
+    for Graph.run(streaming=True). Nested and concurrent uses share one
+    handler, set up with the level of the first use.
+    """
+    global _stream_users, _stream_handler, _stream_previous_level
+    logger = logging.getLogger(ROOT_LOGGER_NAME)
+    with _stream_lock:
+        if _stream_users == 0:
+            _stream_handler = logging.StreamHandler(sys.stdout)
+            _stream_handler.setFormatter(logging.Formatter("%(message)s"))
+            _stream_handler.setLevel(level)
+            logger.addHandler(_stream_handler)
+            _stream_previous_level = logger.level
+            if not logger.isEnabledFor(level):
+                logger.setLevel(level)
+        _stream_users += 1
+    try:
+        yield
+    finally:
+        with _stream_lock:
+            _stream_users -= 1
+            if _stream_users == 0:
+                logger.removeHandler(_stream_handler)
+                logger.setLevel(_stream_previous_level)
+                _stream_handler = None
@@ -1,8 +1,6 @@
 from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel
-from anthropic import types as anthropic_types
-from openai import types as openai_types
 
 
 class LLMAgentResponse(BaseModel):
@@ -11,8 +9,21 @@ class LLMAgentResponse(BaseModel):
     tools_used: Optional[List[str]] = None  # Optional: Tool used during execution
 
 
+class Usage(BaseModel):
+    """
+    Token usage reported by the provider. ``input_tokens`` includes cached
+    input; ``cached_tokens`` is the part served from the provider's prompt cache.
+    """
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    cache_creation_tokens: int = 0
+
+
 class GPTResponse(BaseModel):
     response_message: str
+    usage: Optional[Usage] = None
 
     @property
     def content(self):
@@ -22,10 +33,13 @@ class GPTResponse(BaseModel):
 class GPTToolResponse(BaseModel):
     tool_response: Any
     content: str
+    usage: Optional[Usage] = None
 
 
 class AnthropicResponse(BaseModel):
-    response_message: anthropic_types.Message
+    # anthropic.types.Message, untyped so the SDK is not needed at import time
+    response_message: Any
+    usage: Optional[Usage] = None
 
     @property
     def content(self):
@@ -35,6 +49,7 @@ class AnthropicResponse(BaseModel):
 class AnthropicToolResponse(BaseModel):
     tool_response: Any
     content: str
+    usage: Optional[Usage] = None
 
 
 class LLMResponse(BaseModel):
@@ -50,6 +65,10 @@ class LLMResponse(BaseModel):
         else:
             return None
 
+    @property
+    def usage(self) -> Optional[Usage]:
+        return self.response.usage
+
 
 class LLMToolResponse(BaseModel):
     results: GPTToolResponse | AnthropicToolResponse
@@ -62,3 +81,7 @@ class LLMToolResponse(BaseModel):
             return self.results.content
         else:
             return None
+
+    @property
+    def usage(self) -> Optional[Usage]:
+        return self.results.usage
@@ -1,14 +1,22 @@
+import functools
+import logging
 import os
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Protocol
+from typing import Any, Callable, Dict, List, Protocol
 
-import openai
-from dotenv import load_dotenv
-from openai import OpenAI
-import anthropic
 from pydantic import BaseModel
 from typing_extensions import Self, override
 import json
+import hashlib
+from .ratelimit import (
+    get_rate_limiter,
+    is_rate_limit_error,
+    retry_after_from_error,
+    usage_tokens,
+)
+from .logs import get_logger, log_event
+from .tokens import ContextBudget, estimate_request_tokens
 from .tools import ToolUtility
 
 from .messages import (
@@ -19,8 +27,14 @@ from .messages import (
     GPTToolResponse,
     LLMResponse,
     LLMToolResponse,
+    Usage,
 )
 
+_logger = get_logger("models")
+
+_EPHEMERAL_CACHE = {"type": "ephemeral"}
+DEEPSEEK_BASE_URL = "https://api.deepseek.ai/v1"
+
 
 class CustomModelError(Exception):
     pass
@@ -56,9 +70,80 @@ class BaseLLMModel(LLMModel):
     among various LLM model implementations.
     """
 
+    provider: str = "custom"
+    context_budget: ContextBudget | None = None
+
     def __init__(self, model: ModelLoader):
         self._model = model
 
+    def _send(self, create: Callable, **request):
+        """
+        Sends a request through the provider client. The request is first
+        fitted to the context window if a context budget is set (see
+        lwagents.tokens), then sent honouring the rate limiter registered for
+        this provider and model (see lwagents.ratelimit).
+        """
+        if self.context_budget is not None:
+            request = self.context_budget.fit(request)
+
+        debug = _logger.isEnabledFor(logging.DEBUG)
+        started = time.perf_counter() if debug else 0.0
+        limiter = get_rate_limiter(self.provider, request.get("model"))
+        if limiter is None:
+            response = create(**request)
+            if debug:
+                self._log_response(request, response, started)
+            return response
+
+        estimated_tokens = estimate_request_tokens(request)
+        attempt = 0
+        while True:
+            limiter.acquire(tokens=estimated_tokens)
+            try:
+                response = create(**request)
+            except Exception as error:
+                if not is_rate_limit_error(error) or attempt >= limiter.max_retries:
+                    raise
+                retry_after = retry_after_from_error(error)
+                log_event(
+                    _logger,
+                    logging.WARNING,
+                    "model.rate_limited",
+                    "%s model %s rate limited, retry %d of %d",
+                    self.provider,
+                    request.get("model"),
+                    attempt + 1,
+                    limiter.max_retries,
+                    provider=self.provider,
+                    model=request.get("model"),
+                    retry_after=retry_after,
+                )
+                limiter.record_rate_limited(retry_after)
+                attempt += 1
+                continue
+            limiter.record_success(
+                used_tokens=usage_tokens(response), estimated_tokens=estimated_tokens
+            )
+            if debug:
+                self._log_response(request, response, started)
+            return response
+
+    def _log_response(self, request: Dict[str, Any], response: Any, started: float):
+        latency = time.perf_counter() - started
+        log_event(
+            _logger,
+            logging.DEBUG,
+            "model.response",
+            "%s model %s answered in %.3f s",
+            self.provider,
+            request.get("model"),
+            latency,
+            provider=self.provider,
+            model=request.get("model"),
+            latency=latency,
+            tokens=usage_tokens(response),
+        )
+
     @abstractmethod
     def generate(self) -> str:
         """
@@ -77,13 +162,21 @@ class ModelLoader:
     @staticmethod
     def load_model(
         model_type: str, instance_params: dict, custom_implementation: Any
-    ) -> OpenAI:
-
+    ) -> Any:
+        # Provider SDKs are imported on first use, so importing lwagents
+        # does not load SDKs the process never uses
         if model_type == "openai":
+            from openai import OpenAI
+
             return OpenAI(**instance_params)
         elif model_type == "deepseek":
-            return OpenAI(**instance_params, base_url="https://api.deepseek.ai/v1")
+            from openai import OpenAI
+
+            # A base_url in instance_params (e.g. a proxy or stub server) wins
+            return OpenAI(**{"base_url": DEEPSEEK_BASE_URL, **instance_params})
         elif model_type == "anthropic":
+            import anthropic
+
             return anthropic.Anthropic(**instance_params)
         elif model_type == "custom":
             return custom_implementation(**instance_params)
@@ -94,7 +187,51 @@ class ModelLoader:
 # ----------------------------------
 
 
+@functools.lru_cache(maxsize=256)
+def _prompt_cache_key(model: Any, instructions: Any, tool_names: tuple) -> str:
+    prefix = json.dumps([model, instructions, list(tool_names)], default=str)
+    return "lwagents-" + hashlib.sha256(prefix.encode()).hexdigest()[:32]
+
+
 class GPTModel(BaseLLMModel):
+    provider = "openai"
+    prompt_caching = True
+
+    def _with_prompt_cache_key(
+        self, model_params: Dict[str, Any], tools: List[Dict] | None = None
+    ) -> Dict[str, Any]:
+        """
+        Adds a prompt_cache_key derived from the stable request prefix (model,
+        instructions and tool names) so that requests sharing that prefix are
+        routed to the same provider cache. OpenAI caches prompt prefixes
+        automatically; tools and instructions are sent ahead of the input.
+        """
+        if not self.prompt_caching or "prompt_cache_key" in model_params:
+            return model_params
+        prefix = (
+            model_params.get("model"),
+            model_params.get("instructions"),
+            tuple(tool["name"] for tool in tools or ()),
+        )
+        try:
+            cache_key = _prompt_cache_key(*prefix)
+        except TypeError:
+            # Unhashable instructions, e.g. a list of content parts
+            cache_key = _prompt_cache_key.__wrapped__(*prefix)
+        return {**model_params, "prompt_cache_key": cache_key}
+
+    @staticmethod
+    def _usage(completion: Any) -> Usage | None:
+        usage = getattr(completion, "usage", None)
+        if usage is None:
+            return None
+        details = getattr(usage, "input_tokens_details", None)
+        return Usage(
+            input_tokens=usage.input_tokens or 0,
+            output_tokens=usage.output_tokens or 0,
+            cached_tokens=getattr(details, "cached_tokens", None) or 0,
+        )
+
     @override
     def generate(
         self,
@@ -119,7 +256,8 @@ class GPTModel(BaseLLMModel):
             )
 
         if model_params.get("structure"):
-            completion = self._model.responses.parse(
+            completion = self._send(
+                self._model.responses.parse,
                 model=model_params.get("model"),
                 messages=model_params.get("prompt"),
                 text_format=model_params.get("structure"),
@@ -130,32 +268,87 @@ class GPTModel(BaseLLMModel):
             )
         if tools:
             openai_tools = ToolUtility.get_tools_info_gpt(tools)
-            completion = self._model.responses.create(
+            completion = self._send(
+                self._model.responses.create,
                 tools=openai_tools,
-                **model_params,
+                **self._with_prompt_cache_key(model_params, openai_tools),
             )
             # Return the full completion object for tool execution
             return LLMToolResponse(
                 results=GPTToolResponse(
-                    tool_response=completion, content=completion.output_text
+                    tool_response=completion,
+                    content=completion.output_text,
+                    usage=self._usage(completion),
                 )
             )
 
         else:
-            completion = self._model.responses.create(
-                **model_params,
+            completion = self._send(
+                self._model.responses.create,
+                **self._with_prompt_cache_key(model_params),
             )
 
             return LLMResponse(
-                response=GPTResponse(response_message=completion.output_text)
+                response=GPTResponse(
+                    response_message=completion.output_text,
+                    usage=self._usage(completion),
+                )
             )
 
 
 class DeepSeekModel(GPTModel):
-    pass
+    provider = "deepseek"
+    prompt_caching = False
 
 
 class AnthropicModel(BaseLLMModel):
+    provider = "anthropic"
+    prompt_caching = True
+
+    @staticmethod
+    def _has_cache_control(blocks: List[Dict]) -> bool:
+        return any(isinstance(b, dict) and "cache_control" in b for b in blocks)
+
+    def _with_cache_breakpoints(
+        self, model_params: Dict[str, Any], tools: List[Dict] | None = None
+    ):
+        """
+        Places cache-control breakpoints at the end of the tool list and of
+        the system prompt, the stable prefix of every request. Breakpoints
+        the caller already set are left alone. Returns the tools and
+        model_params to send; the inputs are not mutated.
+        """
+        if not self.prompt_caching:
+            return tools, model_params
+        if tools and not self._has_cache_control(tools):
+            tools = [*tools[:-1], {**tools[-1], "cache_control": _EPHEMERAL_CACHE}]
+        system = model_params.get("system")
+        if isinstance(system, str) and system:
+            system = [
+                {"type": "text", "text": system, "cache_control": _EPHEMERAL_CACHE}
+            ]
+            model_params = {**model_params, "system": system}
+        elif (
+            isinstance(system, list) and system and not self._has_cache_control(system)
+        ):
+            system = [*system[:-1], {**system[-1], "cache_control": _EPHEMERAL_CACHE}]
+            model_params = {**model_params, "system": system}
+        return tools, model_params
+
+    @staticmethod
+    def _usage(message: Any) -> Usage | None:
+        usage = getattr(message, "usage", None)
+        if usage is None:
+            return None
+        cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+        cache_creation = getattr(usage, "cache_creation_input_tokens", None) or 0
+        return Usage(
+            input_tokens=(usage.input_tokens or 0) + cache_read + cache_creation,
+            output_tokens=usage.output_tokens or 0,
+            cached_tokens=cache_read,
+            cache_creation_tokens=cache_creation,
+        )
+
     @override
     def generate(
         self,
@@ -167,20 +360,35 @@ class AnthropicModel(BaseLLMModel):
             raise Warning("Structured output is currently incompatible with Anthropic!")
 
         if tools:
-            anthropic_tools = ToolUtility.get_tools_info_anthropic(tools=tools)
-            message = self._model.messages.create(
+            anthropic_tools, model_params = self._with_cache_breakpoints(
+                model_params, ToolUtility.get_tools_info_anthropic(tools=tools)
+            )
+            message = self._send(
+                self._model.messages.create,
                 tools=anthropic_tools,
                 **model_params,
             )
             return LLMToolResponse(
-                results=AnthropicToolResponse(tool_response=message, content="")
+                results=AnthropicToolResponse(
+                    tool_response=message,
+                    content="".join(
+                        block.text for block in message.content if block.type == "text"
+                    ),
+                    usage=self._usage(message),
+                )
             )
         else:
-            message = self._model.messages.create(
+            _, model_params = self._with_cache_breakpoints(model_params)
+            message = self._send(
+                self._model.messages.create,
                 **model_params,
             )
 
-            return LLMResponse(response=AnthropicResponse(response_message=message))
+            return LLMResponse(
+                response=AnthropicResponse(
+                    response_message=message, usage=self._usage(message)
+                )
+            )
 
 
 # -------------------------------------------------
@@ -189,9 +397,26 @@ class AnthropicModel(BaseLLMModel):
 
 
 def create_model(model_type: str, *args, **kwargs) -> LLMModel:
-
-    custom_model = kwargs.get("custom_model")
-    custom_implementation = kwargs.get("custom_implementation")
+    """
+    Creates a model for the given provider.
+
+    Args:
+        model_type (str): "openai", "deepseek", "anthropic" or "custom".
+        instance_params (dict): Parameters for the provider client.
+        custom_model (type, optional): BaseLLMModel subclass for the custom model type.
+        custom_implementation (Any, optional): Client factory for the custom model type.
+        hedging (HedgingPolicy, optional): Wraps the model in a HedgedModel.
+        hedging_fallback (BaseLLMModel, optional): Model used for hedged requests.
+        prompt_caching (bool, optional): Toggles automatic provider prompt caching.
+        context_budget (ContextBudget, optional): Checks and trims requests to
+            the context window.
+    """
+    custom_model = kwargs.pop("custom_model", None)
+    custom_implementation = kwargs.pop("custom_implementation", None)
+    hedging = kwargs.pop("hedging", None)
+    hedging_fallback = kwargs.pop("hedging_fallback", None)
+    prompt_caching = kwargs.pop("prompt_caching", None)
+    context_budget = kwargs.pop("context_budget", None)
     loader = ModelLoader.load_model(
         model_type=model_type,
         custom_implementation=custom_implementation,
@@ -200,14 +425,26 @@ def create_model(model_type: str, *args, **kwargs) -> LLMModel:
     )
 
     if model_type == "openai":
-        return GPTModel(loader)
+        model = GPTModel(loader)
     elif model_type == "deepseek":
-        return DeepSeekModel(loader)
+        model = DeepSeekModel(loader)
     elif model_type == "anthropic":
-        return AnthropicModel(loader)
+        model = AnthropicModel(loader)
     elif model_type == "custom":
         if custom_model is None or not custom_implementation:
             raise CustomModelError(
                 "custom_model and custom_implementation must be provided for custom model type"
             )
-        return custom_model(loader)
+        model = custom_model(loader)
+    else:
+        raise ValueError(f"Unsupported model type: {model_type}")
+    if prompt_caching is not None:
+        model.prompt_caching = prompt_caching
+    if context_budget is not None:
+        model.context_budget = context_budget
+
+    if hedging is not None or hedging_fallback is not None:
+        from .composite import HedgedModel
+
+        model = HedgedModel(model, policy=hedging, fallback=hedging_fallback)
+    return model
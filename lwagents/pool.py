@@ -0,0 +1,203 @@
+import contextvars
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .agent import Agent
+from .messages import LLMAgentResponse
+
+
+class _PendingAction:
+    __slots__ = (
+        "agent",
+        "state_entry",
+        "model_params",
+        "future",
+        "context",
+        "sequence",
+        "computed",
+        "error",
+    )
+
+    def __init__(self, agent: Agent, state_entry: dict, model_params: dict):
+        self.agent = agent
+        self.state_entry = state_entry
+        self.model_params = model_params
+        self.future = Future()
+        # Runs in the submitter's context, e.g. its request priority
+        self.context = contextvars.copy_context()
+        self.sequence = None
+        self.computed = None
+        self.error = None
+
+
+class AgentPool:
+    """
+    Runs the actions of many agents concurrently.
+
+    Model calls and tool execution of different agents overlap, up to
+    max_concurrency at a time. Each agent's actions run one after another in
+    submission order, and all actions are recorded in the agents' states and
+    the global agent state in submission order, no matter which finishes first.
+
+    Agents providing compute_action/commit_action (like LLMAgent) are
+    computed concurrently and committed in order; other agents run their
+    action as a whole and are only ordered per agent.
+
+    Args:
+        max_concurrency (int): Maximum number of actions running at once.
+
+    Example:
+        with AgentPool(max_concurrency=4) as pool:
+            answers = pool.run(
+                [
+                    (researcher, {"model_params": params_a}),
+                    (critic, {"model_params": params_b}),
+                ]
+            )
+    """
+
+    def __init__(self, max_concurrency: int = 8):
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="lwagents-agent"
+        )
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._outstanding = 0
+        self._sequence = itertools.count()
+        self._next_commit = 0
+        self._completed: Dict[int, _PendingAction] = {}
+        # Set while a thread is committing completed actions
+        self._committing = False
+        # Actions waiting for the previous action of the same agent.
+        # An agent has an entry while one of its actions is in flight.
+        self._queues: Dict[int, deque] = {}
+
+    def submit(
+        self,
+        agent: Agent,
+        state_entry: Optional[dict] = None,
+        model_params: Optional[Dict[str, Any]] = None,
+    ) -> Future:
+        """
+        Schedules an action of the agent.
+
+        Returns:
+            Future: Resolves to the agent response once the action and all
+                actions submitted before it have been recorded.
+        """
+        pending = _PendingAction(agent, state_entry or {}, model_params or {})
+        with self._lock:
+            pending.sequence = next(self._sequence)
+            self._outstanding += 1
+            queue = self._queues.get(id(agent))
+            if queue is not None:
+                queue.append(pending)
+                return pending.future
+            self._queues[id(agent)] = deque()
+        self._start(pending)
+        return pending.future
+
+    def run(self, requests: Iterable[Tuple[Agent, Dict[str, Any]]]) -> List[Any]:
+        """
+        Runs (agent, keyword arguments) pairs concurrently and returns their
+        responses in the same order. The keyword arguments are those of submit.
+        """
+        futures = [self.submit(agent, **kwargs) for agent, kwargs in requests]
+        return [future.result() for future in futures]
+
+    def _start(self, pending: _PendingAction) -> None:
+        self._executor.submit(pending.context.run, self._compute, pending)
+
+    def _compute(self, pending: _PendingAction) -> None:
+        agent = pending.agent
+        try:
+            if hasattr(agent, "compute_action"):
+                pending.computed = agent.compute_action(
+                    model_params=pending.model_params
+                )
+            else:
+                pending.computed = agent.action(
+                    state_entry=pending.state_entry,
+                    model_params=pending.model_params,
+                )
+        except BaseException as error:
+            pending.error = error
+        self._commit_ready(pending)
+
+    def _commit(self, pending: _PendingAction) -> Optional[LLMAgentResponse]:
+        if pending.error is not None or not hasattr(pending.agent, "commit_action"):
+            return pending.computed
+        return pending.agent.commit_action(*pending.computed, pending.state_entry)
+
+    def _commit_ready(self, pending: _PendingAction) -> None:
+        with self._lock:
+            self._completed[pending.sequence] = pending
+        while True:
+            with self._lock:
+                # One thread commits at a time; it also picks up this action
+                if self._committing:
+                    return
+                # Every action whose predecessors have all been committed
+                batch = []
+                while self._next_commit in self._completed:
+                    batch.append(self._completed.pop(self._next_commit))
+                    self._next_commit += 1
+                if not batch:
+                    return
+                self._committing = True
+            # Commit outside the lock, commit_action may use the pool
+            try:
+                finished = [self._commit_in_order(ready) for ready in batch]
+            finally:
+                with self._lock:
+                    self._committing = False
+            # Resolve futures after giving up the commit turn, their
+            # callbacks may submit again and wait for the result
+            for ready, following in finished:
+                if following is not None:
+                    self._start(following)
+                if ready.error is not None:
+                    ready.future.set_exception(ready.error)
+                else:
+                    ready.future.set_result(ready.computed)
+
+    def _commit_in_order(
+        self, ready: _PendingAction
+    ) -> Tuple[_PendingAction, Optional[_PendingAction]]:
+        """
+        Commits an action and returns it with the next queued action of its
+        agent, if any.
+        """
+        if ready.error is None:
+            try:
+                ready.computed = self._commit(ready)
+            except BaseException as error:
+                ready.error = error
+        with self._lock:
+            queue = self._queues[id(ready.agent)]
+            following = queue.popleft() if queue else None
+            if following is None:
+                del self._queues[id(ready.agent)]
+            self._outstanding -= 1
+            if not self._outstanding:
+                self._idle.notify_all()
+        return ready, following
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stops the pool. With wait, all submitted actions are finished first.
+        """
+        if wait:
+            with self._idle:
+                self._idle.wait_for(lambda: not self._outstanding)
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> "AgentPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.shutdown()
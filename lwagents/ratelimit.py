@@ -0,0 +1,258 @@
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, Dict, Optional, Tuple
+
+
+class Priority(IntEnum):
+    """Scheduling priority of a model request. Lower values are served first."""
+
+    INTERACTIVE = 0
+    BATCH = 10
+
+
+_current_priority = contextvars.ContextVar(
+    "lwagents_request_priority", default=Priority.INTERACTIVE
+)
+
+
+@contextmanager
+def request_priority(priority: int):
+    """
+    Runs the enclosed model calls with the given scheduling priority.
+
+    Example:
+        with request_priority(Priority.BATCH):
+            graph.run(start_node=start)
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class TokenBucket:
+    """
+    A token bucket refilled continuously at ``rate_per_minute``.
+
+    Args:
+        rate_per_minute (float): Sustained refill rate.
+        capacity (float, optional): Maximum burst size. Defaults to one minute
+            of tokens.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_minute = rate_per_minute
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def refill(self, now: float, rate_fraction: float = 1.0) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        rate = self.rate_per_minute * rate_fraction / 60.0
+        self.tokens = min(self.capacity, self.tokens + elapsed * rate)
+
+    def time_until(self, amount: float, rate_fraction: float = 1.0) -> float:
+        # Requests larger than the bucket go through once it is full.
+        amount = min(amount, self.capacity)
+        missing = amount - self.tokens
+        if missing <= 0:
+            return 0.0
+        return missing / (self.rate_per_minute * rate_fraction / 60.0)
+
+    def consume(self, amount: float) -> None:
+        self.tokens -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """
+    Request scheduler for a single (provider, model) pair.
+
+    Combines a requests-per-minute and a tokens-per-minute bucket. Callers are
+    served strictly by (priority, arrival order), so interactive requests
+    overtake queued batch requests. The effective rate is adapted with
+    multiplicative decrease on 429 responses and additive recovery on success.
+
+    Args:
+        requests_per_minute (float, optional): Request budget per minute.
+        tokens_per_minute (float, optional): Token budget per minute.
+        max_retries (int): How many times a rate limited call is retried.
+        backoff_factor (float): Rate multiplier applied on every 429.
+        recovery_step (float): Rate fraction regained after every success.
+        min_rate_fraction (float): Lower bound for the adapted rate.
+        default_retry_after (float): Pause in seconds when a 429 carries no retry-after.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        recovery_step: float = 0.05,
+        min_rate_fraction: float = 0.1,
+        default_retry_after: float = 1.0,
+    ):
+        self._requests = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.recovery_step = recovery_step
+        self.min_rate_fraction = min_rate_fraction
+        self.default_retry_after = default_retry_after
+        self.rate_fraction = 1.0
+        self._blocked_until = 0.0
+        self._condition = threading.Condition()
+        self._waiters = []
+        self._sequence = itertools.count()
+
+    def _refill(self, now: float) -> None:
+        for bucket in (self._requests, self._tokens):
+            if bucket:
+                bucket.refill(now, self.rate_fraction)
+
+    def _wait_time(self, tokens: float, now: float) -> float:
+        wait = self._blocked_until - now
+        if self._requests:
+            wait = max(wait, self._requests.time_until(1, self.rate_fraction))
+        if self._tokens and tokens:
+            wait = max(wait, self._tokens.time_until(tokens, self.rate_fraction))
+        return wait
+
+    def acquire(self, tokens: float = 0, priority: Optional[int] = None) -> None:
+        """
+        Blocks until the request may be sent.
+
+        Args:
+            tokens (float): Estimated tokens the request will consume.
+            priority (int, optional): Defaults to the priority of the current context.
+        """
+        if priority is None:
+            priority = _current_priority.get()
+        ticket = (int(priority), next(self._sequence))
+        with self._condition:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    timeout = None
+                    if self._waiters[0] == ticket:
+                        timeout = self._wait_time(tokens, now)
+                        if timeout <= 0:
+                            if self._requests:
+                                self._requests.consume(1)
+                            if self._tokens:
+                                self._tokens.consume(tokens)
+                            return
+                    self._condition.wait(timeout=timeout)
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._condition.notify_all()
+
+    def record_success(
+        self, used_tokens: Optional[float] = None, estimated_tokens: float = 0
+    ) -> None:
+        """
+        Recovers part of the rate after a successful call and reconciles the
+        token bucket with the usage reported by the provider.
+        """
+        with self._condition:
+            self.rate_fraction = min(1.0, self.rate_fraction + self.recovery_step)
+            if self._tokens and used_tokens is not None:
+                self._tokens.tokens -= used_tokens - estimated_tokens
+            self._condition.notify_all()
+
+    def record_rate_limited(self, retry_after: Optional[float] = None) -> None:
+        """
+        Slows the limiter down after the provider answered with a 429.
+        """
+        with self._condition:
+            now = time.monotonic()
+            self.rate_fraction = max(
+                self.min_rate_fraction, self.rate_fraction * self.backoff_factor
+            )
+            pause = retry_after if retry_after is not None else self.default_retry_after
+            self._blocked_until = max(self._blocked_until, now + pause)
+            self._condition.notify_all()
+
+
+_rate_limiters: Dict[Tuple[str, Optional[str]], RateLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def configure_rate_limit(
+    provider: str, model: Optional[str] = None, **limiter_params
+) -> RateLimiter:
+    """
+    Registers the shared limiter for a provider/model pair.
+
+    Args:
+        provider (str): Provider name, e.g. "openai" or "anthropic".
+        model (str, optional): Model name. If omitted, the limiter applies to
+            every model of the provider that has no limiter of its own.
+        **limiter_params: Passed to RateLimiter.
+
+    Returns:
+        RateLimiter: The registered limiter.
+    """
+    limiter = RateLimiter(**limiter_params)
+    with _registry_lock:
+        _rate_limiters[(provider, model)] = limiter
+    return limiter
+
+
+def get_rate_limiter(provider: str, model: Optional[str] = None):
+    """
+    Returns the limiter registered for the provider/model pair, or None.
+    """
+    return _rate_limiters.get((provider, model)) or _rate_limiters.get((provider, None))
+
+
+def reset_rate_limiters() -> None:
+    """
+    Removes all registered limiters.
+    """
+    with _registry_lock:
+        _rate_limiters.clear()
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    return getattr(error, "status_code", None) == 429
+
+
+def retry_after_from_error(error: Exception) -> Optional[float]:
+    """
+    Reads the retry-after hint from a provider error, in seconds.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms") is not None:
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after") is not None:
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+def usage_tokens(response: Any) -> Optional[int]:
+    """
+    Total tokens reported in a provider response, or None if unavailable.
+    """
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    input_tokens = getattr(usage, "input_tokens", None) or 0
+    output_tokens = getattr(usage, "output_tokens", None) or 0
+    return input_tokens + output_tokens
@@ -0,0 +1,236 @@
+import importlib
+import json
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from lwagents.tools import BaseTool, Tool
+
+
+def import_path(path: str):
+    """
+    Imports an object by dotted path, either "package.module:attribute" or
+    "package.module.attribute".
+
+    Raises:
+        ValueError: If the path has no module or no attribute part.
+        ImportError / AttributeError: If the module or attribute does not exist.
+    """
+    if ":" in path:
+        module_name, _, qualname = path.partition(":")
+    else:
+        module_name, _, qualname = path.rpartition(".")
+    if not module_name or not qualname:
+        raise ValueError(f"Invalid import path: {path}")
+    target = importlib.import_module(module_name)
+    for attribute in qualname.split("."):
+        target = getattr(target, attribute)
+    return target
+
+
+def tool_metadata(tool: BaseTool, path: str) -> Dict[str, Any]:
+    """
+    Returns the metadata a LazyTool needs to describe a tool without importing it.
+
+    Run this at build time and store the result (see ToolRegistry.save).
+
+    Args:
+        tool (BaseTool): A tool created with @Tool.
+        path (str): Dotted import path of the tool or its function.
+    """
+    openai_schema = tool.provider_schema("openai")
+    return {
+        "name": openai_schema["name"],
+        "path": path,
+        "description": openai_schema["description"],
+        "parameters": openai_schema["parameters"],
+    }
+
+
+class LazyTool(BaseTool):
+    """
+    Tool declared by import path and precomputed schema metadata.
+
+    Provider schemas are built from the metadata, so the tool's module is
+    imported, and its argument model built, only on the first call.
+
+    Args:
+        path (str): Dotted import path, e.g. "myapp.tools:search". The target
+            may be a function or a tool created with @Tool.
+        name (str, optional): Tool name. Defaults to the last part of the path.
+        description (str, optional): Tool description. Defaults to the name.
+        parameters (dict, optional): JSON schema of the arguments.
+        **tool_options: Passed to Tool when the target is a plain function.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        parameters: Optional[Dict[str, Any]] = None,
+        **tool_options,
+    ):
+        self.path = path
+        self.name = name or path.replace(":", ".").rpartition(".")[2]
+        self.description = description or self.name
+        self.parameters = parameters or {
+            "type": "object",
+            "properties": {},
+            "required": [],
+        }
+        self.tool_options = tool_options
+        self._tool: Optional[BaseTool] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_resolved(self) -> bool:
+        return self._tool is not None
+
+    def resolve(self) -> BaseTool:
+        """
+        Imports the target and returns it as a tool, on first use only.
+        """
+        if self._tool is None:
+            with self._lock:
+                if self._tool is None:
+                    target = import_path(self.path)
+                    if not isinstance(target, BaseTool):
+                        target = Tool(target, **self.tool_options)
+                    self._tool = target
+        return self._tool
+
+    @property
+    def is_async(self) -> bool:
+        return self.resolve().is_async
+
+    def provider_schema(self, provider: str) -> Dict:
+        if provider == "openai":
+            return {
+                "type": "function",
+                "name": self.name,
+                "description": self.description,
+                "parameters": self.parameters,
+            }
+        if provider == "anthropic":
+            return {
+                "name": self.name,
+                "description": self.description,
+                "input_schema": self.parameters,
+            }
+        raise ValueError(f"Unsupported provider: {provider}")
+
+    def execute(self, *args, **kwargs):
+        return self.resolve().execute(*args, **kwargs)
+
+    def execute_json(self, arguments: str):
+        return self.resolve().execute_json(arguments)
+
+    async def aexecute(self, *args, **kwargs):
+        return await self.resolve().aexecute(*args, **kwargs)
+
+    async def aexecute_json(self, arguments: str):
+        return await self.resolve().aexecute_json(arguments)
+
+
+class ToolRegistry:
+    """
+    Catalogue of lazily imported tools.
+
+    Agents take the tools they need from the registry by name; only the tools
+    that are actually called get imported.
+
+    Example:
+        registry = ToolRegistry.load("tools.json")
+        agent = LLMAgent(name="a", llm_model=model, tools=registry.select(["search"]))
+    """
+
+    def __init__(self, tools: Iterable[LazyTool] = ()):
+        self._tools: Dict[str, LazyTool] = {}
+        for tool in tools:
+            self.add(tool)
+
+    def add(self, tool: LazyTool) -> LazyTool:
+        """
+        Adds a tool to the registry.
+
+        Raises:
+            ValueError: If the tool's options cannot be saved as JSON, e.g.
+                cache=LRUCache(...). Declare such options on the @Tool in
+                code and register its path instead.
+        """
+        try:
+            json.dumps(tool.tool_options)
+        except (TypeError, ValueError) as error:
+            raise ValueError(
+                f"Options of tool {tool.name} cannot be saved in the registry "
+                f"({error}); use JSON values such as cache=True, or create the "
+                "tool with @Tool(...) in code and register its path"
+            ) from None
+        self._tools[tool.name] = tool
+        return tool
+
+    def register(self, path: str, **tool_params) -> LazyTool:
+        """
+        Declares a tool by import path. See LazyTool for the parameters.
+        """
+        return self.add(LazyTool(path, **tool_params))
+
+    def get(self, name: str) -> LazyTool:
+        try:
+            return self._tools[name]
+        except KeyError:
+            raise KeyError(f"Tool {name} is not registered") from None
+
+    def select(self, names: Iterable[str]) -> List[LazyTool]:
+        """
+        Returns the named tools, e.g. to pass to an agent.
+        """
+        return [self.get(name) for name in names]
+
+    def names(self) -> List[str]:
+        return list(self._tools)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tools
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+    def metadata(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": tool.name,
+                "path": tool.path,
+                "description": tool.description,
+                "parameters": tool.parameters,
+                **tool.tool_options,
+            }
+            for tool in self._tools.values()
+        ]
+
+    @classmethod
+    def from_metadata(cls, entries: Iterable[Dict[str, Any]]) -> "ToolRegistry":
+        return cls(LazyTool(**entry) for entry in entries)
+
+    @classmethod
+    def from_tools(cls, paths: Iterable[str]) -> "ToolRegistry":
+        """
+        Builds a registry by importing the given tools once and recording their
+        metadata. Use at build time, then save the registry.
+        """
+        entries = []
+        for path in paths:
+            target = import_path(path)
+            if not isinstance(target, BaseTool):
+                target = Tool(target)
+            entries.append(tool_metadata(target, path))
+        return cls.from_metadata(entries)
+
+    def save(self, file_path: str) -> None:
+        with open(file_path, "w") as file:
+            json.dump(self.metadata(), file, indent=2)
+
+    @classmethod
+    def load(cls, file_path: str) -> "ToolRegistry":
+        with open(file_path) as file:
+            return cls.from_metadata(json.load(file))
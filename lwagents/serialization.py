@@ -0,0 +1,604 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .graph import Edge, Graph, Node, NodeKind
+from .registry import import_path
+from .state import GraphState
+
+FORMAT = "lwagents.graph"
+FORMAT_VERSION = 1
+# Bumped when the compiled form changes, so stale cache entries are not read
+CACHE_VERSION = 2
+
+# Spec of a graph after validation: nodes as (name, kind, command,
+# parameters, subgraph, inline) and edges as (source, target, name,
+# condition, parameters), with callables and objects still encoded as
+# references and subgraphs compiled the same way
+CompiledGraph = Tuple[List[Tuple], List[Tuple]]
+
+
+class GraphSerializationError(Exception):
+    pass
+
+
+# -------------------------------
+# References
+# -------------------------------
+
+
+def _dotted_path(obj: Any) -> Optional[str]:
+    """
+    Returns the "module:qualname" path obj can be imported from, or None.
+    Tools created with @Tool are found through their function.
+    """
+    function = getattr(obj, "_function", obj)
+    module = getattr(function, "__module__", None)
+    qualname = getattr(function, "__qualname__", None)
+    if not module or not qualname or "<" in qualname:
+        return None
+    path = f"{module}:{qualname}"
+    try:
+        if import_path(path) is obj:
+            return path
+    except (ImportError, AttributeError, ValueError):
+        pass
+    return None
+
+
+def _encode_reference(obj: Any, references: Mapping[int, str]) -> Optional[Dict]:
+    name = references.get(id(obj))
+    if name is not None:
+        return {"$param": name}
+    path = _dotted_path(obj)
+    if path is not None:
+        return {"$ref": path}
+    owner = getattr(obj, "__self__", None)
+    method = getattr(obj, "__name__", None)
+    if owner is not None and method is not None:
+        # Bound method, e.g. agent.action
+        reference = _encode_reference(owner, references)
+        if reference is not None:
+            return {**reference, "attr": method}
+    return None
+
+
+def _encode_value(value: Any, references: Mapping[int, str], where: str) -> Any:
+    if id(value) in references:
+        return {"$param": references[id(value)]}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_encode_value(item, references, where) for item in value]
+    if isinstance(value, dict):
+        for key in value:
+            if not isinstance(key, str):
+                raise GraphSerializationError(f"{where}: non-string key {key!r}")
+            if key.startswith("$"):
+                raise GraphSerializationError(
+                    f"{where}: keys starting with '$' are reserved, got {key!r}"
+                )
+        return {
+            key: _encode_value(item, references, f"{where}.{key}")
+            for key, item in value.items()
+        }
+    reference = _encode_reference(value, references)
+    if reference is None:
+        raise GraphSerializationError(
+            f"{where}: {value!r} is neither JSON data nor importable; "
+            "pass it in references to save it as a parameter reference"
+        )
+    return reference
+
+
+def _is_reference(value: Any) -> bool:
+    return isinstance(value, dict) and ("$ref" in value or "$param" in value)
+
+
+def _resolve_reference(reference: Dict, params: Mapping[str, Any], where: str) -> Any:
+    if "$param" in reference:
+        name = reference["$param"]
+        if name not in params:
+            raise GraphSerializationError(f"{where}: missing parameter {name!r}")
+        target = params[name]
+    else:
+        try:
+            target = import_path(reference["$ref"])
+        except (ImportError, AttributeError, ValueError) as error:
+            raise GraphSerializationError(
+                f"{where}: cannot import {reference['$ref']!r}: {error}"
+            ) from error
+    if "attr" in reference:
+        target = getattr(target, reference["attr"])
+    return target
+
+
+def _resolve_value(value: Any, params: Mapping[str, Any], where: str) -> Any:
+    if _is_reference(value):
+        return _resolve_reference(value, params, where)
+    if isinstance(value, list):
+        return [_resolve_value(item, params, where) for item in value]
+    if isinstance(value, dict):
+        return {
+            key: _resolve_value(item, params, f"{where}.{key}")
+            for key, item in value.items()
+        }
+    return value
+
+
+# -------------------------------
+# Graph <-> dict
+# -------------------------------
+
+
+def graph_to_dict(
+    graph: Graph, references: Optional[Mapping[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Describes the graph as JSON-compatible data.
+
+    Commands and edge conditions are stored by dotted import path. Node and
+    edge parameters are stored as JSON; other objects, such as agents, must
+    be named in references and are stored as parameter references, to be
+    supplied again when loading.
+
+    Args:
+        graph (Graph): The graph to describe.
+        references (Mapping[str, Any], optional): Objects to store by name,
+            e.g. {"router_agent": router_agent}. Bound methods of these
+            objects are stored as references too.
+
+    Raises:
+        GraphSerializationError: If a callable or parameter cannot be stored.
+    """
+    if graph._scopes:
+        raise GraphSerializationError(
+            "Compiled graphs cannot be saved; save the graph before Graph.compile"
+        )
+    by_id = {id(obj): name for name, obj in (references or {}).items()}
+    nodes = []
+    for node in graph.nodes():
+        command = None
+        if node.command is not None:
+            command = _encode_reference(node.command, by_id)
+            if command is None:
+                raise GraphSerializationError(
+                    f"Node {node.node_name}: command {node.command!r} is not "
+                    "importable; use a module-level function or pass its owner in "
+                    "references"
+                )
+        entry = {
+            "name": node.node_name,
+            "kind": NodeKind(node.kind).value,
+            "command": command,
+            "parameters": _encode_value(
+                node.parameters or {}, by_id, f"Node {node.node_name}"
+            ),
+        }
+        if node.kind == NodeKind.SUBGRAPH and node.subgraph is not None:
+            entry["subgraph"] = graph_to_dict(node.subgraph, references)
+            entry["inline"] = node.inline
+        nodes.append(entry)
+    edges = []
+    for source, connections in graph._graphDict.items():
+        for target, edge in connections:
+            where = f"Edge {edge.edge_name} ({source.node_name} -> {target.node_name})"
+            condition = None
+            if edge.condition is not None:
+                condition = _encode_reference(edge.condition, by_id)
+                if condition is None:
+                    raise GraphSerializationError(
+                        f"{where}: condition {edge.condition!r} is not importable"
+                    )
+            edges.append(
+                {
+                    "from": source.node_name,
+                    "to": target.node_name,
+                    "name": edge.edge_name,
+                    "condition": condition,
+                    "parameters": _encode_value(edge.parameters or {}, by_id, where),
+                }
+            )
+    return {
+        "format": FORMAT,
+        "version": FORMAT_VERSION,
+        "nodes": nodes,
+        "edges": edges,
+    }
+
+
+def _check_reference(value: Any, where: str) -> None:
+    if value is None:
+        return
+    if not _is_reference(value):
+        raise GraphSerializationError(f"{where}: expected a reference, got {value!r}")
+
+
+def compile_graph_spec(spec: Mapping[str, Any]) -> CompiledGraph:
+    """
+    Validates a graph description (see graph_to_dict) and returns it in the
+    compact form that load_graph caches.
+
+    Raises:
+        GraphSerializationError: If the description is invalid.
+    """
+    if spec.get("format") != FORMAT:
+        raise GraphSerializationError(
+            f"Not a graph description: {spec.get('format')!r}"
+        )
+    if spec.get("version") != FORMAT_VERSION:
+        raise GraphSerializationError(
+            f"Unsupported graph format version {spec.get('version')!r}"
+        )
+    nodes = []
+    kinds = {}
+    for entry in spec.get("nodes", []):
+        name = entry.get("name")
+        if not isinstance(name, str) or not name:
+            raise GraphSerializationError(f"Node without a name: {entry!r}")
+        if name in kinds:
+            raise GraphSerializationError(f"Duplicate node {name!r}")
+        try:
+            kind = NodeKind(entry.get("kind"))
+        except ValueError:
+            raise GraphSerializationError(
+                f"Node {name}: invalid kind {entry.get('kind')!r}"
+            ) from None
+        _check_reference(entry.get("command"), f"Node {name} command")
+        subgraph = None
+        if kind == NodeKind.SUBGRAPH:
+            if entry.get("command") is not None:
+                raise GraphSerializationError(
+                    f"SUBGRAPH node {name} cannot have a command"
+                )
+            if not isinstance(entry.get("subgraph"), Mapping):
+                raise GraphSerializationError(f"SUBGRAPH node {name} has no subgraph")
+            try:
+                subgraph = compile_graph_spec(entry["subgraph"])
+            except GraphSerializationError as error:
+                raise GraphSerializationError(f"Subgraph {name}: {error}") from None
+        kinds[name] = kind
+        nodes.append(
+            (
+                name,
+                kind.value,
+                entry.get("command"),
+                entry.get("parameters") or {},
+                subgraph,
+                bool(entry.get("inline", True)),
+            )
+        )
+    if list(kinds.values()).count(NodeKind.START) != 1:
+        raise GraphSerializationError("A graph needs exactly one START node")
+
+    edges = []
+    for entry in spec.get("edges", []):
+        source, target, name = entry.get("from"), entry.get("to"), entry.get("name")
+        where = f"Edge {name} ({source} -> {target})"
+        for endpoint in (source, target):
+            if endpoint not in kinds:
+                raise GraphSerializationError(f"{where}: unknown node {endpoint!r}")
+        if kinds[source] == NodeKind.TERMINAL:
+            raise GraphSerializationError(f"{where}: TERMINAL nodes have no edges")
+        if not isinstance(name, str):
+            raise GraphSerializationError(f"{where}: edge without a name")
+        _check_reference(entry.get("condition"), f"{where} condition")
+        edges.append(
+            (
+                source,
+                target,
+                name,
+                entry.get("condition"),
+                entry.get("parameters") or {},
+            )
+        )
+    return nodes, edges
+
+
+def build_graph(
+    compiled: CompiledGraph,
+    params: Optional[Mapping[str, Any]] = None,
+    state: Optional[GraphState] = None,
+) -> Graph:
+    """
+    Creates a Graph from a compiled description, importing commands and
+    conditions and filling in parameter references from params.
+    """
+    params = params or {}
+    node_specs, edge_specs = compiled
+    nodes = {}
+    for name, kind, command, parameters, subgraph, inline in node_specs:
+        where = f"Node {name}"
+        nodes[name] = Node(
+            node_name=name,
+            kind=kind,
+            command=(
+                _resolve_reference(command, params, where)
+                if command is not None
+                else None
+            ),
+            parameters=_resolve_value(parameters, params, where),
+            subgraph=build_graph(subgraph, params) if subgraph is not None else None,
+            inline=inline,
+        )
+    graph = Graph(state=state)
+    for node in nodes.values():
+        graph.add_node(node)
+    for source, target, name, condition, parameters in edge_specs:
+        where = f"Edge {name} ({source} -> {target})"
+        graph.connect_edge(
+            FROM=nodes[source],
+            TO=nodes[target],
+            WITH=Edge(
+                edge_name=name,
+                condition=(
+                    _resolve_reference(condition, params, where)
+                    if condition is not None
+                    else None
+                ),
+                parameters=_resolve_value(parameters, params, where),
+            ),
+        )
+    return graph
+
+
+def graph_from_dict(
+    spec: Mapping[str, Any],
+    params: Optional[Mapping[str, Any]] = None,
+    state: Optional[GraphState] = None,
+) -> Graph:
+    """
+    Creates a Graph from a description made by graph_to_dict.
+
+    Args:
+        spec (Mapping): The graph description.
+        params (Mapping[str, Any], optional): Objects for the parameter
+            references, by name.
+        state (GraphState, optional): State of the new graph.
+    """
+    return build_graph(compile_graph_spec(spec), params, state)
+
+
+# -------------------------------
+# Files and binary cache
+# -------------------------------
+
+
+def save_graph(
+    graph: Graph, path: str, references: Optional[Mapping[str, Any]] = None
+) -> None:
+    """
+    Saves the graph as JSON. See graph_to_dict for references.
+    """
+    with open(path, "w") as file:
+        json.dump(graph_to_dict(graph, references), file, indent=2)
+        file.write("\n")
+
+
+def _cache_path(path: str, source: bytes, cache_dir: str) -> str:
+    digest = hashlib.sha256(source).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f"{stem}-v{CACHE_VERSION}-{digest}.pickle")
+
+
+def _write_atomic(path: str, payload: bytes) -> None:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(payload)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def compile_graph_file(path: str, cache_dir: Optional[str] = None) -> CompiledGraph:
+    """
+    Reads and validates a graph file.
+
+    With cache_dir, the validated structure is cached there in binary form,
+    keyed by the file's content hash; later calls, e.g. from other worker
+    processes, load the cache instead of parsing and validating the JSON.
+    A changed file gets a new cache entry, and an entry that cannot be read
+    is rebuilt.
+    """
+    with open(path, "rb") as file:
+        source = file.read()
+    cache_file = _cache_path(path, source, cache_dir) if cache_dir else None
+    if cache_file is not None:
+        try:
+            with open(cache_file, "rb") as file:
+                return pickle.load(file)
+        except FileNotFoundError:
+            pass
+        except (
+            EOFError,
+            pickle.UnpicklingError,
+            AttributeError,
+            ImportError,
+            IndexError,
+            ValueError,
+        ):
+            # Truncated or corrupt, or written by an incompatible version:
+            # rebuild it from the JSON below
+            pass
+    try:
+        spec = json.loads(source)
+    except ValueError as error:
+        raise GraphSerializationError(f"{path}: invalid JSON: {error}") from error
+    compiled = compile_graph_spec(spec)
+    if cache_file is not None:
+        _write_atomic(cache_file, pickle.dumps(compiled, pickle.HIGHEST_PROTOCOL))
+    return compiled
+
+
+def load_graph(
+    path: str,
+    params: Optional[Mapping[str, Any]] = None,
+    cache_dir: Optional[str] = None,
+    state: Optional[GraphState] = None,
+) -> Graph:
+    """
+    Loads a graph saved with save_graph.
+
+    Args:
+        path (str): JSON graph file.
+        params (Mapping[str, Any], optional): Objects for the parameter
+            references, by name, e.g. {"router_agent": router_agent}.
+        cache_dir (str, optional): Directory for the binary cache of the
+            validated structure (see compile_graph_file).
+        state (GraphState, optional): State of the new graph.
+
+    Example:
+        graph = load_graph(
+            "workflow.json", params={"agent": agent}, cache_dir=".graph_cache"
+        )
+        graph.run(start_node=graph.start_node())
+    """
+    return build_graph(compile_graph_file(path, cache_dir), params, state)
+
+
+# -------------------------------
+# Diff
+# -------------------------------
+
+
+class GraphDiff:
+    """
+    Differences between two graph descriptions.
+
+    Attributes:
+        added_nodes / removed_nodes (List[str]): Node names.
+        changed_nodes (Dict[str, Dict[str, Tuple]]): Changed fields per node,
+            as (old, new) pairs.
+        added_edges / removed_edges (List[Tuple[str, str, str]]): Edges as
+            (source, target, name).
+        changed_edges (Dict[Tuple[str, str, str], Dict[str, Tuple]]): Changed
+            condition or parameters per edge.
+        reordered (List[str]): Nodes whose outgoing edges are evaluated in a
+            different order.
+    """
+
+    def __init__(self):
+        self.added_nodes: List[str] = []
+        self.removed_nodes: List[str] = []
+        self.changed_nodes: Dict[str, Dict[str, Tuple]] = {}
+        self.added_edges: List[Tuple[str, str, str]] = []
+        self.removed_edges: List[Tuple[str, str, str]] = []
+        self.changed_edges: Dict[Tuple[str, str, str], Dict[str, Tuple]] = {}
+        self.reordered: List[str] = []
+
+    def __bool__(self) -> bool:
+        return any(
+            (
+                self.added_nodes,
+                self.removed_nodes,
+                self.changed_nodes,
+                self.added_edges,
+                self.removed_edges,
+                self.changed_edges,
+                self.reordered,
+            )
+        )
+
+    def summary(self) -> List[str]:
+        """
+        Returns one line per difference.
+        """
+        lines = [f"+ node {name}" for name in self.added_nodes]
+        lines += [f"- node {name}" for name in self.removed_nodes]
+        for name, fields in self.changed_nodes.items():
+            for field, (old, new) in fields.items():
+                if field == "subgraph":
+                    # Compiled subgraphs are long; diff them with diff_graphs
+                    lines.append(f"~ node {name}.subgraph")
+                else:
+                    lines.append(f"~ node {name}.{field}: {old!r} -> {new!r}")
+        lines += [f"+ edge {name} ({s} -> {t})" for s, t, name in self.added_edges]
+        lines += [f"- edge {name} ({s} -> {t})" for s, t, name in self.removed_edges]
+        for (source, target, name), fields in self.changed_edges.items():
+            for field, (old, new) in fields.items():
+                lines.append(
+                    f"~ edge {name} ({source} -> {target}).{field}: {old!r} -> {new!r}"
+                )
+        lines += [f"~ edge order of node {name}" for name in self.reordered]
+        return lines
+
+    def __repr__(self) -> str:
+        return "GraphDiff(" + "; ".join(self.summary()) + ")"
+
+
+def _as_spec(graph: Any, references: Optional[Mapping[str, Any]]) -> Mapping:
+    if isinstance(graph, Graph):
+        return graph_to_dict(graph, references)
+    if isinstance(graph, (str, os.PathLike)):
+        with open(graph) as file:
+            return json.load(file)
+    return graph
+
+
+def diff_graphs(
+    old: Any, new: Any, references: Optional[Mapping[str, Any]] = None
+) -> GraphDiff:
+    """
+    Compares two graph versions.
+
+    Args:
+        old, new: Graphs, graph descriptions (see graph_to_dict) or paths of
+            saved graphs.
+        references (Mapping[str, Any], optional): Used to describe Graph
+            arguments, see graph_to_dict.
+
+    Returns:
+        GraphDiff: The differences; falsy if the graphs are the same.
+    """
+    old_nodes, old_edges = compile_graph_spec(_as_spec(old, references))
+    new_nodes, new_edges = compile_graph_spec(_as_spec(new, references))
+    diff = GraphDiff()
+
+    fields = ("kind", "command", "parameters", "subgraph", "inline")
+    old_by_name = {node[0]: node[1:] for node in old_nodes}
+    new_by_name = {node[0]: node[1:] for node in new_nodes}
+    diff.added_nodes = [name for name in new_by_name if name not in old_by_name]
+    diff.removed_nodes = [name for name in old_by_name if name not in new_by_name]
+    for name, old_values in old_by_name.items():
+        new_values = new_by_name.get(name)
+        if new_values is None:
+            continue
+        changes = {
+            field: (before, after)
+            for field, before, after in zip(fields, old_values, new_values)
+            if before != after
+        }
+        if changes:
+            diff.changed_nodes[name] = changes
+
+    fields = ("condition", "parameters")
+    old_by_key = {edge[:3]: edge[3:] for edge in old_edges}
+    new_by_key = {edge[:3]: edge[3:] for edge in new_edges}
+    diff.added_edges = [key for key in new_by_key if key not in old_by_key]
+    diff.removed_edges = [key for key in old_by_key if key not in new_by_key]
+    for key, old_values in old_by_key.items():
+        new_values = new_by_key.get(key)
+        if new_values is None:
+            continue
+        changes = {
+            field: (before, after)
+            for field, before, after in zip(fields, old_values, new_values)
+            if before != after
+        }
+        if changes:
+            diff.changed_edges[key] = changes
+
+    # The first matching edge wins, so the order of shared edges matters
+    for name in old_by_name:
+        before = [key for key in old_by_key if key[0] == name and key in new_by_key]
+        after = [key for key in new_by_key if key[0] == name and key in old_by_key]
+        if before != after:
+            diff.reordered.append(name)
+    return diff
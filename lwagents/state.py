@@ -1,6 +1,15 @@
 # from models import Message, History
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Annotated, List, Optional, Sequence, TypedDict
+from typing import (
+    TYPE_CHECKING,
+    Annotated,
+    Any,
+    Callable,
+    List,
+    Optional,
+    Sequence,
+    TypedDict,
+)
 
 from typing_extensions import Self, override
 
@@ -16,11 +25,118 @@ class InvalidAgent(Exception):
     pass
 
 
+def approximate_size(value: Any) -> int:
+    """
+    Approximates the memory held by a state entry: the length of its text
+    and the sizes of nested containers and models.
+    """
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(approximate_size(k) + approximate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(approximate_size(item) for item in value)
+    if value is None or isinstance(value, (bool, int, float)):
+        return 8
+    if hasattr(value, "__dict__"):
+        return approximate_size(vars(value))
+    return len(repr(value))
+
+
+class MemoryPolicy:
+    """
+    Bounds the history kept by a state, so long-running agents use constant memory.
+
+    When a limit is exceeded the oldest entries are evicted, except the first
+    keep_first entries and the newest entry. Evicted entries can be folded
+    into a running summary by the summarizer.
+
+    Args:
+        max_entries (int, optional): Maximum number of entries kept (a sliding window).
+        max_bytes (int, optional): Maximum approximate size of the kept entries.
+        keep_first (int): Number of initial entries that are never evicted.
+        summarizer (Callable, optional): Called as summarizer(evicted_entries,
+            previous_summary) and returns the new summary, stored on state.summary.
+        sizer (Callable): Size estimate of an entry, used with max_bytes.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        keep_first: int = 0,
+        summarizer: Optional[Callable[[List[dict], Any], Any]] = None,
+        sizer: Callable[[Any], int] = approximate_size,
+    ):
+        if max_entries is not None and max_entries <= keep_first:
+            raise ValueError("max_entries must be larger than keep_first")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.keep_first = keep_first
+        self.summarizer = summarizer
+        self.sizer = sizer
+
+
 # Abstract Base Class
 class State(ABC):
-    def __init__(self, initial_history=None):
+    def __init__(
+        self, initial_history=None, memory_policy: Optional[MemoryPolicy] = None
+    ):
         self.history = initial_history or []
         self.last_update = None
+        self.memory_policy = memory_policy
+        # Summary of the evicted entries and how many there were
+        self.summary = None
+        self.evicted = 0
+        self._entry_sizes = []
+        self._history_bytes = 0
+        if memory_policy is not None:
+            if memory_policy.max_bytes is not None:
+                self._entry_sizes = [memory_policy.sizer(e) for e in self.history]
+                self._history_bytes = sum(self._entry_sizes)
+            self._compact()
+
+    def _append(self, state_entry) -> None:
+        """
+        Appends an entry to the history and applies the memory policy.
+        """
+        self.history.append(state_entry)
+        policy = self.memory_policy
+        if policy is None:
+            return
+        if policy.max_bytes is not None:
+            size = policy.sizer(state_entry)
+            self._entry_sizes.append(size)
+            self._history_bytes += size
+        self._compact()
+
+    def _compact(self) -> None:
+        policy = self.memory_policy
+        first = min(policy.keep_first, len(self.history))
+        # The newest entry is always kept
+        evictable = max(0, len(self.history) - first - 1)
+        drop = 0
+        if policy.max_entries is not None:
+            drop = max(0, len(self.history) - policy.max_entries)
+        if policy.max_bytes is not None:
+            kept_bytes = self._history_bytes - sum(
+                self._entry_sizes[first : first + drop]
+            )
+            while kept_bytes > policy.max_bytes and drop < evictable:
+                kept_bytes -= self._entry_sizes[first + drop]
+                drop += 1
+        drop = min(drop, evictable)
+        if not drop:
+            return
+
+        evicted = self.history[first : first + drop]
+        del self.history[first : first + drop]
+        if policy.max_bytes is not None:
+            self._history_bytes -= sum(self._entry_sizes[first : first + drop])
+            del self._entry_sizes[first : first + drop]
+        self.evicted += drop
+        if policy.summarizer is not None:
+            self.summary = policy.summarizer(evicted, self.summary)
 
     @abstractmethod
     def update_state(self, action: str) -> None:
@@ -61,11 +177,35 @@ class AgentState(State):
     Args:
         agent (Agent, optional): The current agent associated with the state.
         initial_history (list, optional): The initial history for the state.
+        memory_policy (MemoryPolicy, optional): Bounds the kept history.
     """
 
-    def __init__(self, initial_history: Optional[List] = []):
-        super().__init__(initial_history=initial_history)
-        self.history = initial_history or []
+    def __init__(
+        self,
+        initial_history: Optional[List] = None,
+        memory_policy: Optional[MemoryPolicy] = None,
+    ):
+        super().__init__(initial_history=initial_history, memory_policy=memory_policy)
+        self.usage = {
+            "calls": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cached_tokens": 0,
+            "cache_creation_tokens": 0,
+        }
+
+    def record_usage(self, usage) -> None:
+        """
+        Adds the token usage of a model response to the running totals.
+
+        Args:
+            usage (Usage): The usage reported on the model response.
+        """
+        self.usage["calls"] += 1
+        self.usage["input_tokens"] += usage.input_tokens
+        self.usage["output_tokens"] += usage.output_tokens
+        self.usage["cached_tokens"] += usage.cached_tokens
+        self.usage["cache_creation_tokens"] += usage.cache_creation_tokens
 
     @property
     def current_agent(self) -> Optional["Agent"]:
@@ -92,14 +232,18 @@ class AgentState(State):
         state_entry = {**kwargs}
         if enforce_schema:
             self.enforce_schema(state_entry)
-        self.history.append(state_entry)
+        self._append(state_entry)
         self.last_update = state_entry
 
 
 class GraphState(State):
 
-    def __init__(self, initial_history: Optional[List] = []):
-        super().__init__(initial_history=initial_history)
+    def __init__(
+        self,
+        initial_history: Optional[List] = None,
+        memory_policy: Optional[MemoryPolicy] = None,
+    ):
+        super().__init__(initial_history=initial_history, memory_policy=memory_policy)
 
     def print_history(self) -> None:
         """
@@ -162,12 +306,14 @@ class GraphState(State):
         }
         if enforce_schema:
             self.enforce_schema(state_entry)
-        self.history.append(state_entry)
+        self._append(state_entry)
 
 
 class GlobalAgentState(State):
-    def __init__(self, initial_history=None):
-        super().__init__(initial_history)
+    def __init__(
+        self, initial_history=None, memory_policy: Optional[MemoryPolicy] = None
+    ):
+        super().__init__(initial_history, memory_policy=memory_policy)
 
     def print_history(self) -> None:
         return super().print_history()
@@ -192,7 +338,7 @@ class GlobalAgentState(State):
         }
         if enforce_schema:
             self.enforce_schema(state_entry)
-        self.history.append(state_entry)
+        self._append(state_entry)
 
     @override
     def get_last_entry(self, inner_content=False) -> dict:
@@ -217,10 +363,13 @@ def get_global_agent_state() -> GlobalAgentState:
     return _global_agent_state
 
 
-def reset_global_agent_state() -> None:
+def reset_global_agent_state(memory_policy: Optional[MemoryPolicy] = None) -> None:
     """
     Resets the global agent state to a fresh instance.
     Useful for testing or when you want to clear the global history.
+
+    Args:
+        memory_policy (MemoryPolicy, optional): Bounds the global history.
     """
     global _global_agent_state
-    _global_agent_state = GlobalAgentState()
+    _global_agent_state = GlobalAgentState(memory_policy=memory_policy)
@@ -0,0 +1,784 @@
+"""
+Local stub of the OpenAI Responses and Anthropic Messages APIs.
+
+Serves the subset of both APIs lwagents uses, including tool calls and
+streaming, so models can be driven through their real HTTP clients without
+reaching the providers, e.g. for load tests:
+
+    with StubServer(latency=LatencyDistribution("lognormal", mean=0.4)) as server:
+        model = create_model("openai", instance_params=server.instance_params("openai"))
+
+Run ``python -m lwagents.stub_server --help`` to serve it standalone.
+"""
+
+import argparse
+import itertools
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from .tokens import estimate_request_tokens, estimate_tokens
+
+# Argument values generated for tool calls, by JSON schema type
+_PLACEHOLDER_VALUES = {
+    "integer": 1,
+    "number": 1.0,
+    "string": "stub",
+    "boolean": True,
+    "array": [],
+    "object": {},
+}
+
+
+class LatencyDistribution:
+    """
+    Distribution of the delay before a stub response, in seconds.
+
+    Args:
+        kind (str): "constant", "uniform", "normal", "lognormal" or "exponential".
+        mean (float): Mean delay.
+        spread (float): Half width (uniform), standard deviation (normal) or
+            sigma of the underlying normal distribution (lognormal). Ignored
+            by constant and exponential.
+        minimum (float): Lower bound of the sampled delays.
+        maximum (float, optional): Upper bound of the sampled delays.
+        seed (int, optional): Seed, so runs are reproducible.
+    """
+
+    kinds = ("constant", "uniform", "normal", "lognormal", "exponential")
+
+    def __init__(
+        self,
+        kind: str = "constant",
+        mean: float = 0.0,
+        spread: float = 0.0,
+        minimum: float = 0.0,
+        maximum: Optional[float] = None,
+        seed: Optional[int] = None,
+    ):
+        if kind not in self.kinds:
+            raise ValueError(f"Unsupported latency distribution: {kind}")
+        self.kind = kind
+        self.mean = mean
+        self.spread = spread
+        self.minimum = minimum
+        self.maximum = maximum
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _draw(self) -> float:
+        if self.kind == "constant" or self.mean <= 0:
+            return self.mean
+        if self.kind == "uniform":
+            return self._random.uniform(
+                self.mean - self.spread, self.mean + self.spread
+            )
+        if self.kind == "normal":
+            return self._random.gauss(self.mean, self.spread)
+        if self.kind == "lognormal":
+            # mu chosen so the distribution's mean is self.mean
+            mu = math.log(self.mean) - self.spread**2 / 2
+            return self._random.lognormvariate(mu, self.spread)
+        return self._random.expovariate(1 / self.mean)
+
+    def sample(self) -> float:
+        with self._lock:
+            delay = self._draw()
+        delay = max(self.minimum, delay)
+        if self.maximum is not None:
+            delay = min(self.maximum, delay)
+        return delay
+
+
+class StubStats:
+    """
+    Thread-safe request counters of a StubServer.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.monotonic()
+            self.requests = 0
+            self.completed = 0
+            self.streamed = 0
+            self.tool_calls = 0
+            self.errors = 0
+            self.rate_limited = 0
+            self.in_flight = 0
+            self.max_in_flight = 0
+            self.total_latency = 0.0
+            self.by_endpoint: Dict[str, int] = {}
+
+    def request_started(self, endpoint: str) -> None:
+        with self._lock:
+            self.requests += 1
+            self.by_endpoint[endpoint] = self.by_endpoint.get(endpoint, 0) + 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def request_finished(
+        self,
+        latency: float,
+        status: int,
+        streamed: bool = False,
+        tool_calls: int = 0,
+    ) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if status == 429:
+                self.rate_limited += 1
+            elif status >= 400:
+                self.errors += 1
+            else:
+                self.completed += 1
+                self.streamed += streamed
+                self.tool_calls += tool_calls
+                self.total_latency += latency
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns the counters, plus completed requests per second and mean
+        latency of completed requests since the last reset.
+        """
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            return {
+                "requests": self.requests,
+                "completed": self.completed,
+                "streamed": self.streamed,
+                "tool_calls": self.tool_calls,
+                "errors": self.errors,
+                "rate_limited": self.rate_limited,
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+                "by_endpoint": dict(self.by_endpoint),
+                "elapsed": elapsed,
+                "throughput": self.completed / elapsed if elapsed > 0 else 0.0,
+                "mean_latency": (
+                    self.total_latency / self.completed if self.completed else None
+                ),
+            }
+
+
+def _placeholder_arguments(schema: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    properties = (schema or {}).get("properties", {})
+    return {
+        name: _PLACEHOLDER_VALUES.get(property_schema.get("type"))
+        for name, property_schema in properties.items()
+    }
+
+
+def _chunks(text: str, size: int) -> List[str]:
+    return [text[i : i + size] for i in range(0, len(text), size)] or [""]
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_StubHTTPServer"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    # -------- transport --------
+
+    def _send_json(
+        self, status: int, body: Dict[str, Any], headers: Dict[str, str] = {}
+    ) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _start_stream(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        # The end of the stream is signalled by closing the connection
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+    def _send_event(self, event: str, data: Dict[str, Any]) -> None:
+        stub = self.server.stub
+        if stub.stream_delay:
+            time.sleep(stub.stream_delay)
+        self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
+        self.wfile.flush()
+
+    def _read_body(self) -> Dict[str, Any]:
+        """
+        Returns the JSON object of the request body.
+
+        Raises:
+            ValueError: If the body is not a JSON object.
+        """
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            # The rest of the request cannot be found on this connection
+            self.close_connection = True
+            raise ValueError("Invalid Content-Length header")
+        if not length:
+            return {}
+        body = json.loads(self.rfile.read(length))
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object")
+        return body
+
+    # -------- routing --------
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") == "/stats":
+            self._send_json(200, self.server.stub.stats.snapshot())
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def do_POST(self) -> None:
+        path = self.path.split("?")[0].rstrip("/")
+        if path.endswith("/responses"):
+            endpoint = "responses"
+        elif path.endswith("/messages"):
+            endpoint = "messages"
+        else:
+            try:
+                self._read_body()
+            except ValueError:
+                pass
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        stub = self.server.stub
+        started = time.monotonic()
+        stub.stats.request_started(endpoint)
+        status, streamed, tool_calls = 500, False, 0
+        try:
+            try:
+                request = self._read_body()
+            except ValueError as error:
+                status = 400
+                self._send_error(endpoint, status, f"Invalid request body: {error}")
+                return
+            streamed = bool(request.get("stream"))
+            status = stub._injected_status()
+            if status is not None:
+                self._send_error(endpoint, status)
+                return
+            stub._sleep()
+            if endpoint == "responses":
+                tool_calls = self._respond_openai(request)
+            else:
+                tool_calls = self._respond_anthropic(request)
+            status = 200
+        finally:
+            stub.stats.request_finished(
+                time.monotonic() - started, status, streamed, tool_calls
+            )
+
+    def _send_error(
+        self, endpoint: str, status: int, message: Optional[str] = None
+    ) -> None:
+        stub = self.server.stub
+        headers = {}
+        if status == 429:
+            headers["retry-after"] = f"{stub.retry_after:g}"
+            message = message or "Rate limit exceeded (injected by stub server)"
+        else:
+            message = message or "Internal error (injected by stub server)"
+        if endpoint == "responses":
+            error_type = {400: "invalid_request_error", 429: "rate_limit_exceeded"}
+            body = {
+                "error": {
+                    "message": message,
+                    "type": error_type.get(status, "server_error"),
+                    "code": None,
+                }
+            }
+        else:
+            error_type = {400: "invalid_request_error", 429: "rate_limit_error"}
+            body = {
+                "type": "error",
+                "error": {
+                    "type": error_type.get(status, "api_error"),
+                    "message": message,
+                },
+            }
+        self._send_json(status, body, headers)
+
+    # -------- OpenAI Responses API --------
+
+    def _respond_openai(self, request: Dict[str, Any]) -> int:
+        stub = self.server.stub
+        conversation = request.get("input") or []
+        if isinstance(conversation, str):
+            conversation = [conversation]
+        tool_results = sum(
+            1
+            for item in conversation
+            if isinstance(item, dict) and item.get("type") == "function_call_output"
+        )
+        tools = [tool for tool in request.get("tools") or () if tool.get("name")]
+        round_number = tool_results // stub.parallel_tool_calls
+
+        output = []
+        if tools and round_number < stub.tool_rounds:
+            for index in range(stub.parallel_tool_calls):
+                tool = tools[index % len(tools)]
+                number = stub._next_id()
+                output.append(
+                    {
+                        "type": "function_call",
+                        "id": f"fc_stub_{number}",
+                        "call_id": f"call_stub_{number}",
+                        "name": tool["name"],
+                        "arguments": json.dumps(
+                            _placeholder_arguments(tool.get("parameters"))
+                        ),
+                        "status": "completed",
+                    }
+                )
+            output_tokens = estimate_tokens(output)
+        else:
+            output.append(
+                {
+                    "type": "message",
+                    "id": f"msg_stub_{stub._next_id()}",
+                    "status": "completed",
+                    "role": "assistant",
+                    "content": [
+                        {
+                            "type": "output_text",
+                            "text": stub.output_text,
+                            "annotations": [],
+                        }
+                    ],
+                }
+            )
+            output_tokens = estimate_tokens(stub.output_text)
+
+        input_tokens = estimate_request_tokens(request)
+        response = {
+            "id": f"resp_stub_{stub._next_id()}",
+            "object": "response",
+            "created_at": int(time.time()),
+            "status": "completed",
+            "model": request.get("model"),
+            "output": output,
+            "parallel_tool_calls": True,
+            "tool_choice": request.get("tool_choice", "auto"),
+            "tools": request.get("tools") or [],
+            "usage": {
+                "input_tokens": input_tokens,
+                "input_tokens_details": {"cached_tokens": 0},
+                "output_tokens": output_tokens,
+                "output_tokens_details": {"reasoning_tokens": 0},
+                "total_tokens": input_tokens + output_tokens,
+            },
+        }
+        if request.get("stream"):
+            self._stream_openai(response)
+        else:
+            self._send_json(200, response)
+        return sum(item["type"] == "function_call" for item in output)
+
+    def _stream_openai(self, response: Dict[str, Any]) -> None:
+        stub = self.server.stub
+        sequence = itertools.count()
+        self._start_stream()
+
+        def send(event: str, **data) -> None:
+            self._send_event(
+                event, {"type": event, "sequence_number": next(sequence), **data}
+            )
+
+        pending = {**response, "status": "in_progress", "output": [], "usage": None}
+        send("response.created", response=pending)
+        send("response.in_progress", response=pending)
+        for output_index, item in enumerate(response["output"]):
+            if item["type"] == "function_call":
+                send(
+                    "response.output_item.added",
+                    output_index=output_index,
+                    item={**item, "arguments": "", "status": "in_progress"},
+                )
+                for delta in _chunks(item["arguments"], stub.stream_chunk_size):
+                    send(
+                        "response.function_call_arguments.delta",
+                        item_id=item["id"],
+                        output_index=output_index,
+                        delta=delta,
+                    )
+                send(
+                    "response.function_call_arguments.done",
+                    item_id=item["id"],
+                    output_index=output_index,
+                    arguments=item["arguments"],
+                )
+            else:
+                part = item["content"][0]
+                send(
+                    "response.output_item.added",
+                    output_index=output_index,
+                    item={**item, "content": [], "status": "in_progress"},
+                )
+                send(
+                    "response.content_part.added",
+                    item_id=item["id"],
+                    output_index=output_index,
+                    content_index=0,
+                    part={**part, "text": ""},
+                )
+                for delta in _chunks(part["text"], stub.stream_chunk_size):
+                    send(
+                        "response.output_text.delta",
+                        item_id=item["id"],
+                        output_index=output_index,
+                        content_index=0,
+                        delta=delta,
+                        logprobs=[],
+                    )
+                send(
+                    "response.output_text.done",
+                    item_id=item["id"],
+                    output_index=output_index,
+                    content_index=0,
+                    text=part["text"],
+                    logprobs=[],
+                )
+                send(
+                    "response.content_part.done",
+                    item_id=item["id"],
+                    output_index=output_index,
+                    content_index=0,
+                    part=part,
+                )
+            send("response.output_item.done", output_index=output_index, item=item)
+        send("response.completed", response=response)
+
+    # -------- Anthropic Messages API --------
+
+    def _respond_anthropic(self, request: Dict[str, Any]) -> int:
+        stub = self.server.stub
+        tool_results = sum(
+            1
+            for message in request.get("messages") or ()
+            if message.get("role") == "user"
+            and isinstance(message.get("content"), list)
+            for block in message["content"]
+            if isinstance(block, dict) and block.get("type") == "tool_result"
+        )
+        tools = [tool for tool in request.get("tools") or () if tool.get("name")]
+        round_number = tool_results // stub.parallel_tool_calls
+
+        if tools and round_number < stub.tool_rounds:
+            content = [
+                {
+                    "type": "tool_use",
+                    "id": f"toolu_stub_{stub._next_id()}",
+                    "name": tool["name"],
+                    "input": _placeholder_arguments(tool.get("input_schema")),
+                }
+                for tool in (
+                    tools[index % len(tools)]
+                    for index in range(stub.parallel_tool_calls)
+                )
+            ]
+            stop_reason = "tool_use"
+        else:
+            content = [{"type": "text", "text": stub.output_text}]
+            stop_reason = "end_turn"
+
+        message = {
+            "id": f"msg_stub_{stub._next_id()}",
+            "type": "message",
+            "role": "assistant",
+            "model": request.get("model"),
+            "content": content,
+            "stop_reason": stop_reason,
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": estimate_request_tokens(request),
+                "output_tokens": estimate_tokens(content),
+                "cache_creation_input_tokens": 0,
+                "cache_read_input_tokens": 0,
+            },
+        }
+        if request.get("stream"):
+            self._stream_anthropic(message)
+        else:
+            self._send_json(200, message)
+        return sum(block["type"] == "tool_use" for block in content)
+
+    def _stream_anthropic(self, message: Dict[str, Any]) -> None:
+        stub = self.server.stub
+        self._start_stream()
+
+        def send(event: str, **data) -> None:
+            self._send_event(event, {"type": event, **data})
+
+        send(
+            "message_start",
+            message={
+                **message,
+                "content": [],
+                "stop_reason": None,
+                "usage": {**message["usage"], "output_tokens": 0},
+            },
+        )
+        for index, block in enumerate(message["content"]):
+            if block["type"] == "tool_use":
+                send(
+                    "content_block_start",
+                    index=index,
+                    content_block={**block, "input": {}},
+                )
+                for delta in _chunks(
+                    json.dumps(block["input"]), stub.stream_chunk_size
+                ):
+                    send(
+                        "content_block_delta",
+                        index=index,
+                        delta={"type": "input_json_delta", "partial_json": delta},
+                    )
+            else:
+                send(
+                    "content_block_start",
+                    index=index,
+                    content_block={**block, "text": ""},
+                )
+                for delta in _chunks(block["text"], stub.stream_chunk_size):
+                    send(
+                        "content_block_delta",
+                        index=index,
+                        delta={"type": "text_delta", "text": delta},
+                    )
+            send("content_block_stop", index=index)
+        send(
+            "message_delta",
+            delta={"stop_reason": message["stop_reason"], "stop_sequence": None},
+            usage={"output_tokens": message["usage"]["output_tokens"]},
+        )
+        send("message_stop")
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Load tests open many connections at once
+    request_queue_size = 128
+
+    def __init__(self, address, stub: "StubServer"):
+        self.stub = stub
+        super().__init__(address, _StubHandler)
+
+
+class StubServer:
+    """
+    Local HTTP server answering like the OpenAI Responses API
+    (``POST /v1/responses``) and the Anthropic Messages API
+    (``POST /v1/messages``), with or without ``stream``.
+
+    Requests offering tools get tool calls with placeholder arguments for
+    tool_rounds rounds, then a text answer. Counters are available as
+    ``stats`` and at ``GET /stats``.
+
+    Args:
+        host (str): Interface to bind.
+        port (int): Port to bind, 0 for a free one.
+        latency (LatencyDistribution | float, optional): Delay before each
+            response. A float is a constant delay in seconds.
+        error_rate (float): Fraction of requests failing with error_status.
+        error_status (int): Status code of injected errors.
+        rate_limit_rate (float): Fraction of requests answered with 429.
+        retry_after (float): retry-after header of injected 429s, in seconds.
+        tool_rounds (int): Rounds of tool calls before the text answer.
+        parallel_tool_calls (int): Tool calls per round.
+        output_text (str): Text of the answers.
+        stream_chunk_size (int): Characters per streamed delta.
+        stream_delay (float): Delay between streamed events, in seconds.
+        seed (int, optional): Seed of the error injection, so runs are reproducible.
+
+    Example:
+        with StubServer(latency=0.2, rate_limit_rate=0.05) as server:
+            model = create_model(
+                "anthropic", instance_params=server.instance_params("anthropic")
+            )
+            ...
+            print(server.stats.snapshot())
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: LatencyDistribution | float | None = None,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        tool_rounds: int = 1,
+        parallel_tool_calls: int = 1,
+        output_text: str = "This is a stub response.",
+        stream_chunk_size: int = 8,
+        stream_delay: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        if isinstance(latency, (int, float)):
+            latency = LatencyDistribution("constant", mean=latency)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.tool_rounds = tool_rounds
+        self.parallel_tool_calls = max(1, parallel_tool_calls)
+        self.output_text = output_text
+        self.stream_chunk_size = max(1, stream_chunk_size)
+        self.stream_delay = stream_delay
+        self.stats = StubStats()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._httpd = _StubHTTPServer((host, port), self)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def base_url(self, provider: str) -> str:
+        """
+        Returns the base URL to give the provider client. The OpenAI client
+        expects the API version in the base URL, the Anthropic client adds it.
+        """
+        if provider in ("openai", "deepseek"):
+            return f"{self.url}/v1"
+        if provider == "anthropic":
+            return self.url
+        raise ValueError(f"Unsupported provider: {provider}")
+
+    def instance_params(self, provider: str, **client_params) -> Dict[str, Any]:
+        """
+        Returns create_model instance_params pointing the provider client at
+        this server. client_params are passed on, e.g. max_retries.
+        """
+        return {
+            "api_key": "stub",
+            "base_url": self.base_url(provider),
+            **client_params,
+        }
+
+    def _next_id(self) -> int:
+        return next(self._ids)
+
+    def _injected_status(self) -> Optional[int]:
+        if not self.rate_limit_rate and not self.error_rate:
+            return None
+        with self._lock:
+            draw = self._random.random()
+        if draw < self.rate_limit_rate:
+            return 429
+        if draw < self.rate_limit_rate + self.error_rate:
+            return self.error_status
+        return None
+
+    def _sleep(self) -> None:
+        if self.latency is not None:
+            delay = self.latency.sample()
+            if delay > 0:
+                time.sleep(delay)
+
+    def start(self) -> "StubServer":
+        """
+        Serves requests in a background thread.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever,
+                name="lwagents-stub-server",
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Local OpenAI/Anthropic-compatible stub server"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--latency-distribution", default="constant", choices=LatencyDistribution.kinds
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean, in seconds")
+    parser.add_argument("--latency-spread", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--tool-rounds", type=int, default=1)
+    parser.add_argument("--parallel-tool-calls", type=int, default=1)
+    parser.add_argument("--stream-delay", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    server = StubServer(
+        host=args.host,
+        port=args.port,
+        latency=LatencyDistribution(
+            args.latency_distribution,
+            mean=args.latency,
+            spread=args.latency_spread,
+            seed=args.seed,
+        ),
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        tool_rounds=args.tool_rounds,
+        parallel_tool_calls=args.parallel_tool_calls,
+        stream_delay=args.stream_delay,
+        seed=args.seed,
+    )
+    print(f"OpenAI base URL:    {server.base_url('openai')}")
+    print(f"Anthropic base URL: {server.base_url('anthropic')}")
+    print(f"Counters:           {server.url}/stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(json.dumps(server.stats.snapshot(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
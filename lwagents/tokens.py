@@ -0,0 +1,241 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Context windows by model name prefix. The longest matching prefix wins.
+MODEL_CONTEXT_LIMITS: Dict[str, int] = {
+    "gpt-3.5-turbo": 16385,
+    "gpt-4": 8192,
+    "gpt-4-turbo": 128000,
+    "gpt-4o": 128000,
+    "gpt-4.1": 1047576,
+    "gpt-5": 400000,
+    "o1": 200000,
+    "o3": 200000,
+    "o4-mini": 200000,
+    "claude": 200000,
+    "deepseek": 128000,
+}
+
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+class ContextWindowExceededError(Exception):
+    pass
+
+
+class CountedMessages(list):
+    """
+    Message list that carries its precomputed token estimate, so it is not
+    counted again (see ConversationBuffer).
+    """
+
+    def __init__(self, messages=(), estimated_tokens: int = 0):
+        super().__init__(messages)
+        self.estimated_tokens = estimated_tokens
+
+
+def estimate_tokens(value: Any) -> int:
+    """
+    Estimates the token count of a prompt fragment without calling the provider.
+
+    Strings are counted at roughly four characters per token; dicts and lists
+    are counted recursively with a small overhead per message.
+    """
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return (len(value) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    if isinstance(value, CountedMessages):
+        return value.estimated_tokens
+    if isinstance(value, dict):
+        return MESSAGE_OVERHEAD_TOKENS + sum(
+            estimate_tokens(v) for k, v in value.items() if k != "cache_control"
+        )
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_tokens(item) for item in value)
+    if isinstance(value, (int, float, bool)):
+        return 1
+    if hasattr(value, "model_dump"):
+        return estimate_tokens(value.model_dump())
+    return estimate_tokens(str(value))
+
+
+def output_budget(request: Dict[str, Any]) -> int:
+    return int(request.get("max_output_tokens") or request.get("max_tokens") or 0)
+
+
+def estimate_request_tokens(request: Dict[str, Any], counter=estimate_tokens) -> int:
+    """
+    Estimates the tokens a request will consume: instructions, input messages,
+    tool schemas and the requested output budget.
+    """
+    prompt = sum(
+        counter(request.get(key))
+        for key in ("instructions", "system", "input", "messages", "tools")
+    )
+    return prompt + output_budget(request)
+
+
+def context_limit_for(model: Optional[str]) -> Optional[int]:
+    """
+    Returns the context window of a model, or None if it is unknown.
+    """
+    if not model:
+        return None
+    matches = [prefix for prefix in MODEL_CONTEXT_LIMITS if model.startswith(prefix)]
+    if not matches:
+        return None
+    return MODEL_CONTEXT_LIMITS[max(matches, key=len)]
+
+
+def _is_tool_result_message(message: Any) -> bool:
+    if not isinstance(message, dict):
+        return False
+    if message.get("type") == "function_call_output":
+        return True
+    content = message.get("content")
+    return (
+        isinstance(content, list)
+        and bool(content)
+        and all(
+            isinstance(block, dict) and block.get("type") == "tool_result"
+            for block in content
+        )
+    )
+
+
+def _starts_turn(message: Any) -> bool:
+    return (
+        isinstance(message, dict)
+        and message.get("role") == "user"
+        and not _is_tool_result_message(message)
+    )
+
+
+class TruncateToolOutputs:
+    """
+    Trimming strategy that shortens tool outputs (OpenAI ``function_call_output``
+    items and Anthropic ``tool_result`` blocks) to ``max_tokens`` each.
+    """
+
+    marker = "... [truncated]"
+
+    def __init__(self, max_tokens: int = 1000):
+        self.max_tokens = max_tokens
+
+    def _truncate(self, text: Any) -> Any:
+        if not isinstance(text, str) or estimate_tokens(text) <= self.max_tokens:
+            return text
+        return text[: self.max_tokens * CHARS_PER_TOKEN] + self.marker
+
+    def __call__(self, messages: List[Any], budget: int, counter) -> List[Any]:
+        trimmed = []
+        for message in messages:
+            if isinstance(message, dict) and message.get("type") == (
+                "function_call_output"
+            ):
+                message = {**message, "output": self._truncate(message.get("output"))}
+            elif _is_tool_result_message(message):
+                message = {
+                    **message,
+                    "content": [
+                        {**block, "content": self._truncate(block.get("content"))}
+                        for block in message["content"]
+                    ],
+                }
+            trimmed.append(message)
+        return trimmed
+
+
+class DropOldestTurns:
+    """
+    Trimming strategy that drops the oldest conversation turns until the
+    request fits. A turn starts at a user message and includes the tool calls
+    and results that follow it, so calls are never separated from their
+    results. System and developer messages are kept.
+    """
+
+    def __init__(self, keep_last: int = 1):
+        self.keep_last = keep_last
+
+    def __call__(self, messages: List[Any], budget: int, counter) -> List[Any]:
+        pinned = [
+            m
+            for m in messages
+            if isinstance(m, dict) and m.get("role") in ("system", "developer")
+        ]
+        turns = []
+        for message in messages:
+            if any(message is p for p in pinned):
+                continue
+            if not turns or _starts_turn(message):
+                turns.append([])
+            turns[-1].append(message)
+
+        total = counter(messages)
+        while len(turns) > self.keep_last and total > budget:
+            total -= counter(turns.pop(0))
+        return pinned + [message for turn in turns for message in turn]
+
+
+class ContextBudget:
+    """
+    Checks requests against the model's context window before they are sent
+    and trims the conversation when they do not fit.
+
+    Args:
+        max_context_tokens (int, optional): Context window. Defaults to the
+            limit known for the requested model (see MODEL_CONTEXT_LIMITS).
+        reserve_output_tokens (int): Tokens kept free for the answer when the
+            request does not set max_output_tokens/max_tokens.
+        strategies (Sequence[Callable], optional): Trimming strategies applied in
+            order until the request fits. Each receives the message list, the
+            remaining token budget for messages and the counter.
+        counter (Callable): Token estimator.
+    """
+
+    def __init__(
+        self,
+        max_context_tokens: Optional[int] = None,
+        reserve_output_tokens: int = 0,
+        strategies: Optional[Sequence[Callable]] = None,
+        counter: Callable[[Any], int] = estimate_tokens,
+    ):
+        self.max_context_tokens = max_context_tokens
+        self.reserve_output_tokens = reserve_output_tokens
+        self.strategies = (
+            strategies
+            if strategies is not None
+            else (TruncateToolOutputs(), DropOldestTurns())
+        )
+        self.counter = counter
+
+    def fit(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Returns the request, trimmed if necessary, so that it fits the context window.
+
+        Raises:
+            ContextWindowExceededError: If the request does not fit after trimming.
+        """
+        limit = self.max_context_tokens or context_limit_for(request.get("model"))
+        if limit is None:
+            return request
+        reserved = output_budget(request) or self.reserve_output_tokens
+        total = estimate_request_tokens(request, self.counter) - output_budget(request)
+        if total + reserved <= limit:
+            return request
+
+        key = "messages" if "messages" in request else "input"
+        messages = request.get(key)
+        if isinstance(messages, list):
+            fixed = total - self.counter(messages)
+            budget = limit - reserved - fixed
+            for strategy in self.strategies:
+                messages = strategy(messages, budget, self.counter)
+                if self.counter(messages) <= budget:
+                    return {**request, key: messages}
+
+        raise ContextWindowExceededError(
+            f"Request needs about {total} tokens plus {reserved} for output, "
+            f"but the context window of {request.get('model')} is {limit} tokens"
+        )
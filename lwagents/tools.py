@@ -1,11 +1,22 @@
+import asyncio
+import contextvars
+import functools
 import inspect
+import logging
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, get_type_hints
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple, get_type_hints
 import json
 
 from pydantic import BaseModel, Field
-import openai
 
+from lwagents.cache import LRUCache, ToolCache
+from lwagents.logs import get_logger, log_event
+from lwagents.tokens import CHARS_PER_TOKEN
+from lwagents.workers import WorkerTimeoutError, get_process_pool, run_in_thread
 from lwagents.messages import (
     AnthropicResponse,
     AnthropicToolResponse,
@@ -13,15 +24,170 @@ from lwagents.messages import (
     GPTToolResponse,
 )
 
+_logger = get_logger("tools")
+
+# (call id, tool name, arguments as a dict or raw JSON string)
+ToolCall = Tuple[str, str, Dict | str]
+
+
+# Monotonic deadline of the tool calls of the current model response
+_tool_deadline = contextvars.ContextVar("lwagents_tool_deadline", default=None)
+
 
 class ToolExecutionError(Exception):
     pass
 
 
+class ToolTimeoutError(ToolExecutionError, TimeoutError):
+    pass
+
+
+def _effective_timeout(tool_timeout: Optional[float]) -> Optional[float]:
+    """
+    Returns the time a tool call may take: the tool's own timeout, capped by
+    the remaining time of the current response's deadline.
+    """
+    deadline = _tool_deadline.get()
+    if deadline is None:
+        return tool_timeout
+    remaining = max(0.0, deadline - time.monotonic())
+    return remaining if tool_timeout is None else min(tool_timeout, remaining)
+
+
 class ToolExecutionResult(BaseModel):
     id: str
     name: str
     content: Any
+    is_error: bool = False
+    timed_out: bool = False
+    truncated: bool = False
+    # Untruncated output, kept out of the conversation
+    full_content: Any = Field(default=None, exclude=True, repr=False)
+
+
+class ToolOutputLimit:
+    """
+    Caps the size of tool outputs before they are placed in the conversation.
+
+    Tools may return iterators (e.g. generators or open files); these are
+    consumed chunk by chunk, so only the part that is shown and, with
+    keep_full, the full payload are held in memory. The elided part is
+    replaced by a short note, or by the summarizer's description of it.
+    Full payloads are not kept unless keep_full is set, and an agent then
+    holds only the max_kept most recent ones.
+
+    Args:
+        max_chars (int, optional): Maximum characters shown per output.
+        max_tokens (int, optional): Maximum estimated tokens shown per output.
+        summarizer (Callable[[str], str], optional): Describes the elided text.
+        keep_full (bool): Keep the untruncated output in the result's full_content.
+        max_kept (int): Untruncated outputs an agent keeps in tool_outputs
+            with keep_full; older ones are dropped first.
+    """
+
+    def __init__(
+        self,
+        max_chars: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        summarizer: Optional[Callable[[str], str]] = None,
+        keep_full: bool = False,
+        max_kept: int = 16,
+    ):
+        limits = [
+            limit
+            for limit in (max_chars, max_tokens and max_tokens * CHARS_PER_TOKEN)
+            if limit is not None
+        ]
+        self.max_chars = min(limits) if limits else None
+        self.summarizer = summarizer
+        self.keep_full = keep_full
+        self.max_kept = max_kept
+
+    def elision_note(self, elided_chars: int, elided_text: Optional[str]) -> str:
+        note = f"... [{elided_chars} characters elided"
+        if self.summarizer is not None and elided_text:
+            note += f": {self.summarizer(elided_text)}"
+        return note + "]"
+
+
+class _OutputCollector:
+    """Accumulates a streamed tool output under a ToolOutputLimit."""
+
+    def __init__(self, limit: Optional[ToolOutputLimit]):
+        self.limit = limit
+        self.shown = []
+        self.shown_chars = 0
+        self.elided = []
+        self.elided_chars = 0
+        self.full = []
+
+    def add(self, chunk: Any) -> None:
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode("utf-8", errors="replace")
+        elif not isinstance(chunk, str):
+            chunk = str(chunk)
+        max_chars = self.limit.max_chars if self.limit else None
+        if max_chars is None:
+            self.shown.append(chunk)
+            return
+        if self.limit.keep_full:
+            self.full.append(chunk)
+        room = max_chars - self.shown_chars
+        if room > 0:
+            self.shown.append(chunk[:room])
+            self.shown_chars += min(room, len(chunk))
+            chunk = chunk[room:]
+        if chunk:
+            self.elided_chars += len(chunk)
+            if self.limit.summarizer is not None:
+                self.elided.append(chunk)
+
+    def result(self) -> Tuple[Any, Any, bool]:
+        content = "".join(self.shown)
+        if not self.elided_chars:
+            return content, None, False
+        elided_text = "".join(self.elided) if self.elided else None
+        content += self.limit.elision_note(self.elided_chars, elided_text)
+        return content, "".join(self.full) if self.full else None, True
+
+
+def collect_output(output: Any, limit: Optional[ToolOutputLimit] = None):
+    """
+    Applies an output limit to a tool output, consuming iterators incrementally.
+
+    Returns:
+        Tuple[Any, Any, bool]: The content to show, the full output if it was
+        truncated and kept, and whether it was truncated. Outputs within the
+        limit are returned unchanged, except that iterators are joined into a string.
+    """
+    if isinstance(output, Iterator):
+        collector = _OutputCollector(limit)
+        for chunk in output:
+            collector.add(chunk)
+        return collector.result()
+    if isinstance(output, AsyncIterator):
+        return asyncio.run(acollect_output(output, limit))
+    if limit is None or limit.max_chars is None or output is None:
+        return output, None, False
+    text = output if isinstance(output, str) else str(output)
+    if len(text) <= limit.max_chars:
+        return output, None, False
+    collector = _OutputCollector(limit)
+    collector.add(text)
+    content, _, truncated = collector.result()
+    return content, output if limit.keep_full else None, truncated
+
+
+async def acollect_output(output: Any, limit: Optional[ToolOutputLimit] = None):
+    """
+    Async counterpart of collect_output that also consumes async iterators.
+    """
+    if not isinstance(output, AsyncIterator):
+        return collect_output(output, limit)
+    collector = _OutputCollector(limit)
+    async for chunk in output:
+        collector.add(chunk)
+    return collector.result()
 
 
 class ToolsExecutionResults(BaseModel):
@@ -29,16 +195,28 @@ class ToolsExecutionResults(BaseModel):
 
 
 class BaseTool(ABC):
+    is_async: bool = False
+
     @abstractmethod
     def execute(self, *args, **kwargs):
         """Execute the tool with the given arguments."""
         pass
 
+    async def aexecute(self, *args, **kwargs):
+        """Execute the tool from async code without blocking the event loop."""
+        return await asyncio.to_thread(self.execute, *args, **kwargs)
+
+    def execute_json(self, arguments: str):
+        """Execute the tool with arguments given as a JSON object string."""
+        return self.execute(**(json.loads(arguments) if arguments else {}))
+
+    async def aexecute_json(self, arguments: str):
+        return await self.aexecute(**(json.loads(arguments) if arguments else {}))
 
-def Tool(func):
+
+def _function_schema(func) -> type[BaseModel]:
     """
-    Decorator to create a tool based on a function.
-    Automatically generates a schema for the tool using Pydantic.
+    Builds the pydantic model validating the arguments of a tool function.
     """
     # Generate the schema dynamically
     signature = inspect.signature(func)
@@ -60,7 +238,7 @@ def Tool(func):
         annotations[param_name] = param_type
 
     # Dynamically create a Pydantic model for the tool's schema
-    ToolSchema = type(
+    return type(
         f"{func.__name__}",
         (BaseModel,),
         {
@@ -69,17 +247,235 @@ def Tool(func):
         },
     )
 
+
+def Tool(
+    func=None,
+    *,
+    cache: bool | ToolCache | None = None,
+    executor: str = "thread",
+    timeout: Optional[float] = None,
+):
+    """
+    Decorator to create a tool based on a function.
+    Automatically generates a schema for the tool using Pydantic.
+
+    Both regular and ``async def`` functions are supported. Async tools are
+    awaited natively by ``aexecute``; sync tools called through ``aexecute``
+    run in a worker thread. Generator tools stream their output; agents
+    consume it chunk by chunk (see ToolOutputLimit).
+
+    Args:
+        cache (bool | ToolCache, optional): Memoizes results keyed on the
+            validated arguments. True uses an in-process LRUCache; pass an
+            LRUCache or DiskCache instance to configure size, TTL or backend.
+        executor (str): "thread" runs the function in the calling thread.
+            "process" runs it in the shared pool of warm worker processes
+            (see lwagents.workers), for CPU-bound tools. Process tools must be
+            defined at module level, and their arguments and results must be
+            picklable.
+        timeout (float, optional): Seconds a call may take before it fails with
+            ToolTimeoutError. Async tools are cancelled and process tools are
+            killed; a sync thread tool cannot be interrupted, so its call is
+            abandoned and its result discarded.
+
+    Example:
+        @Tool(cache=LRUCache(max_entries=256, ttl=600))
+        def lookup(city: str) -> str:
+            ...
+    """
+    if func is None:
+        return lambda f: Tool(f, cache=cache, executor=executor, timeout=timeout)
+    if executor not in ("thread", "process"):
+        raise ValueError(f"Unknown tool executor: {executor}")
+    if executor == "process" and (
+        inspect.iscoroutinefunction(func) or "<locals>" in func.__qualname__
+    ):
+        raise ValueError(
+            f"Tool {func.__name__} cannot use the process executor: it must be "
+            "a synchronous function defined at module level"
+        )
+    if cache is True:
+        cache = LRUCache()
+    elif cache is False:
+        cache = None
+    if cache is not None and (
+        inspect.isgeneratorfunction(func) or inspect.isasyncgenfunction(func)
+    ):
+        raise ValueError(
+            f"Tool {func.__name__} streams its output and cannot be cached"
+        )
+
     # Define the tool class
     class FunctionTool(BaseTool):
-        schema = ToolSchema
+        name = func.__name__
+        is_async = inspect.iscoroutinefunction(func)
+        executor_kind = executor
+        timeout_seconds = timeout
 
         def __init__(self):
             self._function = func
+            self._provider_schemas = {}
+            self._cache = cache
+            self.cache_hits = 0
+            self.cache_misses = 0
+            # Lookups run concurrently in the parallel tool executor
+            self._stats_lock = threading.Lock()
+
+        @functools.cached_property
+        def schema(self) -> type[BaseModel]:
+            # Built on first use, so defining a tool stays cheap at import time
+            return _function_schema(func)
+
+        def provider_schema(self, provider: str) -> Dict:
+            """
+            Returns the tool definition in the given provider's format,
+            building it on first use.
+            """
+            provider_schema = self._provider_schemas.get(provider)
+            if provider_schema is None:
+                provider_schema = _PROVIDER_SCHEMA_BUILDERS[provider](self.schema)
+                self._provider_schemas[provider] = provider_schema
+            return provider_schema
+
+        def _cache_key(self, validated_args: BaseModel) -> str:
+            arguments = json.dumps(
+                validated_args.model_dump(mode="json"), sort_keys=True, default=str
+            )
+            return f"{func.__module__}.{func.__qualname__}:{arguments}"
+
+        def _cache_lookup(self, validated_args: BaseModel):
+            key = self._cache_key(validated_args)
+            hit, value = self._cache.get(key)
+            with self._stats_lock:
+                if hit:
+                    self.cache_hits += 1
+                else:
+                    self.cache_misses += 1
+            return key, hit, value
+
+        def _cache_store(self, key: str, value: Any) -> None:
+            # An iterator is exhausted after its first use, so a cache hit
+            # would hand out an empty result
+            if isinstance(value, (Iterator, AsyncIterator)):
+                return
+            self._cache.set(key, value)
+
+        def _timeout_error(self, timeout: float) -> ToolTimeoutError:
+            return ToolTimeoutError(
+                f"Tool {func.__name__} timed out after {timeout:.3g} seconds"
+            )
+
+        def _invoke(self, arguments: Dict[str, Any]):
+            timeout = _effective_timeout(self.timeout_seconds)
+            if self.executor_kind == "process":
+                try:
+                    return get_process_pool().run(
+                        func.__module__, func.__qualname__, arguments, timeout=timeout
+                    )
+                except WorkerTimeoutError:
+                    raise self._timeout_error(timeout) from None
+            if self.is_async:
+                try:
+                    asyncio.get_running_loop()
+                except RuntimeError:
+                    return asyncio.run(self._ainvoke(arguments))
+                raise ToolExecutionError(
+                    f"Async tool {func.__name__} cannot be executed synchronously "
+                    "inside a running event loop, use aexecute() instead"
+                )
+            if timeout is None:
+                return self._function(**arguments)
+            future = run_in_thread(self._function, **arguments)
+            try:
+                return future.result(timeout=timeout)
+            except TimeoutError:
+                raise self._timeout_error(timeout) from None
+
+        async def _ainvoke(self, arguments: Dict[str, Any]):
+            if not self.is_async:
+                return await asyncio.to_thread(self._invoke, arguments)
+            timeout = _effective_timeout(self.timeout_seconds)
+            try:
+                # wait_for cancels the coroutine when the timeout expires
+                return await asyncio.wait_for(self._function(**arguments), timeout)
+            except TimeoutError:
+                raise self._timeout_error(timeout) from None
+
+        # Field values are passed straight from the validated model's
+        # __dict__, without dumping the model back to a dict first
+        def _execute_validated(self, validated_args: BaseModel):
+            if self._cache is None:
+                return self._invoke(validated_args.__dict__)
+            key, hit, value = self._cache_lookup(validated_args)
+            if hit:
+                return value
+            value = self._invoke(validated_args.__dict__)
+            self._cache_store(key, value)
+            return value
+
+        async def _aexecute_validated(self, validated_args: BaseModel):
+            if self._cache is None:
+                return await self._ainvoke(validated_args.__dict__)
+            key, hit, value = self._cache_lookup(validated_args)
+            if hit:
+                return value
+            value = await self._ainvoke(validated_args.__dict__)
+            self._cache_store(key, value)
+            return value
 
         def execute(self, **kwargs):
             # Validate input arguments using the generated schema
-            validated_args = self.schema(**kwargs)
-            return self._function(**validated_args.dict())
+            return self._execute_validated(self.schema.model_validate(kwargs))
+
+        def execute_json(self, arguments: str):
+            # Parse and validate the raw JSON arguments in a single pass
+            return self._execute_validated(
+                self.schema.model_validate_json(arguments or "{}")
+            )
+
+        def execute_trusted(self, **kwargs):
+            """
+            Executes the tool without validating the arguments. Only for
+            internal callers whose arguments already match the schema.
+            """
+            if self._cache is None:
+                return self._invoke(kwargs)
+            return self._execute_validated(self.schema.model_construct(**kwargs))
+
+        async def aexecute(self, **kwargs):
+            return await self._aexecute_validated(self.schema.model_validate(kwargs))
+
+        async def aexecute_json(self, arguments: str):
+            return await self._aexecute_validated(
+                self.schema.model_validate_json(arguments or "{}")
+            )
+
+        def cache_info(self) -> Dict[str, Any]:
+            """
+            Returns the hit/miss statistics of this tool's result cache.
+            """
+            with self._stats_lock:
+                hits, misses = self.cache_hits, self.cache_misses
+            return {
+                "hits": hits,
+                "misses": misses,
+                "entries": len(self._cache) if self._cache is not None else 0,
+                "evictions": self._cache.evictions if self._cache is not None else 0,
+            }
+
+        def cache_invalidate(self, **kwargs) -> None:
+            """
+            Removes the cached result for the given arguments.
+            """
+            if self._cache is not None:
+                self._cache.invalidate(self._cache_key(self.schema(**kwargs)))
+
+        def cache_clear(self) -> None:
+            """
+            Removes all cached results of the cache backing this tool.
+            """
+            if self._cache is not None:
+                self._cache.clear()
 
     FunctionTool.__name__ = (
         func.__name__
@@ -88,209 +484,537 @@ def Tool(func):
     return FunctionTool()
 
 
+def _function_definition(tool_schema: type[BaseModel]) -> Dict:
+    """
+    Builds a strict function definition from a tool schema, in the format of
+    openai.pydantic_function_tool but without importing the SDK.
+    """
+    parameters = tool_schema.model_json_schema()
+    properties = parameters.get("properties", {})
+    function_def = {
+        "name": tool_schema.__name__,
+        "strict": True,
+        "parameters": {
+            "type": "object",
+            "properties": properties,
+            # Strict mode requires every property to be listed
+            "required": list(properties),
+            "additionalProperties": False,
+        },
+    }
+    if tool_schema.__doc__:
+        function_def["description"] = tool_schema.__doc__
+    return {"type": "function", "function": function_def}
+
+
+def _gpt_tool_schema(tool_schema: type[BaseModel]) -> Dict:
+    """
+    Builds the OpenAI Responses API tool definition for a tool schema.
+    """
+    model_tool = _function_definition(tool_schema)
+
+    # Extract the function definition from the pydantic tool format
+    function_def = model_tool["function"]
+
+    # Transform properties to remove 'title' and 'additionalProperties'
+    simplified_properties = {}
+    for param_name, param_schema in function_def["parameters"]["properties"].items():
+        simplified_properties[param_name] = {"type": param_schema["type"]}
+        # Add description if available (using title as description if present)
+        if "title" in param_schema and param_schema["title"] != param_name:
+            simplified_properties[param_name]["description"] = param_schema["title"]
+
+    # Create simplified tool format
+    return {
+        "type": "function",
+        "name": function_def["name"],
+        "description": function_def.get("description", function_def["name"]),
+        "parameters": {
+            "type": "object",
+            "properties": simplified_properties,
+            "required": function_def["parameters"].get("required", []),
+        },
+    }
+
+
+def _anthropic_tool_schema(tool_schema: type[BaseModel]) -> Dict:
+    """
+    Builds the Anthropic Messages API tool definition for a tool schema.
+    """
+    model_tool = _function_definition(tool_schema)
+
+    model_tool_function = model_tool["function"]
+    model_tool_function_params = model_tool_function["parameters"]["properties"]
+
+    # Transform properties to remove 'title' and keep only type and description
+    anthropic_properties = {}
+    for param_name, param_schema in model_tool_function_params.items():
+        anthropic_properties[param_name] = {
+            "type": param_schema["type"],
+        }
+        # Add description if it exists (title can serve as description)
+        if "title" in param_schema:
+            anthropic_properties[param_name]["description"] = param_schema["title"]
+
+    return {
+        "name": model_tool_function["name"],
+        "description": model_tool_function.get(
+            "description", model_tool_function["name"]
+        ),
+        "input_schema": {
+            "type": model_tool_function["parameters"]["type"],
+            "properties": anthropic_properties,
+            "required": model_tool_function["parameters"].get("required", []),
+        },
+    }
+
+
+_PROVIDER_SCHEMA_BUILDERS = {
+    "openai": _gpt_tool_schema,
+    "anthropic": _anthropic_tool_schema,
+}
+
+
 class ToolUtility:
-    @staticmethod
-    def get_tools_info_gpt(tools: Dict[str, callable]) -> List[Dict]:
+    max_parallel_tools: int = 8
+    # Seconds past a response deadline before unresponsive calls are abandoned
+    deadline_grace: float = 0.05
+
+    # Assembled tool lists keyed by provider and the identity of the tools.
+    _tool_lists: Dict[tuple, List[Dict]] = {}
+    _max_cached_tool_lists = 256
+
+    @classmethod
+    def _get_tools_info(cls, tools: Dict[str, callable], provider: str) -> List[Dict]:
+        key = (provider, tuple(tools.values()))
+        model_tools = cls._tool_lists.get(key)
+        if model_tools is None:
+            model_tools = [tool.provider_schema(provider) for tool in tools.values()]
+            if len(cls._tool_lists) >= cls._max_cached_tool_lists:
+                cls._tool_lists.clear()
+            cls._tool_lists[key] = model_tools
+        return model_tools
+
+    @classmethod
+    def get_tools_info_gpt(cls, tools: Dict[str, callable]) -> List[Dict]:
         """
         Extracts and returns the schema information of the provided tools.
 
+        Schemas are built once per tool and the assembled list is memoized per
+        tool set, so the returned list must be treated as read-only.
+
         Args:
-            tools (Dict[str, callable]): A dictionary of tool names to their callable implementations.
+            tools (Dict[str, callable]): A dictionary of tool names to their
+                callable implementations.
 
         Returns:
             List[Dict]: A list of tool schemas in OpenAI-compatible format.
         """
-        model_tools = []
-        for tool in tools:
-            func = tools[tool]
-            tool_schema = func.schema
-            model_tool = openai.pydantic_function_tool(tool_schema)
-
-            # Extract the function definition from the pydantic tool format
-            function_def = model_tool["function"]
-
-            # Transform properties to remove 'title' and 'additionalProperties'
-            simplified_properties = {}
-            for param_name, param_schema in function_def["parameters"][
-                "properties"
-            ].items():
-                simplified_properties[param_name] = {"type": param_schema["type"]}
-                # Add description if available (using title as description if present)
-                if "title" in param_schema and param_schema["title"] != param_name:
-                    simplified_properties[param_name]["description"] = param_schema[
-                        "title"
-                    ]
-
-            # Create simplified tool format
-            simplified_tool = {
-                "type": "function",
-                "name": function_def["name"],
-                "description": function_def.get("description", function_def["name"]),
-                "parameters": {
-                    "type": "object",
-                    "properties": simplified_properties,
-                    "required": function_def["parameters"].get("required", []),
-                },
-            }
+        return cls._get_tools_info(tools, "openai")
 
-            model_tools.append(simplified_tool)
-        return model_tools
+    @classmethod
+    def get_tools_info_anthropic(cls, tools: Dict[str, callable]) -> List[Dict]:
+        """
+        Extracts and returns the schema information of the provided tools.
+
+        Schemas are built once per tool and the assembled list is memoized per
+        tool set, so the returned list must be treated as read-only.
+
+        Args:
+            tools (Dict[str, callable]): A dictionary of tool names to their
+                callable implementations.
+
+        Returns:
+            List[Dict]: A list of tool schemas in Anthropic-compatible format.
+        """
+        return cls._get_tools_info(tools, "anthropic")
+
+    @staticmethod
+    def _run_tool_call(
+        tool: BaseTool,
+        tool_call_id: str,
+        tool_name: str,
+        tool_args: Dict | str,
+        output_limit: Optional[ToolOutputLimit] = None,
+    ) -> ToolExecutionResult:
+        started = time.perf_counter()
+        try:
+            if isinstance(tool_args, str):
+                output = tool.execute_json(tool_args)
+            else:
+                output = tool.execute(**tool_args)
+            content, full_content, truncated = collect_output(output, output_limit)
+        except Exception as error:
+            return ToolUtility._error_result(tool_call_id, tool_name, error)
+        if _logger.isEnabledFor(logging.DEBUG):
+            ToolUtility._log_call(tool_call_id, tool_name, started, truncated)
+        return ToolExecutionResult(
+            id=tool_call_id,
+            name=tool_name,
+            content=content,
+            truncated=truncated,
+            full_content=full_content,
+        )
+
+    @staticmethod
+    async def _arun_tool_call(
+        tool: BaseTool,
+        tool_call_id: str,
+        tool_name: str,
+        tool_args: Dict | str,
+        output_limit: Optional[ToolOutputLimit] = None,
+    ) -> ToolExecutionResult:
+        started = time.perf_counter()
+        try:
+            if isinstance(tool_args, str):
+                output = await tool.aexecute_json(tool_args)
+            else:
+                output = await tool.aexecute(**tool_args)
+            content, full_content, truncated = await acollect_output(
+                output, output_limit
+            )
+        except Exception as error:
+            return ToolUtility._error_result(tool_call_id, tool_name, error)
+        if _logger.isEnabledFor(logging.DEBUG):
+            ToolUtility._log_call(tool_call_id, tool_name, started, truncated)
+        return ToolExecutionResult(
+            id=tool_call_id,
+            name=tool_name,
+            content=content,
+            truncated=truncated,
+            full_content=full_content,
+        )
+
+    @staticmethod
+    def _log_call(
+        tool_call_id: str, tool_name: str, started: float, truncated: bool
+    ) -> None:
+        duration = time.perf_counter() - started
+        log_event(
+            _logger,
+            logging.DEBUG,
+            "tool.call",
+            "Tool %s finished in %.3f s",
+            tool_name,
+            duration,
+            tool=tool_name,
+            call_id=tool_call_id,
+            duration=duration,
+            truncated=truncated,
+        )
 
     @staticmethod
-    def get_tools_info_anthropic(tools: Dict[str, callable]) -> List[BaseModel]:
+    def _error_result(
+        tool_call_id: str, tool_name: str, error: Exception
+    ) -> ToolExecutionResult:
+        timed_out = isinstance(error, TimeoutError)
+        log_event(
+            _logger,
+            logging.WARNING,
+            "tool.timeout" if timed_out else "tool.error",
+            "Tool %s failed: %s: %s",
+            tool_name,
+            type(error).__name__,
+            error,
+            tool=tool_name,
+            call_id=tool_call_id,
+            error=type(error).__name__,
+        )
+        return ToolExecutionResult(
+            id=tool_call_id,
+            name=tool_name,
+            content=f"{type(error).__name__}: {error}",
+            is_error=True,
+            timed_out=timed_out,
+        )
+
+    @staticmethod
+    def _timeout_result(
+        tool_call_id: str, tool_name: str, timeout: float
+    ) -> ToolExecutionResult:
+        return ToolUtility._error_result(
+            tool_call_id,
+            tool_name,
+            ToolTimeoutError(f"Tool {tool_name} timed out after {timeout:.3g} seconds"),
+        )
+
+    @staticmethod
+    def _check_tools_exist(tool_calls: List[ToolCall], tools: dict):
+        for _, tool_name, _ in tool_calls:
+            if tool_name not in tools:
+                raise ToolExecutionError(f"Tool {tool_name} not found!")
+
+    @classmethod
+    def execute_tool_calls(
+        cls,
+        tool_calls: List[ToolCall],
+        tools: dict,
+        max_parallelism: Optional[int] = None,
+        timeout: Optional[float] = None,
+        output_limit: Optional[ToolOutputLimit] = None,
+    ) -> List[ToolExecutionResult]:
         """
-        Extracts and returns the schema information of the provided tools.
+        Executes tool calls concurrently in a thread pool.
+
+        A failing tool does not affect the others: its exception is captured
+        in a result with is_error set. Calls still running when the timeout
+        expires yield a result with timed_out set.
 
         Args:
-            tools (Dict[str, callable]): A dictionary of tool names to their callable implementations.
+            tool_calls (List[ToolCall]): (call id, tool name, arguments) triples.
+                Arguments may be a dict or a raw JSON string.
+            tools (dict): Dictionary of tool names to tool instances.
+            max_parallelism (int, optional): Maximum number of tools running at
+                once. Defaults to ToolUtility.max_parallel_tools.
+            timeout (float, optional): Seconds all calls together may take.
+            output_limit (ToolOutputLimit, optional): Size cap for each output.
 
         Returns:
-            List[BaseModel]: A list of Pydantic models representing the tools' schemas.
+            List[ToolExecutionResult]: The results, in the order of tool_calls.
         """
-        model_tools = []
-        for tool in tools:
-            func = tools[tool]
-            tool_schema = func.schema
-            model_tool = openai.pydantic_function_tool(tool_schema)
-
-            model_tool_function = model_tool["function"]
-            model_tool_function_params = model_tool_function["parameters"]["properties"]
-
-            # Transform properties to remove 'title' and keep only type and description
-            anthropic_properties = {}
-            for param_name, param_schema in model_tool_function_params.items():
-                anthropic_properties[param_name] = {
-                    "type": param_schema["type"],
-                }
-                # Add description if it exists (title can serve as description)
-                if "title" in param_schema:
-                    anthropic_properties[param_name]["description"] = param_schema[
-                        "title"
-                    ]
-
-            anthropic_tool = {
-                "name": model_tool_function["name"],
-                "description": model_tool_function.get(
-                    "description", model_tool_function["name"]
-                ),
-                "input_schema": {
-                    "type": model_tool_function["parameters"]["type"],
-                    "properties": anthropic_properties,
-                    "required": model_tool_function["parameters"].get("required", []),
-                },
-            }
+        cls._check_tools_exist(tool_calls, tools)
+        max_parallelism = max_parallelism or cls.max_parallel_tools
+        context = contextvars.copy_context()
+        deadline = None
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+            context.run(_tool_deadline.set, deadline)
+
+        if len(tool_calls) <= 1 or max_parallelism <= 1:
+            return [
+                context.run(
+                    cls._run_tool_call, tools[name], call_id, name, args, output_limit
+                )
+                for call_id, name, args in tool_calls
+            ]
 
-            model_tools.append(anthropic_tool)
-        return model_tools
+        executor = ThreadPoolExecutor(
+            max_workers=min(len(tool_calls), max_parallelism),
+            thread_name_prefix="lwagents-tool",
+        )
+        try:
+            futures = [
+                executor.submit(
+                    context.copy().run,
+                    cls._run_tool_call,
+                    tools[name],
+                    call_id,
+                    name,
+                    args,
+                    output_limit,
+                )
+                for call_id, name, args in tool_calls
+            ]
+            wait_timeout = None
+            if deadline is not None:
+                # Tools enforce the deadline themselves; the wait only
+                # catches tools that do not
+                remaining = max(0.0, deadline - time.monotonic())
+                wait_timeout = remaining + cls.deadline_grace
+            wait(futures, timeout=wait_timeout)
+            return [
+                (
+                    future.result()
+                    if future.done()
+                    else cls._timeout_result(call_id, name, timeout)
+                )
+                for future, (call_id, name, _) in zip(futures, tool_calls)
+            ]
+        finally:
+            # Do not wait for abandoned calls once the deadline has passed
+            executor.shutdown(wait=deadline is None, cancel_futures=True)
 
     @classmethod
-    def execute_from_response(cls, tool_response: Any, tools: dict) -> Any:
+    async def aexecute_tool_calls(
+        cls,
+        tool_calls: List[ToolCall],
+        tools: dict,
+        max_parallelism: Optional[int] = None,
+        timeout: Optional[float] = None,
+        output_limit: Optional[ToolOutputLimit] = None,
+    ) -> List[ToolExecutionResult]:
+        """
+        Async counterpart of execute_tool_calls. Async tools are awaited on
+        the running loop, sync tools run in worker threads.
+        """
+        cls._check_tools_exist(tool_calls, tools)
+        semaphore = asyncio.Semaphore(max_parallelism or cls.max_parallel_tools)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        async def run(call_id, name, args):
+            async with semaphore:
+                call = cls._arun_tool_call(
+                    tools[name], call_id, name, args, output_limit
+                )
+                if deadline is None:
+                    return await call
+                # Each gathered call runs in its own task and context
+                _tool_deadline.set(deadline)
+                remaining = max(0.0, deadline - time.monotonic())
+                try:
+                    return await asyncio.wait_for(call, remaining + cls.deadline_grace)
+                except TimeoutError:
+                    return cls._timeout_result(call_id, name, timeout)
+
+        return list(
+            await asyncio.gather(
+                *(run(call_id, name, args) for call_id, name, args in tool_calls)
+            )
+        )
+
+    @staticmethod
+    def _gpt_tool_calls(response: Any) -> Optional[List[ToolCall]]:
+        """
+        Extracts the function calls of an OpenAI Responses API response.
+        """
+        # The tool response is the OpenAI Response object with output items
+        response_content = getattr(response, "tool_response", None)
+        if not hasattr(response_content, "output"):
+            return None
+        return [
+            # Outputs are matched to calls by call_id, not the item id
+            (getattr(item, "call_id", None) or item.id, item.name, item.arguments)
+            for item in response_content.output
+            if getattr(item, "type", None) == "function_call"
+        ]
+
+    @staticmethod
+    def _anthropic_tool_calls(response: Any) -> Optional[List[ToolCall]]:
+        """
+        Extracts the tool_use blocks of an Anthropic Messages API response.
+        """
+        if response.tool_response.stop_reason != "tool_use":
+            return None
+        return [
+            (c.id, c.name, c.input or {})
+            for c in response.tool_response.content
+            if c.type == "tool_use"
+        ]
+
+    @classmethod
+    def execute_from_response(
+        cls,
+        tool_response: Any,
+        tools: dict,
+        max_parallelism: Optional[int] = None,
+        timeout: Optional[float] = None,
+        output_limit: Optional[ToolOutputLimit] = None,
+    ) -> Any:
+        """
+        Executes the tool calls requested in a model response.
+
+        Args:
+            tool_response (LLMToolResponse): The model response.
+            tools (dict): Dictionary of tool names to tool instances.
+            max_parallelism (int, optional): Maximum number of tools running at once.
+            timeout (float, optional): Seconds all tool calls of the response may take.
+            output_limit (ToolOutputLimit, optional): Size cap for each tool output.
+
+        Returns:
+            ToolsExecutionResults with executed tool results or None
+        """
         if type(tool_response.results) == GPTToolResponse:
             return cls.execute_gpt_tools_from_response(
-                response=tool_response.results, tools=tools
+                response=tool_response.results,
+                tools=tools,
+                max_parallelism=max_parallelism,
+                timeout=timeout,
+                output_limit=output_limit,
             )
         elif type(tool_response.results) == AnthropicToolResponse:
             return cls.execute_anthropic_tools_from_response(
-                response=tool_response.results, tools=tools
+                response=tool_response.results,
+                tools=tools,
+                max_parallelism=max_parallelism,
+                timeout=timeout,
+                output_limit=output_limit,
             )
         else:
             raise ValueError("Unsupported response type")
 
     @classmethod
-    def execute_gpt_tools_from_response(cls, response: Any, tools: dict) -> Any:
+    def execute_gpt_tools_from_response(
+        cls,
+        response: Any,
+        tools: dict,
+        max_parallelism: Optional[int] = None,
+        timeout: Optional[float] = None,
+        output_limit: Optional[ToolOutputLimit] = None,
+    ) -> Any:
         """
         Execute tools from OpenAI Responses API format.
 
         Args:
-            response: LLMResponse object containing the OpenAI response
+            response: GPTToolResponse containing the OpenAI response
             tools: Dictionary of tool names to tool instances
+            max_parallelism: Maximum number of tools running at once
+            timeout: Seconds all tool calls of the response may take
+            output_limit: Size cap for each tool output
 
         Returns:
             ToolsExecutionResults with executed tool results or None
         """
-        tool_results = []
-
-        # Handle new OpenAI Responses API format (response.output)
-        if hasattr(response, "tool_response"):
-            # This is an LLMResponse wrapping a GPTResponse
-            # We need to check if it's a string (text response) or has output items
-            response_content = response.tool_response
-            # Check if it's an OpenAI Response object with output
-            if hasattr(response_content, "output"):
-                for item in response_content.output:
-                    if hasattr(item, "type") and item.type == "function_call":
-                        tool_call = item
-                        tool_name = tool_call.name
-                        tool_args = json.loads(tool_call.arguments)
-
-                        if tool_name in tools:
-                            if tool_args:
-                                function_response = tools[tool_name].execute(
-                                    **tool_args
-                                )
-                            else:
-                                function_response = tools[tool_name].execute()
-
-                            tool_result = ToolExecutionResult(
-                                id=tool_call.id,
-                                name=tool_name,
-                                content=function_response,
-                            )
-                            tool_results.append(tool_result)
-                        else:
-                            raise ToolExecutionError(f"Tool {tool_name} not found!")
-
-                return (
-                    ToolsExecutionResults(results=tool_results)
-                    if tool_results
-                    else None
-                )
+        tool_calls = cls._gpt_tool_calls(response)
+        if not tool_calls:
+            return None
+        return ToolsExecutionResults(
+            results=cls.execute_tool_calls(
+                tool_calls,
+                tools,
+                max_parallelism=max_parallelism,
+                timeout=timeout,
+                output_limit=output_limit,
+            )
+        )
 
-        # Handle legacy format (response.tool_calls) for backwards compatibility
-        # if hasattr(response, 'tool_calls') and response.tool_calls:
-        #     for tool_call in response.tool_calls:
-        #         tool_name = tool_call.function.name
-        #         tool_args = json.loads(tool_call.function.arguments)
-        #         if tool_name in tools:
-        #             if tool_args:
-        #                 tool_results.append(tools[tool_name].execute(**tool_args))
-        #             else:
-        #                 tool_results.append(tools[tool_name].execute())
-        #         else:
-        #             raise ToolExecutionError(f"Tool {tool_name} not found!")
-        #     return ToolsExecutionResults(results=tool_results)
-
-        # return None
+    @classmethod
+    def execute_anthropic_tools_from_response(
+        cls,
+        response: Any,
+        tools: dict,
+        max_parallelism: Optional[int] = None,
+        timeout: Optional[float] = None,
+        output_limit: Optional[ToolOutputLimit] = None,
+    ) -> Any:
+        tool_calls = cls._anthropic_tool_calls(response)
+        if tool_calls is None:
+            return None
+        return ToolsExecutionResults(
+            results=cls.execute_tool_calls(
+                tool_calls,
+                tools,
+                max_parallelism=max_parallelism,
+                timeout=timeout,
+                output_limit=output_limit,
+            )
+        )
 
     @classmethod
-    def execute_anthropic_tools_from_response(cls, response: Any, tools: dict) -> Any:
-        tool_results = []
-        if response.tool_response.stop_reason == "tool_use":
-            for c in response.tool_response.content:
-                if c.type == "tool_use":
-                    tool_name = c.name
-                    tool_args = c.input
-
-                    if tool_name in tools:
-                        if tool_args:
-                            function_response = tools[tool_name].execute(**tool_args)
-                            tool_result = ToolExecutionResult(
-                                id=c.id,
-                                name=tool_name,
-                                content=function_response,
-                            )
-                            tool_results.append(tool_result)
-                        else:
-                            function_response = tools[tool_name].execute()
-                            tool_result = ToolExecutionResult(
-                                id=c.id,
-                                name=tool_name,
-                                content=function_response,
-                            )
-                            tool_results.append(tool_result)
-                    else:
-                        raise ToolExecutionError(f"Tool {tool_name} not found!")
-
-            return ToolsExecutionResults(results=tool_results)
+    async def aexecute_from_response(
+        cls,
+        tool_response: Any,
+        tools: dict,
+        max_parallelism: Optional[int] = None,
+        timeout: Optional[float] = None,
+        output_limit: Optional[ToolOutputLimit] = None,
+    ) -> Any:
+        """
+        Async counterpart of execute_from_response.
+        """
+        if type(tool_response.results) == GPTToolResponse:
+            tool_calls = cls._gpt_tool_calls(tool_response.results) or None
+        elif type(tool_response.results) == AnthropicToolResponse:
+            tool_calls = cls._anthropic_tool_calls(tool_response.results)
         else:
+            raise ValueError("Unsupported response type")
+        if tool_calls is None:
             return None
+        return ToolsExecutionResults(
+            results=await cls.aexecute_tool_calls(
+                tool_calls,
+                tools,
+                max_parallelism=max_parallelism,
+                timeout=timeout,
+                output_limit=output_limit,
+            )
+        )
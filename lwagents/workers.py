@@ -0,0 +1,266 @@
+import atexit
+import contextvars
+import importlib
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Optional
+
+
+class WorkerError(Exception):
+    pass
+
+
+class WorkerTimeoutError(WorkerError, TimeoutError):
+    pass
+
+
+def run_in_thread(func, *args, **kwargs) -> Future:
+    """
+    Runs func in a daemon thread, preserving the caller's context variables
+    (e.g. the request priority), and returns a Future for its result.
+    Unlike a thread pool, a call that never returns does not hold up others.
+    """
+    future = Future()
+    context = contextvars.copy_context()
+
+    def runner():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(context.run(func, *args, **kwargs))
+        except BaseException as error:
+            future.set_exception(error)
+
+    threading.Thread(target=runner, daemon=True).start()
+    return future
+
+
+def resolve_function(module_name: str, qualname: str):
+    """
+    Imports a function by module and qualified name. Tools are unwrapped to
+    the function they were created from.
+    """
+    target = importlib.import_module(module_name)
+    for attribute in qualname.split("."):
+        target = getattr(target, attribute)
+    return getattr(target, "_function", target)
+
+
+def _worker_main(connection) -> None:
+    functions = {}
+    while True:
+        try:
+            message = connection.recv()
+        except (EOFError, OSError):
+            return
+        if message is None:
+            return
+        module_name, qualname, arguments = message
+        try:
+            function = functions.get((module_name, qualname))
+            if function is None:
+                function = resolve_function(module_name, qualname)
+                functions[(module_name, qualname)] = function
+            reply = (True, function(**arguments))
+        except BaseException as error:
+            reply = (False, error)
+        try:
+            connection.send(reply)
+        except Exception as error:
+            connection.send((False, WorkerError(f"Result could not be sent: {error}")))
+
+
+class _Worker:
+    def __init__(self, context):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_connection,), daemon=True
+        )
+        self.process.start()
+        child_connection.close()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+    def stop(self) -> None:
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.kill()
+
+
+class ProcessWorkerPool:
+    """
+    Pool of warm worker processes that run tool functions outside the
+    caller's interpreter, so CPU-bound tools do not hold its GIL.
+
+    Functions are sent by module and qualified name and imported once per
+    worker; arguments and results travel pickled over a pipe.
+
+    Workers are started with "forkserver" where available and "spawn"
+    elsewhere, not forked from the caller: workers are started and replaced
+    from tool threads, and a forked child could inherit locks other threads
+    hold. As with any spawned process, a script defining process tools must
+    guard its entry point with ``if __name__ == "__main__":``.
+
+    Args:
+        max_workers (int, optional): Number of workers. Defaults to the CPU count.
+        start_method (str, optional): multiprocessing start method. Defaults
+            to "forkserver", or "spawn" where that is unavailable.
+        warm (bool): Start all workers immediately instead of on first use.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        start_method: Optional[str] = None,
+        warm: bool = True,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        if start_method is None:
+            start_method = (
+                "forkserver"
+                if "forkserver" in multiprocessing.get_all_start_methods()
+                else "spawn"
+            )
+        self._context = multiprocessing.get_context(start_method)
+        self._idle = queue.LifoQueue()
+        self._started = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        if warm:
+            for _ in range(self.max_workers):
+                self._idle.put(self._spawn())
+
+    def _spawn(self) -> _Worker:
+        with self._lock:
+            self._started += 1
+        return _Worker(self._context)
+
+    def _acquire(self, qualname: str, deadline: Optional[float]) -> _Worker:
+        if self._closed:
+            raise WorkerError("Process pool is shut down")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_start = self._started < self.max_workers
+        if can_start:
+            return self._spawn()
+        if deadline is None:
+            return self._idle.get()
+        try:
+            return self._idle.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            raise WorkerTimeoutError(
+                f"{qualname} found no free worker within its timeout"
+            ) from None
+
+    def _discard(self, worker: _Worker) -> None:
+        worker.kill()
+        with self._lock:
+            self._started -= 1
+        # Keep the pool warm
+        if not self._closed:
+            self._idle.put(self._spawn())
+
+    def run(
+        self,
+        module_name: str,
+        qualname: str,
+        arguments: Dict[str, Any],
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Runs the function in a worker and returns its result. Exceptions
+        raised by the function are re-raised in the caller.
+
+        Raises:
+            WorkerTimeoutError: If the function does not return within timeout
+                seconds, waiting for a free worker included. A worker running
+                the function is killed and replaced.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        worker = self._acquire(qualname, deadline)
+        try:
+            worker.connection.send((module_name, qualname, arguments))
+            if deadline is not None and not worker.connection.poll(
+                max(0.0, deadline - time.monotonic())
+            ):
+                self._discard(worker)
+                raise WorkerTimeoutError(
+                    f"{qualname} did not finish within {timeout} seconds"
+                )
+            succeeded, payload = worker.connection.recv()
+        except WorkerTimeoutError:
+            raise
+        except (EOFError, OSError) as error:
+            self._discard(worker)
+            raise WorkerError(f"Worker process died running {qualname}") from error
+        except BaseException:
+            self._discard(worker)
+            raise
+        if self._closed:
+            worker.stop()
+        else:
+            self._idle.put(worker)
+        if succeeded:
+            return payload
+        raise payload
+
+    def shutdown(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.stop()
+
+
+_process_pool: Optional[ProcessWorkerPool] = None
+_process_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessWorkerPool:
+    """
+    Returns the shared process pool, starting it on first use.
+    """
+    global _process_pool
+    if _process_pool is None:
+        with _process_pool_lock:
+            if _process_pool is None:
+                _process_pool = ProcessWorkerPool()
+    return _process_pool
+
+
+def configure_process_pool(**pool_params) -> ProcessWorkerPool:
+    """
+    Replaces the shared process pool with one created from pool_params
+    (see ProcessWorkerPool).
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown()
+        _process_pool = ProcessWorkerPool(**pool_params)
+    return _process_pool
+
+
+@atexit.register
+def shutdown_process_pool() -> None:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown()
+            _process_pool = None
@@ -0,0 +1,108 @@
+import itertools
+from types import SimpleNamespace
+
+from lwagents import Tool
+from lwagents.agent import LLMAgent
+from lwagents.conversation import ConversationBuffer
+from lwagents.messages import GPTToolResponse, LLMToolResponse
+from lwagents.models import create_model
+from lwagents.state import get_global_agent_state, reset_global_agent_state
+from lwagents.stub_server import StubServer
+from lwagents.tokens import estimate_tokens
+from lwagents.tools import ToolOutputLimit
+
+
+@Tool
+def dump() -> str:
+    """Returns a large output."""
+    return "x" * 1000
+
+
+@Tool
+def add(a: int, b: int) -> int:
+    """Adds two numbers."""
+    return a + b
+
+
+class ToolCallingModel:
+    """Calls the dump tool once per request, with a new call id each time."""
+
+    def __init__(self):
+        self.call_ids = itertools.count()
+
+    def generate(self, tools=None, model_params={}):
+        call = SimpleNamespace(
+            type="function_call",
+            call_id=f"call_{next(self.call_ids)}",
+            name="dump",
+            arguments="{}",
+        )
+        return LLMToolResponse(
+            results=GPTToolResponse(
+                tool_response=SimpleNamespace(output=[call]), content=""
+            )
+        )
+
+
+def run_actions(limit: ToolOutputLimit, actions: int) -> LLMAgent:
+    reset_global_agent_state()
+    agent = LLMAgent(
+        name="agent",
+        llm_model=ToolCallingModel(),
+        tools=[dump],
+        tool_output_limit=limit,
+    )
+    for _ in range(actions):
+        response = agent.action()
+        assert "elided" in response.content
+    reset_global_agent_state()
+    return agent
+
+
+def test_full_tool_outputs_are_not_kept_by_default():
+    agent = run_actions(ToolOutputLimit(max_chars=10), actions=5)
+
+    assert agent.tool_outputs == {}
+
+
+def test_kept_tool_outputs_stay_bounded():
+    limit = ToolOutputLimit(max_chars=10, keep_full=True, max_kept=3)
+
+    agent = run_actions(limit, actions=20)
+
+    assert list(agent.tool_outputs) == ["call_17", "call_18", "call_19"]
+    assert agent.tool_outputs["call_19"] == "x" * 1000
+
+
+def test_run_until_done_continues_the_conversation_buffer():
+    reset_global_agent_state()
+    with StubServer(tool_rounds=2, output_text="done") as server:
+        model = create_model(
+            "openai", instance_params=server.instance_params("openai", max_retries=0)
+        )
+        agent = LLMAgent(name="agent", llm_model=model, tools=[add])
+        conversation = ConversationBuffer("What is 1 + 1?")
+
+        response = agent.run_until_done(
+            model_params={"model": "stub"}, conversation=conversation
+        )
+
+        assert response.content == "done"
+        items = conversation.messages()
+        assert [item.get("type") or item["role"] for item in items] == [
+            "user",
+            "function_call",
+            "function_call_output",
+            "function_call",
+            "function_call_output",
+            "message",
+        ]
+        assert items[2]["output"] == "2"
+        assert conversation.estimated_tokens == sum(map(estimate_tokens, items))
+        assert len(get_global_agent_state().history) == 3
+
+        # The next turn is sent with the earlier rounds
+        conversation.append({"role": "user", "content": "Thanks"})
+        agent.run_until_done(model_params={"model": "stub"}, conversation=conversation)
+        assert len(conversation) == 8
+    reset_global_agent_state()
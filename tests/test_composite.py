@@ -0,0 +1,146 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from lwagents.composite import (
+    HedgedModel,
+    HedgingPolicy,
+    LatencyStats,
+    Route,
+    RoutedModel,
+    RoutingError,
+)
+from lwagents.models import BaseLLMModel
+
+
+class SleepyModel(BaseLLMModel):
+    """Returns its name after sleeping for the next of its delays."""
+
+    def __init__(self, name, delays=(0.0,), fail=False):
+        super().__init__(None)
+        self.name = name
+        self.delays = list(delays)
+        self.fail = fail
+        self.calls = 0
+        self.finished = 0
+        self._lock = threading.Lock()
+
+    def generate(self, tools=None, model_params={}):
+        with self._lock:
+            delay = self.delays[min(self.calls, len(self.delays) - 1)]
+            self.calls += 1
+        time.sleep(delay)
+        with self._lock:
+            self.finished += 1
+        if self.fail:
+            raise RuntimeError(f"{self.name} failed")
+        return self.name
+
+
+def hedge_now(**params):
+    return HedgingPolicy(initial_delay=0.02, min_delay=0.0, budget=1.0, **params)
+
+
+def test_hedge_wins_and_slow_primary_is_abandoned():
+    primary = SleepyModel("primary", delays=[0.3])
+    model = HedgedModel(primary, policy=hedge_now(), fallback=SleepyModel("fallback"))
+
+    assert model.generate(model_params={}) == "fallback"
+    assert (model.hedged_calls, model.hedge_wins, model.abandoned_calls) == (1, 1, 1)
+    # The abandoned request is not interrupted, it still runs to completion
+    time.sleep(0.4)
+    assert primary.finished == 1
+
+
+def test_fast_calls_do_not_hedge_or_start_threads():
+    model = HedgedModel(SleepyModel("primary"), policy=hedge_now())
+    model.generate(model_params={})
+    # Threads of earlier tests may still be finishing, so look for new ones
+    threads = set(threading.enumerate())
+
+    for _ in range(50):
+        assert model.generate(model_params={}) == "primary"
+
+    assert model.hedged_calls == 0
+    assert set(threading.enumerate()) - threads == set()
+
+
+def test_counters_are_exact_under_concurrent_calls():
+    primary = SleepyModel("primary", delays=[0.05])
+    policy = HedgingPolicy(
+        initial_delay=0.005, min_samples=10**6, min_delay=0.0, budget=1.0, burst=100
+    )
+    model = HedgedModel(primary, policy=policy, fallback=SleepyModel("fallback"))
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as callers:
+            results = list(
+                callers.map(lambda _: model.generate(model_params={}), range(64))
+            )
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert results == ["fallback"] * 64
+    assert model.hedged_calls == model.hedge_wins == 64
+    # Losers were abandoned, or cancelled before they were sent
+    assert model.abandoned_calls + (64 - primary.calls) == 64
+
+
+def test_failed_hedge_falls_back_to_primary():
+    model = HedgedModel(
+        SleepyModel("primary", delays=[0.1]),
+        policy=hedge_now(),
+        fallback=SleepyModel("fallback", fail=True),
+    )
+
+    assert model.generate(model_params={}) == "primary"
+    assert model.hedge_wins == 0
+
+
+def test_routes_are_tried_in_order_until_one_succeeds():
+    failing = SleepyModel("a", fail=True)
+    routed = RoutedModel([Route("a", failing), Route("b", SleepyModel("b"))])
+
+    assert routed.generate(model_params={}) == "b"
+    assert routed.last_route == "b"
+    assert routed.route_stats()["a"]["errors"] == 1
+
+
+def test_all_routes_failing_raises_routing_error():
+    routed = RoutedModel([Route("a", SleepyModel("a", fail=True))])
+
+    with pytest.raises(RoutingError):
+        routed.generate(model_params={})
+
+
+def test_slow_route_is_demoted_and_promoted_again_after_recovery():
+    fast_again = SleepyModel("a", delays=[0.05, 0.05, 0.05, 0.0])
+    route = Route("a", fast_again, max_latency=0.02, min_samples=3, sample_max_age=0.3)
+    routed = RoutedModel([route, Route("b", SleepyModel("b"))])
+
+    for _ in range(3):
+        assert routed.generate(model_params={}) == "a"
+    assert route.is_slow()
+    assert routed.generate(model_params={}) == "b"
+    assert fast_again.calls == 3
+
+    # No new samples arrive while demoted; the slow ones age out instead
+    time.sleep(0.35)
+    assert routed.generate(model_params={}) == "a"
+    assert fast_again.calls == 4
+
+
+def test_latency_stats_drop_expired_samples():
+    stats = LatencyStats(max_age=0.05)
+    stats.record(1.0)
+    assert stats.percentile(95) == 1.0
+
+    time.sleep(0.08)
+    stats.record(0.1)
+    assert stats.count == 1
+    assert stats.percentile(95) == 0.1
+    assert stats.summary()["calls"] == 2
@@ -0,0 +1,204 @@
+import os
+import signal
+import time
+
+import pytest
+
+from lwagents import Edge, Graph, GraphRequest, Node
+from lwagents.distributed import (
+    DistributedError,
+    DistributedExecutor,
+    MultiprocessingTaskQueue,
+    TaskLostError,
+    TaskQueue,
+    TaskTimeoutError,
+    _Claimed,
+    _PendingTask,
+    _Task,
+)
+
+
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+def fail(message: str):
+    raise ValueError(message)
+
+
+def sleep_then(seconds: float, value):
+    time.sleep(seconds)
+    return value
+
+
+def die():
+    os._exit(1)
+
+
+def route(target: str) -> GraphRequest:
+    return GraphRequest(traversal=target)
+
+
+class DyingChannel(TaskQueue):
+    """Kills the first worker that takes a task, before it can claim it."""
+
+    def __init__(self, channel: TaskQueue, marker: str):
+        self.channel = channel
+        self.marker = marker
+
+    def put_task(self, message):
+        self.channel.put_task(message)
+
+    def get_task(self, timeout):
+        message = self.channel.get_task(timeout)
+        if message and os.path.exists(self.marker):
+            os.remove(self.marker)
+            os._exit(1)
+        return message
+
+    def put_event(self, message):
+        self.channel.put_event(message)
+
+    def get_event(self, timeout):
+        return self.channel.get_event(timeout)
+
+    def detach(self):
+        self.channel.detach()
+
+
+class DyingTaskQueue(MultiprocessingTaskQueue):
+    def __init__(self, marker: str):
+        super().__init__()
+        self.marker = marker
+
+    def worker_channel(self, worker_id):
+        return DyingChannel(super().worker_channel(worker_id), self.marker)
+
+
+def fast_executor(**params) -> DistributedExecutor:
+    return DistributedExecutor(
+        **{"workers": 2, "heartbeat_interval": 0.1, "heartbeat_timeout": 0.5, **params}
+    )
+
+
+def test_tasks_run_in_workers_and_errors_propagate():
+    with fast_executor() as executor:
+        futures = [executor.submit(add, {"a": i, "b": 1}) for i in range(10)]
+        assert [future.result(timeout=10) for future in futures] == list(range(1, 11))
+        with pytest.raises(ValueError, match="boom"):
+            executor.submit(fail, {"message": "boom"}).result(timeout=10)
+
+
+def test_graph_runs_on_executor():
+    with Graph() as graph:
+        start = Node(
+            node_name="start", kind="START", command=route, parameters={"target": "b"}
+        )
+        b = Node(node_name="b", kind="STATE", command=add, parameters={"a": 1, "b": 2})
+        end = Node(node_name="end", kind="TERMINAL")
+        start.connect(to_node=b, edge=Edge(edge_name="to_b"))
+        b.connect(to_node=end, edge=Edge(edge_name="finish"))
+
+    with fast_executor() as executor:
+        graph.run(start_node=start, additional_log_entries={}, executor=executor)
+
+    history = graph._GraphState.history
+    assert [entry["command_result"] for entry in history][1] == 3
+
+
+def test_malformed_event_does_not_stop_the_coordinator():
+    with fast_executor() as executor:
+        executor._queue.put_event(b"not a pickle")
+        assert executor.submit(add, {"a": 1, "b": 2}).result(timeout=10) == 3
+
+
+def test_coordinator_failure_fails_pending_tasks():
+    with fast_executor() as executor:
+        future = executor.submit(sleep_then, {"seconds": 5, "value": 1})
+
+        def broken(timeout):
+            raise RuntimeError("transport broke")
+
+        executor._queue.get_event = broken
+
+        with pytest.raises(DistributedError, match="transport broke"):
+            future.result(timeout=5)
+        with pytest.raises(DistributedError):
+            executor.submit(add, {"a": 1, "b": 2})
+
+
+def test_task_of_worker_dying_before_claim_is_retried(tmp_path):
+    marker = tmp_path / "die"
+    marker.touch()
+
+    with fast_executor(task_queue=DyingTaskQueue(str(marker))) as executor:
+        result = executor.submit(add, {"a": 1, "b": 2}).result(timeout=10)
+
+    assert result == 3
+    assert not marker.exists()
+    assert executor.retried == 1
+
+
+def test_task_lost_too_often_fails():
+    with fast_executor(max_retries=1) as executor:
+        with pytest.raises(TaskLostError):
+            executor.submit(die).result(timeout=10)
+        assert executor.retried == 1
+        # The replaced workers keep serving tasks
+        assert executor.submit(add, {"a": 2, "b": 2}).result(timeout=10) == 4
+
+
+def test_killing_a_stalled_idle_worker_does_not_block_the_queue():
+    with fast_executor(workers=1) as executor:
+        assert executor.submit(add, {"a": 1, "b": 1}).result(timeout=10) == 2
+        (worker,) = executor._workers.values()
+        # Stalled while waiting for a task, so it is killed for missing heartbeats
+        os.kill(worker.process.pid, signal.SIGSTOP)
+        time.sleep(1.0)
+
+        assert worker.worker_id not in executor._workers
+        assert executor.submit(add, {"a": 2, "b": 3}).result(timeout=10) == 5
+
+
+def test_execute_times_out_and_ignores_the_late_result():
+    slow = Node(
+        node_name="slow",
+        kind="STATE",
+        command=sleep_then,
+        parameters={"seconds": 0.5, "value": 1},
+    )
+    fast = Node(
+        node_name="fast", kind="STATE", command=add, parameters={"a": 1, "b": 1}
+    )
+
+    with fast_executor(task_timeout=0.2) as executor:
+        started = time.monotonic()
+        with pytest.raises(TaskTimeoutError, match="slow"):
+            executor.execute(slow)
+        assert time.monotonic() - started < 0.5
+        assert executor.execute(fast) == 2
+        assert not executor._pending
+
+
+@pytest.mark.parametrize("max_retries", [0, 1])
+def test_claim_arriving_after_its_worker_was_lost_is_retried(max_retries):
+    # Events of different workers are not ordered, so the coordinator can
+    # notice that a worker died before it reads the worker's last claim
+    executor = fast_executor(max_retries=max_retries)
+    try:
+        pending_task = _PendingTask(_Task(0, add, {"a": 1, "b": 2}))
+        executor._pending[0] = pending_task
+
+        executor._handle(_Claimed(0, "worker-lost", attempt=0))
+
+        if max_retries:
+            assert (pending_task.worker_id, pending_task.task.attempt) == (None, 1)
+            assert executor.retried == 1
+            # A second late claim of the same attempt is stale
+            executor._handle(_Claimed(0, "worker-lost", attempt=0))
+            assert executor.retried == 1
+        else:
+            with pytest.raises(TaskLostError):
+                pending_task.future.result(timeout=0)
+    finally:
+        executor._queue.close()
@@ -0,0 +1,117 @@
+import pytest
+
+from lwagents import Edge, Graph, GraphRequest, Node
+from lwagents.graph import GraphException
+
+executed = []
+
+
+def record(name: str) -> str:
+    executed.append(name)
+    return name
+
+
+def jump(target: str) -> GraphRequest:
+    executed.append("jump")
+    return GraphRequest(traversal=target)
+
+
+def build_graph() -> Node:
+    """Builds a graph with a subgraph and returns the graph's START node."""
+    with Graph() as inner:
+        a = Node(node_name="a", kind="START", command=jump, parameters={"target": "s"})
+        skipped = Node(
+            node_name="skipped", kind="STATE", command=record, parameters={"name": "x"}
+        )
+        s = Node(node_name="s", kind="STATE", command=record, parameters={"name": "s"})
+        # Never runs in a nested run, so it must not run once inlined either
+        t = Node(
+            node_name="t",
+            kind="TERMINAL",
+            command=record,
+            parameters={"name": "t_terminal"},
+        )
+        a.connect(to_node=skipped, edge=Edge(edge_name="to_skipped"))
+        a.connect(to_node=s, edge=Edge(edge_name="to_s"))
+        skipped.connect(to_node=t, edge=Edge(edge_name="skipped_done"))
+        s.connect(to_node=t, edge=Edge(edge_name="done"))
+
+    with Graph() as outer:
+        start = Node(
+            node_name="start",
+            kind="START",
+            command=record,
+            parameters={"name": "start"},
+        )
+        sub = Node(node_name="sub", kind="SUBGRAPH", subgraph=inner)
+        after = Node(
+            node_name="after",
+            kind="STATE",
+            command=record,
+            parameters={"name": "after"},
+        )
+        end = Node(node_name="end", kind="TERMINAL")
+        start.connect(to_node=sub, edge=Edge(edge_name="enter"))
+        sub.connect(to_node=after, edge=Edge(edge_name="leave"))
+        after.connect(to_node=end, edge=Edge(edge_name="finish"))
+    return outer, start
+
+
+def run(graph: Graph, start: Node) -> list:
+    executed.clear()
+    graph.run(start_node=start)
+    return list(executed)
+
+
+def test_compiled_graph_runs_the_same_commands_as_the_nested_one():
+    graph, start = build_graph()
+    nested = run(graph, start)
+
+    graph, start = build_graph()
+    compiled = run(graph.compile(), start)
+
+    assert nested == ["start", "jump", "s", "after"]
+    assert compiled == nested
+
+
+def test_compile_prefixes_inlined_nodes():
+    graph, _ = build_graph()
+    compiled = graph.compile()
+
+    names = [node.node_name for node in compiled.nodes()]
+    assert names == ["start", "sub", "sub.skipped", "sub.s", "sub.t", "after", "end"]
+    (exit_node,) = [node for node in compiled.nodes() if node.node_name == "sub.t"]
+    assert exit_node.command is None
+
+
+def test_compile_records_inlined_steps_in_the_parent_state():
+    graph, start = build_graph()
+    graph.compile().run(start_node=start)
+
+    steps = [entry["node_name"] for entry in graph._GraphState.history]
+    assert steps == ["start", "sub", "sub.s", "sub.t", "after"]
+
+
+def test_compile_rejects_colliding_names():
+    graph, _ = build_graph()
+    graph.add_node(Node(node_name="sub.s", kind="STATE"))
+
+    with pytest.raises(GraphException, match="sub.s"):
+        graph.compile()
+
+
+def test_subgraph_node_without_subgraph_fails_to_compile():
+    with Graph() as graph:
+        start = Node(node_name="start", kind="START")
+        sub = Node(node_name="sub", kind="SUBGRAPH")
+        start.connect(to_node=sub, edge=Edge(edge_name="enter"))
+
+    with pytest.raises(GraphException, match="no subgraph"):
+        graph.compile()
+
+
+def test_subgraph_node_cannot_have_a_command():
+    graph, _ = build_graph()
+
+    with pytest.raises(ValueError, match="cannot have a command"):
+        Node(node_name="sub", kind="SUBGRAPH", subgraph=graph, command=record)
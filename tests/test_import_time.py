@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+# Same budget and modules as benchmarks/import_time.py
+BUDGET_MS = 400
+PROVIDER_MODULES = ("openai", "anthropic", "dotenv", "httpx")
+LAZY_SUBMODULES = ("lwagents.pool", "lwagents.registry", "lwagents.serialization")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_profile() -> dict:
+    """
+    Returns the cumulative import time, in microseconds, of every module
+    imported by "import lwagents" in a fresh interpreter.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import lwagents"],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def test_import_loads_no_provider_sdk_or_optional_submodule():
+    profile = import_profile()
+
+    eager = [name for name in profile if name.split(".")[0] in PROVIDER_MODULES]
+    assert eager == []
+    assert [name for name in LAZY_SUBMODULES if name in profile] == []
+
+
+def test_import_stays_within_budget():
+    # Best of three, so a busy machine does not fail the test
+    fastest = min(import_profile()["lwagents"] for _ in range(3)) / 1000
+
+    assert fastest <= BUDGET_MS, f"import lwagents took {fastest:.0f} ms"
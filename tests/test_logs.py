@@ -0,0 +1,125 @@
+import json
+import logging
+import threading
+
+import pytest
+
+from lwagents import Edge, Graph, Node
+from lwagents.logs import (
+    StructuredFormatter,
+    disable_async_logging,
+    enable_async_logging,
+    get_logger,
+    log_event,
+)
+
+
+class GatedHandler(logging.Handler):
+    """Collects formatted messages; emit waits until the gate is opened."""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.gate.set()
+        self.records = []
+        self.messages = []
+
+    def emit(self, record):
+        self.gate.wait(timeout=5)
+        self.records.append(record)
+        self.messages.append(record.getMessage())
+
+
+class Formatted:
+    def __init__(self):
+        self.count = 0
+
+    def __str__(self):
+        self.count += 1
+        return "formatted"
+
+
+@pytest.fixture
+def handler():
+    logger = logging.getLogger("lwagents")
+    level = logger.level
+    handler = GatedHandler()
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    yield handler
+    disable_async_logging()
+    logger.removeHandler(handler)
+    logger.setLevel(level)
+
+
+def test_log_event_carries_event_and_fields(handler):
+    log_event(get_logger("test"), logging.INFO, "node.enter", "Node %s", "a", step=1)
+
+    (record,) = handler.records
+    assert (record.name, record.event, record.fields) == (
+        "lwagents.test",
+        "node.enter",
+        {"step": 1},
+    )
+    assert handler.messages == ["Node a"]
+    entry = json.loads(StructuredFormatter().format(record))
+    assert (entry["event"], entry["message"], entry["step"]) == (
+        "node.enter",
+        "Node a",
+        1,
+    )
+
+
+def test_disabled_levels_are_not_formatted(handler):
+    logging.getLogger("lwagents").setLevel(logging.WARNING)
+    value = Formatted()
+
+    log_event(get_logger("test"), logging.INFO, "quiet", "%s", value)
+
+    assert handler.records == []
+    assert value.count == 0
+
+
+def test_async_logging_writes_on_the_listener_and_drops_when_full(handler):
+    handler.gate.clear()
+    async_logging = enable_async_logging(max_queue_size=2)
+    logger = get_logger("test")
+
+    # The caller never waits for the blocked handler
+    for i in range(10):
+        log_event(logger, logging.INFO, "tick", "tick %d", i)
+    assert handler.records == []
+
+    handler.gate.set()
+    disable_async_logging()
+    assert async_logging.dropped > 0
+    assert len(handler.messages) == 10 - async_logging.dropped
+    # The original handler is back in place
+    log_event(logger, logging.INFO, "tick", "direct")
+    assert handler.messages[-1] == "direct"
+
+
+def grow() -> list:
+    return ["first"]
+
+
+def test_graph_logs_snapshots_with_async_logging(handler):
+    with Graph() as graph:
+        start = Node(node_name="start", kind="START", command=grow)
+        end = Node(node_name="end", kind="TERMINAL")
+        start.connect(to_node=end, edge=Edge(edge_name="finish"))
+
+    handler.gate.clear()
+    enable_async_logging()
+    graph.run(start_node=start)
+    # Change the result and history before the listener formats the records
+    result = graph._GraphState.history[0]["command_result"]
+    result.append("changed later")
+    graph._GraphState.history.append({"step_number": 99})
+    handler.gate.set()
+    disable_async_logging()
+
+    messages = dict(zip((r.event for r in handler.records), handler.messages))
+    assert messages["node.result"] == "start executed its command. Result: ['first']"
+    assert "changed later" not in messages["graph.history"]
+    assert "99" not in messages["graph.history"]
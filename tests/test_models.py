@@ -0,0 +1,142 @@
+import copy
+from types import SimpleNamespace
+
+from lwagents import Tool
+from lwagents.models import AnthropicModel, DeepSeekModel, GPTModel
+from lwagents.tools import ToolUtility
+
+
+@Tool
+def search(query: str) -> str:
+    """Searches the web."""
+    return query
+
+
+@Tool
+def fetch(url: str) -> str:
+    """Fetches a page."""
+    return url
+
+
+class RecordingClient:
+    """Records the requests sent through responses.create or messages.create."""
+
+    def __init__(self, completion):
+        self.requests = []
+        self.completion = completion
+        self.responses = SimpleNamespace(create=self.create)
+        self.messages = SimpleNamespace(create=self.create)
+
+    def create(self, **request):
+        self.requests.append(request)
+        return self.completion
+
+
+def openai_client():
+    usage = SimpleNamespace(
+        input_tokens=120,
+        output_tokens=5,
+        input_tokens_details=SimpleNamespace(cached_tokens=100),
+    )
+    return RecordingClient(SimpleNamespace(output_text="hi", output=[], usage=usage))
+
+
+def anthropic_client():
+    usage = SimpleNamespace(
+        input_tokens=20,
+        output_tokens=5,
+        cache_read_input_tokens=100,
+        cache_creation_input_tokens=10,
+    )
+    return RecordingClient(
+        SimpleNamespace(content=[SimpleNamespace(type="text", text="hi")], usage=usage)
+    )
+
+
+def test_prompt_cache_key_follows_the_stable_prefix():
+    client = openai_client()
+    model = GPTModel(client)
+    tools = {"search": search}
+
+    def cache_key(**params):
+        model.generate(tools=tools, model_params={"model": "gpt", **params})
+        return client.requests[-1]["prompt_cache_key"]
+
+    key = cache_key(instructions="Be brief.", input="first")
+    # A different input shares the prefix, other instructions do not
+    assert cache_key(instructions="Be brief.", input="second") == key
+    assert cache_key(instructions="Be verbose.", input="first") != key
+    # Unhashable instructions get a key as well
+    assert cache_key(instructions=[{"type": "input_text", "text": "x"}], input="a")
+    assert cache_key(prompt_cache_key="mine", input="a") == "mine"
+
+
+def test_prompt_cache_key_is_not_sent_when_caching_is_off():
+    client = openai_client()
+
+    DeepSeekModel(client).generate(model_params={"model": "deepseek", "input": "a"})
+    model = GPTModel(client)
+    model.prompt_caching = False
+    model.generate(model_params={"model": "gpt", "input": "a"})
+
+    assert ["prompt_cache_key" in request for request in client.requests] == [
+        False,
+        False,
+    ]
+
+
+def test_openai_usage_reports_cached_tokens():
+    response = GPTModel(openai_client()).generate(
+        tools={"search": search}, model_params={"model": "gpt", "input": "a"}
+    )
+
+    usage = response.results.usage
+    assert (usage.input_tokens, usage.output_tokens, usage.cached_tokens) == (
+        120,
+        5,
+        100,
+    )
+
+
+def test_anthropic_breakpoints_mark_the_end_of_tools_and_system_prompt():
+    client = anthropic_client()
+    params = {"model": "claude", "system": "Be brief.", "messages": []}
+    original = copy.deepcopy(params)
+
+    response = AnthropicModel(client).generate(
+        tools={"search": search, "fetch": fetch}, model_params=params
+    )
+
+    (request,) = client.requests
+    assert ["cache_control" in tool for tool in request["tools"]] == [False, True]
+    assert request["system"] == [
+        {"type": "text", "text": "Be brief.", "cache_control": {"type": "ephemeral"}}
+    ]
+    # The caller's parameters and the memoized tool schemas are left alone
+    assert params == original
+    schemas = ToolUtility.get_tools_info_anthropic({"search": search, "fetch": fetch})
+    assert all("cache_control" not in tool for tool in schemas)
+    usage = response.results.usage
+    assert (
+        usage.input_tokens,
+        usage.cached_tokens,
+        usage.cache_creation_tokens,
+    ) == (130, 100, 10)
+
+
+def test_anthropic_breakpoints_set_by_the_caller_are_kept():
+    model = AnthropicModel(anthropic_client())
+    system = [
+        {"type": "text", "text": "Rules", "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": "Today is Monday."},
+    ]
+
+    _, params = model._with_cache_breakpoints({"system": system})
+    assert params["system"] is system
+
+    model.prompt_caching = False
+    tools = [{"name": "search"}]
+    assert model._with_cache_breakpoints({"system": "x"}, tools) == (
+        tools,
+        {"system": "x"},
+    )
@@ -0,0 +1,144 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from lwagents.agent import Agent, LLMAgent
+from lwagents.pool import AgentPool
+from lwagents.state import get_global_agent_state, reset_global_agent_state
+
+
+class SleepingAgent(Agent):
+    """Sleeps for model_params["delay"] and returns model_params["value"]."""
+
+    def __init__(self, name):
+        super().__init__(name=name, tools=[], state=None)
+        self.running = 0
+        self.overlapped = False
+        self._lock = threading.Lock()
+
+    def action(self, state_entry={}, model_params={}):
+        with self._lock:
+            self.running += 1
+            self.overlapped |= self.running > 1
+        time.sleep(model_params["delay"])
+        with self._lock:
+            self.running -= 1
+        if model_params.get("fail"):
+            raise RuntimeError(model_params["value"])
+        return model_params["value"]
+
+
+class SleepingModel:
+    """Answers with the requested text after the requested delay."""
+
+    def generate(self, tools=None, model_params={}):
+        time.sleep(model_params["delay"])
+        return SimpleNamespace(content=model_params["text"], usage=None)
+
+
+def params(value, delay, **extra):
+    return {"model_params": {"value": value, "delay": delay, **extra}}
+
+
+def test_results_are_returned_in_submission_order():
+    agents = [SleepingAgent(f"agent_{i}") for i in range(4)]
+
+    with AgentPool(max_concurrency=4) as pool:
+        started = time.monotonic()
+        results = pool.run(
+            [(agent, params(i, 0.1 - 0.02 * i)) for i, agent in enumerate(agents)]
+        )
+
+    assert results == [0, 1, 2, 3]
+    # Different agents overlap
+    assert time.monotonic() - started < 0.25
+
+
+def test_actions_of_one_agent_never_overlap():
+    agent = SleepingAgent("agent")
+
+    with AgentPool(max_concurrency=4) as pool:
+        results = pool.run([(agent, params(i, 0.02)) for i in range(5)])
+
+    assert results == list(range(5))
+    assert not agent.overlapped
+
+
+def test_llm_agent_actions_are_committed_in_submission_order():
+    reset_global_agent_state()
+    agents = [LLMAgent(f"agent_{i}", SleepingModel()) for i in range(3)]
+    requests = [
+        (agent, {"model_params": {"text": agent.name, "delay": delay}})
+        for agent, delay in zip(agents, (0.15, 0.0, 0.05))
+    ]
+
+    with AgentPool(max_concurrency=3) as pool:
+        responses = pool.run(requests)
+
+    names = [agent.name for agent in agents]
+    assert [response.content for response in responses] == names
+    history = get_global_agent_state().history
+    assert [entry["agent_name"] for entry in history] == names
+    reset_global_agent_state()
+
+
+def test_failed_action_fails_only_its_own_future():
+    first, second = SleepingAgent("first"), SleepingAgent("second")
+
+    with AgentPool(max_concurrency=2) as pool:
+        failing = pool.submit(first, **params("boom", 0.05, fail=True))
+        following = pool.submit(first, **params("after", 0.0))
+        other = pool.submit(second, **params("other", 0.0))
+
+        with pytest.raises(RuntimeError, match="boom"):
+            failing.result(timeout=5)
+        assert following.result(timeout=5) == "after"
+        assert other.result(timeout=5) == "other"
+
+
+class FollowUpAgent(LLMAgent):
+    """Submits an action of another agent to the pool while committing."""
+
+    def __init__(self, name, pool, other):
+        super().__init__(name, SleepingModel())
+        self.pool = pool
+        self.other = other
+        self.follow_up = None
+
+    def commit_action(self, response, tool_execution_results, state_entry={}):
+        result = super().commit_action(response, tool_execution_results, state_entry)
+        self.follow_up = self.pool.submit(self.other, **params("follow-up", 0.0))
+        return result
+
+
+def test_commit_can_submit_to_the_pool():
+    reset_global_agent_state()
+    with AgentPool(max_concurrency=2) as pool:
+        agent = FollowUpAgent("agent", pool, SleepingAgent("other"))
+        future = pool.submit(agent, model_params={"text": "done", "delay": 0.0})
+
+        assert future.result(timeout=5).content == "done"
+        assert agent.follow_up.result(timeout=5) == "follow-up"
+    reset_global_agent_state()
+
+
+def test_future_callback_can_wait_for_a_new_action():
+    agent = SleepingAgent("agent")
+    results = []
+
+    with AgentPool(max_concurrency=2) as pool:
+
+        def submit_and_wait(future):
+            results.append(pool.submit(agent, **params("second", 0.0)).result(5))
+
+        first = pool.submit(agent, **params("first", 0.01))
+        first.add_done_callback(submit_and_wait)
+        first.result(timeout=5)
+        for _ in range(50):
+            if results:
+                break
+            time.sleep(0.1)
+
+    assert results == ["second"]
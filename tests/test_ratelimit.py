@@ -0,0 +1,89 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from lwagents.ratelimit import (
+    Priority,
+    RateLimiter,
+    configure_rate_limit,
+    get_rate_limiter,
+    request_priority,
+    reset_rate_limiters,
+    retry_after_from_error,
+)
+
+
+def test_interactive_requests_overtake_queued_batch_requests():
+    # 10 requests per second, starting with an empty bucket
+    limiter = RateLimiter(requests_per_minute=600)
+    limiter._requests.tokens = 0
+    served = []
+
+    def call(name, priority):
+        limiter.acquire(priority=priority)
+        served.append(name)
+
+    batch = threading.Thread(target=call, args=("batch", Priority.BATCH))
+    batch.start()
+    time.sleep(0.02)
+    with request_priority(Priority.INTERACTIVE):
+        interactive = threading.Thread(target=call, args=("interactive", None))
+    interactive.start()
+    batch.join(timeout=5)
+    interactive.join(timeout=5)
+
+    assert served == ["interactive", "batch"]
+
+
+def test_rate_limited_response_pauses_and_slows_down():
+    limiter = RateLimiter(requests_per_minute=6000, backoff_factor=0.5)
+
+    limiter.record_rate_limited(retry_after=0.2)
+    started = time.monotonic()
+    limiter.acquire()
+
+    assert time.monotonic() - started >= 0.19
+    assert limiter.rate_fraction == 0.5
+    limiter.record_success()
+    assert limiter.rate_fraction == 0.55
+
+
+def test_backoff_stops_at_min_rate_fraction():
+    limiter = RateLimiter(requests_per_minute=60, min_rate_fraction=0.2)
+
+    for _ in range(10):
+        limiter.record_rate_limited(retry_after=0)
+
+    assert limiter.rate_fraction == 0.2
+
+
+def test_request_larger_than_the_token_bucket_goes_through():
+    limiter = RateLimiter(tokens_per_minute=600)
+    started = time.monotonic()
+
+    limiter.acquire(tokens=10_000)
+
+    assert time.monotonic() - started < 0.1
+
+
+def test_retry_after_is_read_from_provider_errors():
+    def error(headers):
+        return SimpleNamespace(response=SimpleNamespace(headers=headers))
+
+    assert retry_after_from_error(error({"retry-after-ms": "250"})) == 0.25
+    assert retry_after_from_error(error({"retry-after": "2"})) == 2.0
+    assert retry_after_from_error(error({"retry-after": "soon"})) is None
+    assert retry_after_from_error(ValueError()) is None
+
+
+def test_model_limiter_takes_precedence_over_provider_limiter():
+    reset_rate_limiters()
+    try:
+        provider = configure_rate_limit("openai", requests_per_minute=60)
+        model = configure_rate_limit("openai", "gpt-4o", requests_per_minute=600)
+
+        assert get_rate_limiter("openai", "gpt-4o") is model
+        assert get_rate_limiter("openai", "gpt-4.1") is provider
+        assert get_rate_limiter("anthropic", "claude") is None
+    finally:
+        reset_rate_limiters()
@@ -0,0 +1,46 @@
+import pytest
+
+from lwagents import Tool
+from lwagents.cache import LRUCache
+from lwagents.registry import LazyTool, ToolRegistry
+
+
+def double(x: int) -> int:
+    """Doubles a number."""
+    return 2 * x
+
+
+PATH = f"{__name__}:double"
+
+
+def test_save_and_load_round_trip(tmp_path):
+    registry = ToolRegistry.from_tools([PATH])
+    registry.register(f"{__name__}.double", name="cached_double", cache=True)
+    registry.save(tmp_path / "tools.json")
+
+    loaded = ToolRegistry.load(tmp_path / "tools.json")
+
+    assert loaded.names() == ["double", "cached_double"]
+    tool = loaded.get("double")
+    assert tool.provider_schema("openai") == Tool(double).provider_schema("openai")
+    assert not tool.is_resolved
+    assert tool.execute(x=4) == 8
+    assert tool.is_resolved
+    cached = loaded.get("cached_double")
+    assert cached.execute(x=2) == cached.execute(x=2) == 4
+    assert cached.resolve().cache_info()["hits"] == 1
+
+
+def test_unsaveable_options_are_rejected_when_registered():
+    registry = ToolRegistry()
+
+    with pytest.raises(ValueError, match="cached_double"):
+        registry.register(PATH, name="cached_double", cache=LRUCache())
+    with pytest.raises(ValueError):
+        registry.add(LazyTool(PATH, executor=object()))
+    assert len(registry) == 0
+
+
+def test_unknown_tool_raises_key_error():
+    with pytest.raises(KeyError):
+        ToolRegistry().get("missing")
@@ -0,0 +1,175 @@
+import json
+import os
+
+import pytest
+
+from lwagents import Edge, Graph, Node
+from lwagents.serialization import (
+    GraphSerializationError,
+    compile_graph_file,
+    compile_graph_spec,
+    diff_graphs,
+    graph_to_dict,
+    load_graph,
+    save_graph,
+)
+
+
+class Counter:
+    def __init__(self):
+        self.count = 0
+
+    def increment(self, by: int) -> int:
+        self.count += by
+        return self.count
+
+
+def is_positive(value: int) -> bool:
+    return value > 0
+
+
+def build_graph(counter: Counter, by: int = 1) -> Graph:
+    with Graph() as graph:
+        start = Node(
+            node_name="start",
+            kind="START",
+            command=counter.increment,
+            parameters={"by": by},
+        )
+        end = Node(node_name="end", kind="TERMINAL")
+        other = Node(node_name="other", kind="TERMINAL")
+        start.connect(
+            to_node=end,
+            edge=Edge(
+                edge_name="positive",
+                condition=is_positive,
+                parameters={"value": by},
+            ),
+        )
+        start.connect(to_node=other, edge=Edge(edge_name="otherwise"))
+    return graph
+
+
+def test_saved_graph_loads_and_runs_the_same(tmp_path):
+    counter = Counter()
+    path = tmp_path / "graph.json"
+    save_graph(build_graph(counter, by=2), path, references={"counter": counter})
+
+    loaded = load_graph(path, params={"counter": counter})
+    loaded.run(start_node=loaded.start_node())
+
+    assert counter.count == 2
+    steps = loaded._GraphState.history
+    assert steps[0]["transition"][0] == "positive"
+    assert not diff_graphs(path, loaded, references={"counter": counter})
+
+
+def test_missing_reference_param_fails_clearly(tmp_path):
+    counter = Counter()
+    path = tmp_path / "graph.json"
+    save_graph(build_graph(counter), path, references={"counter": counter})
+
+    with pytest.raises(GraphSerializationError, match="missing parameter 'counter'"):
+        load_graph(path)
+
+
+def test_unnamed_objects_and_lambdas_cannot_be_saved():
+    with pytest.raises(GraphSerializationError, match="not importable"):
+        graph_to_dict(build_graph(Counter()))
+
+    with Graph() as graph:
+        start = Node(node_name="start", kind="START", command=lambda: None)
+        start.connect(
+            to_node=Node(node_name="end", kind="TERMINAL"), edge=Edge(edge_name="e")
+        )
+    with pytest.raises(GraphSerializationError, match="Node start"):
+        graph_to_dict(graph)
+
+
+def test_invalid_descriptions_are_rejected():
+    counter = Counter()
+    spec = graph_to_dict(build_graph(counter), references={"counter": counter})
+
+    two_starts = json.loads(json.dumps(spec))
+    two_starts["nodes"][1]["kind"] = "START"
+    with pytest.raises(GraphSerializationError, match="exactly one START"):
+        compile_graph_spec(two_starts)
+
+    from_terminal = json.loads(json.dumps(spec))
+    from_terminal["edges"].append({"from": "end", "to": "start", "name": "back"})
+    with pytest.raises(GraphSerializationError, match="TERMINAL nodes have no edges"):
+        compile_graph_spec(from_terminal)
+
+    unknown = json.loads(json.dumps(spec))
+    unknown["edges"][0]["to"] = "missing"
+    with pytest.raises(GraphSerializationError, match="unknown node 'missing'"):
+        compile_graph_spec(unknown)
+
+
+def test_compiled_graphs_cannot_be_saved():
+    with Graph() as inner:
+        start = Node(node_name="start", kind="START")
+        start.connect(
+            to_node=Node(node_name="end", kind="TERMINAL"), edge=Edge(edge_name="e")
+        )
+    with Graph() as graph:
+        start = Node(node_name="start", kind="START")
+        sub = Node(node_name="sub", kind="SUBGRAPH", subgraph=inner)
+        start.connect(to_node=sub, edge=Edge(edge_name="enter"))
+
+    with pytest.raises(GraphSerializationError, match="Graph.compile"):
+        graph_to_dict(graph.compile())
+
+
+def test_cache_is_keyed_by_file_content(tmp_path):
+    counter = Counter()
+    references = {"counter": counter}
+    path = tmp_path / "graph.json"
+    cache_dir = tmp_path / "cache"
+    save_graph(build_graph(counter, by=1), path, references)
+
+    first = compile_graph_file(path, cache_dir)
+    assert compile_graph_file(path, cache_dir) == first
+    assert len(os.listdir(cache_dir)) == 1
+
+    save_graph(build_graph(counter, by=5), path, references)
+    changed = compile_graph_file(path, cache_dir)
+    assert changed != first
+    assert len(os.listdir(cache_dir)) == 2
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [b"", b"\x80\x05garbage", b"cno_such_module\nThing\n."],
+    ids=["empty", "corrupt", "stale"],
+)
+def test_unreadable_cache_entry_is_rebuilt(tmp_path, payload):
+    counter = Counter()
+    path = tmp_path / "graph.json"
+    cache_dir = tmp_path / "cache"
+    save_graph(build_graph(counter), path, references={"counter": counter})
+    expected = compile_graph_file(path, cache_dir)
+    (entry,) = os.listdir(cache_dir)
+    (cache_dir / entry).write_bytes(payload)
+
+    assert compile_graph_file(path, cache_dir) == expected
+    # The entry was rewritten and is read from now on
+    assert (cache_dir / entry).read_bytes() != payload
+    assert compile_graph_file(path, cache_dir) == expected
+
+
+def test_diff_reports_changed_added_and_reordered_parts():
+    counter = Counter()
+    references = {"counter": counter}
+    old = graph_to_dict(build_graph(counter, by=1), references)
+    new = graph_to_dict(build_graph(counter, by=3), references)
+    new["nodes"].append({"name": "extra", "kind": "TERMINAL"})
+    new["edges"].reverse()
+
+    diff = diff_graphs(old, new)
+
+    assert diff.changed_nodes["start"]["parameters"] == ({"by": 1}, {"by": 3})
+    assert diff.added_nodes == ["extra"]
+    assert diff.reordered == ["start"]
+    assert "+ node extra" in diff.summary()
+    assert not diff_graphs(old, old)
@@ -0,0 +1,67 @@
+import pytest
+
+from lwagents.state import AgentState, MemoryPolicy
+
+
+def entries(state):
+    return [entry["step"] for entry in state.history]
+
+
+def test_sliding_window_keeps_the_first_entries():
+    state = AgentState(memory_policy=MemoryPolicy(max_entries=4, keep_first=1))
+
+    for step in range(10):
+        state.update_state(step=step)
+
+    assert entries(state) == [0, 7, 8, 9]
+    assert state.evicted == 6
+
+
+def test_evicted_entries_are_summarized():
+    def summarize(evicted, summary):
+        return (summary or 0) + sum(entry["step"] for entry in evicted)
+
+    state = AgentState(memory_policy=MemoryPolicy(max_entries=2, summarizer=summarize))
+
+    for step in range(5):
+        state.update_state(step=step)
+
+    assert entries(state) == [3, 4]
+    assert state.summary == 0 + 1 + 2
+
+
+def test_byte_limit_evicts_oldest_but_keeps_the_newest_entry():
+    policy = MemoryPolicy(max_bytes=100, sizer=lambda entry: entry["size"])
+    state = AgentState(memory_policy=policy)
+
+    for step, size in enumerate([40, 40, 40]):
+        state.update_state(step=step, size=size)
+    assert entries(state) == [1, 2]
+
+    state.update_state(step=3, size=500)
+    assert entries(state) == [3]
+
+
+def test_initial_history_is_compacted():
+    history = [{"step": step} for step in range(5)]
+
+    state = AgentState(
+        initial_history=history, memory_policy=MemoryPolicy(max_entries=2)
+    )
+
+    assert entries(state) == [3, 4]
+
+
+def test_window_must_be_larger_than_keep_first():
+    with pytest.raises(ValueError):
+        MemoryPolicy(max_entries=2, keep_first=2)
+
+
+def test_state_without_policy_keeps_everything():
+    state = AgentState()
+
+    for step in range(50):
+        state.update_state(step=step)
+
+    assert entries(state) == list(range(50))
+    assert state.evicted == 0
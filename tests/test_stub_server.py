@@ -0,0 +1,106 @@
+import json
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from lwagents import Tool
+from lwagents.models import create_model
+from lwagents.stub_server import StubServer
+
+
+@Tool
+def add(a: int, b: int) -> int:
+    """Adds two numbers."""
+    return a + b
+
+
+@pytest.fixture
+def server():
+    with StubServer(output_text="stub answer") as server:
+        yield server
+
+
+def post(server, path, body, content_type="application/json"):
+    request = urllib.request.Request(
+        server.url + path, data=body, headers={"Content-Type": content_type}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+def settled_stats(server):
+    # Counters are updated after the response is sent
+    for _ in range(100):
+        stats = server.stats.snapshot()
+        if not stats["in_flight"]:
+            return stats
+        time.sleep(0.01)
+    return stats
+
+
+def test_openai_client_round_trip(server):
+    model = create_model(
+        "openai", instance_params=server.instance_params("openai", max_retries=0)
+    )
+
+    first = model.generate(
+        tools={"add": add}, model_params={"model": "stub", "input": "1 + 2?"}
+    )
+    (call,) = first.results.tool_response.output
+    assert (call.type, call.name, json.loads(call.arguments)) == (
+        "function_call",
+        "add",
+        {"a": 1, "b": 1},
+    )
+
+    result = {"type": "function_call_output", "call_id": call.call_id, "output": "2"}
+    second = model.generate(
+        tools={"add": add},
+        model_params={"model": "stub", "input": [call.model_dump(), result]},
+    )
+    assert second.content == "stub answer"
+    assert second.results.usage.input_tokens > 0
+
+    stats = settled_stats(server)
+    assert (stats["completed"], stats["tool_calls"]) == (2, 1)
+
+
+def test_anthropic_client_round_trip(server):
+    model = create_model(
+        "anthropic",
+        instance_params=server.instance_params("anthropic", max_retries=0),
+    )
+
+    response = model.generate(
+        model_params={
+            "model": "stub",
+            "max_tokens": 64,
+            "messages": [{"role": "user", "content": "Hello"}],
+        }
+    )
+
+    assert response.content == "stub answer"
+    assert settled_stats(server)["by_endpoint"] == {"messages": 1}
+
+
+@pytest.mark.parametrize("body", [b"{not json", b"[1, 2]", b"\xff\xfe"])
+def test_malformed_body_is_answered_with_400(server, body):
+    status, error = post(server, "/v1/responses", body)
+    assert status == 400
+    assert error["error"]["type"] == "invalid_request_error"
+
+    status, error = post(server, "/v1/messages", body)
+    assert status == 400
+    assert (error["type"], error["error"]["type"]) == (
+        "error",
+        "invalid_request_error",
+    )
+
+    assert settled_stats(server)["errors"] == 2
+    # The server keeps answering
+    assert post(server, "/v1/messages", b"{}")[0] == 200
@@ -0,0 +1,95 @@
+import pytest
+
+from lwagents.tokens import (
+    ContextBudget,
+    ContextWindowExceededError,
+    DropOldestTurns,
+    TruncateToolOutputs,
+    context_limit_for,
+    estimate_tokens,
+)
+
+
+def user(text):
+    return {"role": "user", "content": text}
+
+
+def tool_call(call_id):
+    return {"type": "function_call", "call_id": call_id, "name": "search"}
+
+
+def tool_output(call_id, output):
+    return {"type": "function_call_output", "call_id": call_id, "output": output}
+
+
+def test_context_limit_uses_the_longest_matching_prefix():
+    assert context_limit_for("gpt-4-0613") == 8192
+    assert context_limit_for("gpt-4o-mini") == 128000
+    assert context_limit_for("unknown-model") is None
+    assert context_limit_for(None) is None
+
+
+def test_request_that_fits_is_returned_unchanged():
+    request = {"model": "gpt-4", "input": [user("hello")]}
+
+    assert ContextBudget().fit(request) is request
+
+
+def test_unknown_model_is_not_checked():
+    request = {"model": "unknown-model", "input": [user("x" * 100_000)]}
+
+    assert ContextBudget().fit(request) is request
+
+
+def test_long_tool_outputs_are_truncated_first():
+    request = {
+        "model": "custom",
+        "input": [user("search"), tool_call("1"), tool_output("1", "x" * 4000)],
+    }
+    budget = ContextBudget(
+        max_context_tokens=300,
+        strategies=[TruncateToolOutputs(max_tokens=100), DropOldestTurns()],
+    )
+
+    fitted = budget.fit(request)
+
+    output = fitted["input"][2]["output"]
+    assert output.endswith(TruncateToolOutputs.marker)
+    assert len(fitted["input"]) == 3
+    # The caller's request is not modified
+    assert len(request["input"][2]["output"]) == 4000
+
+
+def test_oldest_turns_are_dropped_with_their_tool_results():
+    system = {"role": "system", "content": "You are helpful."}
+    messages = [
+        system,
+        user("a" * 400),
+        tool_call("1"),
+        tool_output("1", "b" * 400),
+        user("latest question"),
+    ]
+    budget = ContextBudget(max_context_tokens=100, strategies=[DropOldestTurns()])
+
+    fitted = budget.fit({"model": "custom", "input": messages})
+
+    assert fitted["input"] == [system, user("latest question")]
+
+
+def test_request_that_cannot_be_trimmed_enough_raises():
+    request = {
+        "model": "custom",
+        "instructions": "x" * 4000,
+        "input": [user("hello")],
+    }
+
+    with pytest.raises(ContextWindowExceededError, match="100 tokens"):
+        ContextBudget(max_context_tokens=100).fit(request)
+
+
+def test_output_budget_counts_against_the_window():
+    request = {"model": "custom", "input": [user("hello")], "max_output_tokens": 95}
+
+    with pytest.raises(ContextWindowExceededError):
+        ContextBudget(max_context_tokens=100).fit(request)
+    assert estimate_tokens([user("hello")]) < 100
@@ -0,0 +1,288 @@
+import asyncio
+import json
+import sys
+import threading
+import time
+
+import pytest
+from pydantic import ValidationError
+
+from lwagents import Tool
+from lwagents.cache import DiskCache, LRUCache
+from lwagents.tokens import CHARS_PER_TOKEN
+from lwagents.tools import (
+    ToolExecutionError,
+    ToolOutputLimit,
+    ToolTimeoutError,
+    ToolUtility,
+    acollect_output,
+    collect_output,
+)
+
+
+@Tool(cache=True)
+def square(x: int) -> int:
+    """Squares a number."""
+    return x * x
+
+
+@Tool(timeout=0.05)
+def sleep_for(seconds: float) -> str:
+    """Sleeps."""
+    time.sleep(seconds)
+    return "woke"
+
+
+@Tool
+def fail(message: str) -> str:
+    """Raises."""
+    raise ValueError(message)
+
+
+@Tool
+async def nap(seconds: float) -> int:
+    """Sleeps without blocking the event loop."""
+    await asyncio.sleep(seconds)
+    return threading.get_ident()
+
+
+@Tool
+def thread_id() -> int:
+    """Returns the id of the thread it runs on."""
+    return threading.get_ident()
+
+
+def test_cache_counts_hits_and_misses():
+    tool = Tool(lambda x: x + 1, cache=LRUCache(max_entries=8))
+
+    assert [tool.execute(x=1), tool.execute(x=1), tool.execute(x=2)] == [2, 2, 3]
+    info = tool.cache_info()
+    assert (info["hits"], info["misses"], info["entries"]) == (1, 2, 2)
+
+
+def test_cache_stats_are_exact_under_parallel_execution():
+    # Switch threads as often as possible to provoke lost updates
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        calls = [(f"call_{i}", "square", f'{{"x": {i % 4}}}') for i in range(400)]
+        square.cache_clear()
+        before = square.cache_info()
+        results = ToolUtility.execute_tool_calls(
+            calls, {"square": square}, max_parallelism=16
+        )
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert [result.content for result in results] == [(i % 4) ** 2 for i in range(400)]
+    info = square.cache_info()
+    lookups = info["hits"] + info["misses"] - before["hits"] - before["misses"]
+    assert lookups == 400
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [b"", b"\x80\x05garbage", b"cno_such_module\nThing\n."],
+    ids=["empty", "corrupt", "stale"],
+)
+def test_unreadable_disk_cache_entry_is_a_miss(tmp_path, payload):
+    cache = DiskCache(str(tmp_path))
+    tool = Tool(lambda x: x + 1, cache=cache)
+    assert tool.execute(x=1) == 2
+    (entry,) = tmp_path.iterdir()
+    entry.write_bytes(payload)
+
+    assert tool.execute(x=1) == 2
+    assert tool.cache_info()["misses"] == 2
+    # The bad entry was replaced and is hit from now on
+    assert tool.execute(x=1) == 2
+    assert tool.cache_info()["hits"] == 1
+
+
+def test_iterator_results_are_not_cached():
+    def count_to(n: int):
+        return iter(range(n))
+
+    tool = Tool(count_to, cache=LRUCache(max_entries=8))
+
+    assert list(tool.execute(n=3)) == [0, 1, 2]
+    assert list(tool.execute(n=3)) == [0, 1, 2]
+    assert tool.cache_info()["entries"] == 0
+
+
+def test_tool_timeout_raises():
+    with pytest.raises(ToolTimeoutError):
+        sleep_for.execute(seconds=1)
+    assert sleep_for.execute(seconds=0) == "woke"
+
+
+def test_failing_and_timed_out_calls_do_not_affect_others():
+    tools = {"square": square, "sleep_for": sleep_for, "fail": fail}
+    calls = [
+        ("call_1", "fail", '{"message": "boom"}'),
+        ("call_2", "sleep_for", '{"seconds": 1}'),
+        ("call_3", "square", '{"x": 3}'),
+    ]
+
+    failed, timed_out, ok = ToolUtility.execute_tool_calls(calls, tools)
+
+    assert failed.is_error and "boom" in str(failed.content)
+    assert timed_out.is_error and timed_out.timed_out
+    assert (ok.id, ok.content, ok.is_error) == ("call_3", 9, False)
+
+
+def test_provider_schemas_are_built_once():
+    first = square.provider_schema("openai")
+
+    assert square.provider_schema("openai") is first
+    assert (first["type"], first["name"]) == ("function", "square")
+    anthropic = square.provider_schema("anthropic")
+    assert square.provider_schema("anthropic") is anthropic
+    assert anthropic["input_schema"] == first["parameters"]
+
+
+def test_tool_lists_are_memoized_per_tool_set():
+    tools = ToolUtility.get_tools_info_gpt({"square": square, "fail": fail})
+
+    # A new dict with the same tools reuses the list
+    assert ToolUtility.get_tools_info_gpt({"square": square, "fail": fail}) is tools
+    assert tools[0] is square.provider_schema("openai")
+    assert ToolUtility.get_tools_info_gpt({"square": square}) is not tools
+    anthropic = ToolUtility.get_tools_info_anthropic({"square": square, "fail": fail})
+    assert anthropic[0] is square.provider_schema("anthropic")
+
+
+def test_async_tools_are_awaited_on_the_running_loop():
+    calls = [(f"call_{i}", "nap", {"seconds": 0.1}) for i in range(5)]
+
+    async def main():
+        started = time.monotonic()
+        results = await ToolUtility.aexecute_tool_calls(calls, {"nap": nap})
+        return results, time.monotonic() - started, threading.get_ident()
+
+    results, elapsed, loop_thread = asyncio.run(main())
+
+    assert [result.content for result in results] == [loop_thread] * 5
+    assert elapsed < 0.3
+
+
+def test_sync_tools_are_awaited_in_a_worker_thread():
+    async def main():
+        return await thread_id.aexecute(), threading.get_ident()
+
+    tool_thread, loop_thread = asyncio.run(main())
+
+    assert tool_thread != loop_thread
+
+
+def test_async_tool_timeout_cancels_the_coroutine():
+    cancelled = threading.Event()
+
+    async def hang() -> str:
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "done"
+
+    tool = Tool(hang, timeout=0.05)
+
+    with pytest.raises(ToolTimeoutError):
+        asyncio.run(tool.aexecute())
+    assert cancelled.is_set()
+
+
+def test_async_tool_execute_runs_only_outside_an_event_loop():
+    assert nap.execute(seconds=0) == threading.get_ident()
+
+    async def main():
+        return nap.execute(seconds=0)
+
+    with pytest.raises(ToolExecutionError, match="use aexecute"):
+        asyncio.run(main())
+
+
+@pytest.mark.parametrize(
+    "arguments", ['{"x": 3}', '{"x": "3"}', '{"x": 3.0}'], ids=["int", "str", "float"]
+)
+def test_execute_json_validates_like_execute(arguments):
+    assert square.execute_json(arguments) == square.execute(**json.loads(arguments))
+    assert asyncio.run(square.aexecute_json(arguments)) == 9
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    ['{"x": "three"}', "{}", '{"x": 3', "[3]"],
+    ids=["wrong-type", "missing", "invalid-json", "not-an-object"],
+)
+def test_execute_json_rejects_invalid_arguments(arguments):
+    with pytest.raises(ValidationError):
+        square.execute_json(arguments)
+
+    (result,) = ToolUtility.execute_tool_calls(
+        [("call_0", "square", arguments)], {"square": square}
+    )
+    assert result.is_error
+    assert result.content.startswith("ValidationError")
+
+
+def test_execute_json_treats_empty_arguments_as_no_arguments():
+    assert thread_id.execute_json("") == threading.get_ident()
+
+
+def test_collect_output_truncates_long_outputs():
+    output = {"rows": ["x" * 50]}
+    text = str(output)
+
+    assert collect_output("short", ToolOutputLimit(max_chars=20)) == (
+        "short",
+        None,
+        False,
+    )
+    assert collect_output(output, None) == (output, None, False)
+    content, full, truncated = collect_output(output, ToolOutputLimit(max_chars=20))
+    assert content == text[:20] + f"... [{len(text) - 20} characters elided]"
+    assert (full, truncated) == (None, True)
+    kept = collect_output(output, ToolOutputLimit(max_chars=20, keep_full=True))
+    assert kept[1] is output
+    limit = ToolOutputLimit(max_chars=1000, max_tokens=2)
+    assert limit.max_chars == 2 * CHARS_PER_TOKEN
+
+
+def test_collect_output_streams_iterators_under_the_limit():
+    elided = []
+    limit = ToolOutputLimit(
+        max_chars=6, keep_full=True, summarizer=lambda text: elided.append(text) or "s"
+    )
+
+    def chunks():
+        yield b"abcd"
+        yield "efgh"
+        yield 12
+
+    content, full, truncated = collect_output(chunks(), limit)
+
+    assert (content, full, truncated) == (
+        "abcdef... [4 characters elided: s]",
+        "abcdefgh12",
+        True,
+    )
+    assert elided == ["gh12"]
+    # Iterators within the limit are joined into a string
+    assert collect_output(iter(["a", "b"]), limit) == ("ab", None, False)
+
+
+def test_acollect_output_consumes_async_iterators():
+    async def chunks():
+        for chunk in ("abc", "def"):
+            yield chunk
+
+    limit = ToolOutputLimit(max_chars=4)
+
+    assert asyncio.run(acollect_output(chunks(), limit)) == (
+        "abcd... [2 characters elided]",
+        None,
+        True,
+    )
+    assert collect_output(chunks(), None) == ("abcdef", None, False)
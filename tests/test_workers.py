@@ -0,0 +1,71 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from lwagents.workers import ProcessWorkerPool, WorkerTimeoutError
+
+
+def square(x: int) -> int:
+    return x * x
+
+
+def sleep_then(seconds: float, value):
+    time.sleep(seconds)
+    return value
+
+
+def fail(message: str):
+    raise ValueError(message)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = ProcessWorkerPool(max_workers=2)
+    yield pool
+    pool.shutdown()
+
+
+def test_workers_are_not_forked_by_default(pool):
+    assert pool._context.get_start_method() != "fork"
+
+
+def test_concurrent_calls_return_their_own_results(pool):
+    with ThreadPoolExecutor(max_workers=8) as threads:
+        results = list(
+            threads.map(lambda x: pool.run(__name__, "square", {"x": x}), range(40))
+        )
+
+    assert results == [x * x for x in range(40)]
+
+
+def test_exceptions_are_raised_in_the_caller(pool):
+    with pytest.raises(ValueError, match="boom"):
+        pool.run(__name__, "fail", {"message": "boom"})
+    assert pool.run(__name__, "square", {"x": 3}) == 9
+
+
+def test_timed_out_worker_is_replaced(pool):
+    with pytest.raises(WorkerTimeoutError):
+        pool.run(__name__, "sleep_then", {"seconds": 5, "value": 1}, timeout=0.2)
+
+    assert pool.run(__name__, "square", {"x": 4}, timeout=10) == 16
+
+
+def test_timeout_covers_waiting_for_a_free_worker():
+    pool = ProcessWorkerPool(max_workers=1)
+    try:
+        busy = threading.Thread(
+            target=pool.run, args=(__name__, "sleep_then", {"seconds": 1, "value": 1})
+        )
+        busy.start()
+        time.sleep(0.1)
+
+        started = time.monotonic()
+        with pytest.raises(WorkerTimeoutError, match="no free worker"):
+            pool.run(__name__, "square", {"x": 2}, timeout=0.2)
+        assert time.monotonic() - started < 0.8
+        busy.join()
+    finally:
+        pool.shutdown()